@@ -5,9 +5,108 @@
 * Copyright @YasirPedia All rights reserved
 """
 
+import threading
+import time
+from typing import Dict
+
 from async_pymongo import AsyncClient
+from pymongo import MongoClient, monitoring
+
+from misskaty.vars import (
+    DATABASE_NAME,
+    DATABASE_URI,
+    MONGO_COMPRESSORS,
+    MONGO_MAX_POOL,
+    MONGO_MIN_POOL,
+)
+
+__all__ = ["dbname", "mongo", "pool_stats", "sync_mongo"]
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """Connection pool counters, shared by every client made here."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Checkouts happen on the thread running the operation
+        self._started = threading.local()
+        self.open = 0
+        self.checked_out = 0
+        self.checkouts = 0
+        self.failed = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def connection_check_out_started(self, event):
+        self._started.at = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        waited = time.perf_counter() - getattr(self._started, "at", time.perf_counter())
+        with self._lock:
+            self.checked_out += 1
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.failed += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open -= 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "open": self.open,
+                "checked_out": self.checked_out,
+                "checkouts": self.checkouts,
+                "failed": self.failed,
+                "wait_avg_ms": round(self.wait_total / max(self.checkouts, 1) * 1000, 2),
+                "wait_max_ms": round(self.wait_max * 1000, 2),
+            }
+
+
+pool_stats = PoolStats()
+
+
+def _client_options(max_pool: int, min_pool: int) -> dict:
+    options = {
+        "maxPoolSize": max_pool,
+        "minPoolSize": min_pool,
+        "event_listeners": [pool_stats],
+    }
+    if MONGO_COMPRESSORS:
+        options["compressors"] = MONGO_COMPRESSORS
+    return options
 
-from misskaty.vars import DATABASE_NAME, DATABASE_URI
 
-mongo = AsyncClient(DATABASE_URI)
+# The one async pool used by the database modules, both Pyrogram sessions and app.db
+mongo = AsyncClient(DATABASE_URI, **_client_options(MONGO_MAX_POOL, MONGO_MIN_POOL))
+# MongoDBJobStore needs a blocking client, it only touches the jobs collection
+sync_mongo = MongoClient(DATABASE_URI, **_client_options(2, 0))
 dbname = mongo[DATABASE_NAME]
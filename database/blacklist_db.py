@@ -1,6 +1,7 @@
-from typing import List
+from typing import Dict, List
 
 from database import dbname
+from database.word_matcher import WordMatcher, WordMatcherCache
 
 blacklist_filtersdb = dbname["blacklistFilters"]
 
@@ -10,6 +11,17 @@ async def get_blacklisted_words(chat_id: int) -> List[str]:
     return [] if not _filters else _filters["filters"]
 
 
+async def _get_blacklist_words_map(chat_id: int) -> Dict[str, str]:
+    return {word: word for word in await get_blacklisted_words(chat_id)}
+
+
+blacklist_matcher = WordMatcherCache(_get_blacklist_words_map)
+
+
+async def get_blacklist_matcher(chat_id: int) -> WordMatcher:
+    return await blacklist_matcher.get(chat_id)
+
+
 async def save_blacklist_filter(chat_id: int, word: str):
     word = word.lower().strip()
     _filters = await get_blacklisted_words(chat_id)
@@ -19,6 +31,7 @@ async def save_blacklist_filter(chat_id: int, word: str):
         {"$set": {"filters": _filters}},
         upsert=True,
     )
+    blacklist_matcher.invalidate(chat_id)
 
 
 async def delete_blacklist_filter(chat_id: int, word: str) -> bool:
@@ -31,5 +44,6 @@ async def delete_blacklist_filter(chat_id: int, word: str) -> bool:
             {"$set": {"filters": filtersd}},
             upsert=True,
         )
+        blacklist_matcher.invalidate(chat_id)
         return True
     return False
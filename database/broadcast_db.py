@@ -0,0 +1,69 @@
+import time
+from typing import Dict, Iterable, List, Set
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from database import dbname
+
+# One checkpoint document per broadcast run
+broadcastdb = dbname["broadcasts"]
+# Users found deleted or invalid by a broadcast, {"_id": user_id, "at"}. Later
+# broadcasts skip them, the bot's session peers are left alone.
+deadpeersdb = dbname["broadcast_dead_peers"]
+
+
+async def new_broadcast(
+    from_chat_id: int,
+    message_id: int,
+    status_chat_id: int,
+    status_message_id: int,
+    total: int,
+) -> dict:
+    job = {
+        "from_chat_id": from_chat_id,
+        "message_id": message_id,
+        "status_chat_id": status_chat_id,
+        "status_message_id": status_message_id,
+        "total": total,
+        "last_peer": None,
+        "counters": {"done": 0, "success": 0, "blocked": 0, "deleted": 0, "failed": 0},
+        "started": time.time(),
+        "finished": False,
+    }
+    result = await broadcastdb.insert_one(job)
+    job["_id"] = result.inserted_id
+    return job
+
+
+async def save_broadcast_progress(
+    job_id: ObjectId, last_peer: int, counters: Dict[str, int]
+):
+    """Record that every peer up to ``last_peer`` has been handled."""
+    await broadcastdb.update_one(
+        {"_id": job_id}, {"$set": {"last_peer": last_peer, "counters": counters}}
+    )
+
+
+async def finish_broadcast(job_id: ObjectId):
+    await broadcastdb.update_one({"_id": job_id}, {"$set": {"finished": True}})
+
+
+async def get_unfinished_broadcasts() -> List[dict]:
+    return await broadcastdb.find({"finished": False}).sort("_id", 1).to_list(length=None)
+
+
+async def add_dead_peers(peer_ids: Iterable[int]):
+    now = time.time()
+    ops = [
+        UpdateOne({"_id": peer_id}, {"$set": {"at": now}}, upsert=True)
+        for peer_id in peer_ids
+    ]
+    if ops:
+        await deadpeersdb.bulk_write(ops, ordered=False)
+
+
+async def get_dead_peers(peer_ids: List[int]) -> Set[int]:
+    """The ones among ``peer_ids`` a previous broadcast found dead."""
+    cursor = deadpeersdb.find({"_id": {"$in": peer_ids}}, {"_id": 1})
+    return {doc["_id"] async for doc in cursor}
@@ -0,0 +1,117 @@
+import asyncio
+from typing import Dict, List, Optional, Tuple, Union
+
+from pyrogram.types import CallbackQuery, Message
+
+from database import dbname
+from database.afk_db import is_afk, usersdb
+from database.locale_db import (
+    fill_lang,
+    get_cached_lang,
+    lang_generation,
+    localesdb,
+)
+from database.sangmata_db import matadb
+from database.users_chats_db import db
+
+# karma_db pulls misskaty.helper in, which imports this module through localization
+karmadb = dbname["karma"]
+
+_CTX_ATTR = "_update_context"
+
+
+class UpdateContext:
+    """Chat settings and sender documents loaded once per update.
+
+    Pyrogram passes the same parsed update object to every handler group,
+    so the context is attached to it and shared by all of them.
+    """
+
+    def __init__(self, chat_id: int, user_ids: List[int]):
+        self.chat_id = chat_id
+        self.user_ids = user_ids
+        self.chat: Optional[dict] = None
+        self.lang: Optional[Union[str, dict]] = None
+        self.karma_toggle: Optional[dict] = None
+        self.sangmata_toggle: Optional[dict] = None
+        self.afk: Dict[int, dict] = {}
+        self.sangmata_users: Dict[int, dict] = {}
+
+    async def load(self):
+        queries = {
+            "chat": db.grp.find_one({"id": self.chat_id}),
+            "karma_toggle": karmadb.find_one({"chat_id_toggle": self.chat_id}),
+            "mata": matadb.find(
+                {
+                    "$or": [
+                        {"chat_id_toggle": self.chat_id},
+                        {"user_id": {"$in": self.user_ids}},
+                    ]
+                }
+            ).to_list(length=None),
+            "afk": usersdb.find({"user_id": {"$in": self.user_ids}}).to_list(
+                length=None
+            ),
+        }
+        self.lang = get_cached_lang(self.chat_id)
+        if self.lang is None:
+            generation = lang_generation(self.chat_id)
+            queries["locale"] = localesdb.find_one({"chat_id": self.chat_id})
+        results = dict(zip(queries, await asyncio.gather(*queries.values())))
+        self.chat = results["chat"]
+        self.karma_toggle = results["karma_toggle"]
+        if "locale" in results:
+            self.lang = results["locale"]["lang"] if results["locale"] else {}
+            fill_lang(self.chat_id, self.lang, generation)
+        for doc in results["mata"]:
+            if "chat_id_toggle" in doc:
+                self.sangmata_toggle = doc
+            elif "user_id" in doc:
+                self.sangmata_users[doc["user_id"]] = doc
+        self.afk = {doc["user_id"]: doc for doc in results["afk"]}
+        return self
+
+    @property
+    def chat_exists(self) -> bool:
+        return bool(self.chat)
+
+    @property
+    def chat_status(self) -> Union[bool, dict]:
+        return self.chat.get("chat_status") if self.chat else False
+
+    @property
+    def karma_on(self) -> bool:
+        return not self.karma_toggle
+
+    @property
+    def sangmata_on(self) -> bool:
+        return bool(self.sangmata_toggle)
+
+    def sangmata_user(self, user_id: int) -> Optional[Tuple[str, str, str]]:
+        user = self.sangmata_users.get(user_id)
+        if not user:
+            return None
+        return user["username"], user["first_name"], user["last_name"]
+
+    async def is_afk(self, user_id: int) -> Tuple[bool, dict]:
+        if user_id not in self.user_ids:
+            return await is_afk(user_id)
+        user = self.afk.get(user_id)
+        return (True, user["reason"]) if user else (False, {})
+
+
+async def get_update_context(update: Union[Message, CallbackQuery]) -> UpdateContext:
+    """Return the context for this update, loading it on first use."""
+    task = getattr(update, _CTX_ATTR, None)
+    if task is None:
+        message = update.message if isinstance(update, CallbackQuery) else update
+        user_ids = []
+        if update.from_user:
+            user_ids.append(update.from_user.id)
+        reply = getattr(message, "reply_to_message", None)
+        if reply and reply.from_user and reply.from_user.id not in user_ids:
+            user_ids.append(reply.from_user.id)
+        context = UpdateContext(message.chat.id, user_ids)
+        task = asyncio.ensure_future(context.load())
+        setattr(update, _CTX_ATTR, task)
+    return await task
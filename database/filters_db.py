@@ -1,6 +1,7 @@
 from typing import Dict, List, Union
 
 from database import dbname
+from database.word_matcher import WordMatcher, WordMatcherCache
 
 filtersdb = dbname["filters"]
 
@@ -10,6 +11,9 @@ async def _get_filters(chat_id: int) -> Dict[str, int]:
     return _filters["filters"] if _filters else {}
 
 
+filters_matcher = WordMatcherCache(_get_filters)
+
+
 async def delete_filter(chat_id: int, name: str) -> bool:
     filtersd = await _get_filters(chat_id)
     name = name.lower().strip()
@@ -20,12 +24,15 @@ async def delete_filter(chat_id: int, name: str) -> bool:
             {"$set": {"filters": filtersd}},
             upsert=True,
         )
+        filters_matcher.invalidate(chat_id)
         return True
     return False
 
 
 async def deleteall_filters(chat_id: int):
-    return await filtersdb.delete_one({"chat_id": chat_id})
+    result = await filtersdb.delete_one({"chat_id": chat_id})
+    filters_matcher.invalidate(chat_id)
+    return result
 
 
 async def get_filter(chat_id: int, name: str) -> Union[bool, dict]:
@@ -38,6 +45,10 @@ async def get_filters_names(chat_id: int) -> List[str]:
     return list(await _get_filters(chat_id))
 
 
+async def get_filters_matcher(chat_id: int) -> WordMatcher:
+    return await filters_matcher.get(chat_id)
+
+
 async def save_filter(chat_id: int, name: str, _filter: dict):
     name = name.lower().strip()
     _filters = await _get_filters(chat_id)
@@ -47,3 +58,4 @@ async def save_filter(chat_id: int, name: str, _filter: dict):
         {"$set": {"filters": _filters}},
         upsert=True,
     )
+    filters_matcher.invalidate(chat_id)
@@ -0,0 +1,130 @@
+from logging import getLogger
+from typing import Dict, List, Tuple
+
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
+
+from database import dbname
+
+LOGGER = getLogger("MissKaty")
+
+# Queries slower than this are reported by audit_queries
+DB_SLOW_MS = 100
+
+# collection -> [(keys, create_index options)]. Unique where every write upserts on
+# the key, sparse where the collection mixes documents that don't all have it.
+INDEXES: Dict[str, List[Tuple[list, dict]]] = {
+    "locale": [([("chat_id", ASCENDING)], {"unique": True})],
+    "users": [([("user_id", ASCENDING)], {"unique": True})],
+    "cleanmode": [([("chat_id", ASCENDING)], {})],
+    "sangmata": [
+        ([("user_id", ASCENDING)], {"unique": True, "sparse": True}),
+        ([("chat_id_toggle", ASCENDING)], {"sparse": True}),
+    ],
+    "filters": [([("chat_id", ASCENDING)], {"unique": True})],
+    "blacklistFilters": [([("chat_id", ASCENDING)], {"unique": True})],
+    "notes": [([("chat_id", ASCENDING)], {"unique": True})],
+    "greetings": [([("chat_id", ASCENDING)], {})],
+    "gban": [([("user_id", ASCENDING)], {})],
+    "imdb": [([("user_id", ASCENDING)], {"unique": True})],
+    "karma": [([("chat_id_toggle", ASCENDING)], {"sparse": True})],
+    "karma_users": [
+        ([("chat_id", ASCENDING), ("user_id", ASCENDING)], {"unique": True}),
+        ([("chat_id", ASCENDING), ("karma", DESCENDING)], {}),
+        ([("user_id", ASCENDING)], {}),
+    ],
+    "warn_users": [
+        ([("chat_id", ASCENDING), ("user_id", ASCENDING)], {"unique": True}),
+    ],
+    "federation": [
+        ([("fed_id", ASCENDING)], {"unique": True}),
+        ([("owner_id", ASCENDING)], {}),
+        ([("chat_ids.chat_id", ASCENDING)], {}),
+    ],
+    "userlist": [
+        ([("id", ASCENDING)], {"sparse": True}),
+        ([("ban_status.is_banned", ASCENDING)], {"sparse": True}),
+    ],
+    "groups": [
+        ([("id", ASCENDING)], {}),
+        ([("chat_status.is_disabled", ASCENDING)], {}),
+    ],
+    "broadcasts": [([("finished", ASCENDING)], {})],
+}
+
+# The lookups made on every update or command, as (collection, filter)
+HOT_QUERIES: List[Tuple[str, dict]] = [
+    ("locale", {"chat_id": 0}),
+    ("users", {"user_id": {"$in": [0]}}),
+    ("cleanmode", {"chat_id": 0}),
+    ("sangmata", {"$or": [{"chat_id_toggle": 0}, {"user_id": {"$in": [0]}}]}),
+    ("filters", {"chat_id": 0}),
+    ("blacklistFilters", {"chat_id": 0}),
+    ("notes", {"chat_id": 0}),
+    ("greetings", {"chat_id": 0}),
+    ("gban", {"user_id": 0}),
+    ("imdb", {"user_id": 0}),
+    ("karma", {"chat_id_toggle": 0}),
+    ("karma_users", {"chat_id": 0, "user_id": 0}),
+    ("warn_users", {"chat_id": 0, "user_id": 0}),
+    ("federation", {"chat_ids.chat_id": 0}),
+    ("federation", {"fed_id": ""}),
+    ("userlist", {"id": 0}),
+    ("groups", {"id": 0}),
+]
+
+
+async def ensure_indexes() -> int:
+    """Create every declared index, returns how many failed.
+
+    create_index is a no-op for existing indexes. A unique index fails when the
+    collection already holds duplicates, that one is logged and skipped.
+    """
+    failed = 0
+    for collection, indexes in INDEXES.items():
+        for keys, options in indexes:
+            try:
+                await dbname[collection].create_index(keys, **options)
+            except OperationFailure as e:
+                failed += 1
+                LOGGER.warning(
+                    "Can't create index %s on %s: %s", keys, collection, e.details
+                )
+    return failed
+
+
+def _plan_stages(plan: dict) -> List[str]:
+    stages = [plan["stage"]] if "stage" in plan else []
+    children = plan.get("inputStages", [])
+    if "inputStage" in plan:
+        children = [plan["inputStage"], *children]
+    for child in children:
+        stages.extend(_plan_stages(child))
+    return stages
+
+
+async def explain_query(collection: str, query: dict) -> dict:
+    result = await dbname.command(
+        {"explain": {"find": collection, "filter": query}, "verbosity": "executionStats"}
+    )
+    winning = result["queryPlanner"]["winningPlan"]
+    stats = result["executionStats"]
+    return {
+        "collection": collection,
+        "filter": query,
+        # Servers using the slot based engine nest the classic plan under queryPlan
+        "stages": _plan_stages(winning.get("queryPlan", winning)),
+        "millis": stats["executionTimeMillis"],
+        "docs_examined": stats["totalDocsExamined"],
+        "keys_examined": stats["totalKeysExamined"],
+    }
+
+
+async def audit_queries(threshold_ms: int = DB_SLOW_MS) -> List[dict]:
+    """Explain every hot query, returns those taking ``threshold_ms`` or more, or scanning the collection."""
+    reports = []
+    for collection, query in HOT_QUERIES:
+        report = await explain_query(collection, query)
+        if report["millis"] >= threshold_ms or "COLLSCAN" in report["stages"]:
+            reports.append(report)
+    return reports
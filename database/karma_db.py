@@ -1,51 +1,96 @@
-from typing import Dict, Union
+from typing import Dict, Optional
+
+from pymongo import DESCENDING, ReturnDocument, UpdateOne
 
 from database import dbname
-from misskaty.helper.functions import int_to_alpha
+from misskaty.helper.functions import alpha_to_int
 
+# Holds the per-chat disable toggles and, before migration, the legacy per-chat karma maps
 karmadb = dbname["karma"]
+# One document per (chat_id, user_id): {"chat_id", "user_id", "karma"}
+karmausersdb = dbname["karma_users"]
+
+
+async def migrate_legacy_karma() -> int:
+    """Split legacy per-chat karma maps into per-user documents. Safe to run repeatedly."""
+    migrated = 0
+    async for chat in karmadb.find({"karma": {"$exists": True}}):
+        ops = [
+            UpdateOne(
+                {"chat_id": chat["chat_id"], "user_id": await alpha_to_int(name)},
+                {"$setOnInsert": {"karma": int(value.get("karma", 0))}},
+                upsert=True,
+            )
+            for name, value in chat["karma"].items()
+        ]
+        if ops:
+            await karmausersdb.bulk_write(ops, ordered=False)
+        await karmadb.delete_one({"_id": chat["_id"]})
+        migrated += len(ops)
+    return migrated
 
 
 async def get_karmas_count() -> dict:
-    chats_count = 0
-    karmas_count = 0
-    async for chat in karmadb.find({"chat_id": {"$lt": 0}}):
-        for i in chat["karma"]:
-            karma_ = chat["karma"][i]["karma"]
-            if karma_ > 0:
-                karmas_count += karma_
-        chats_count += 1
-    return {"chats_count": chats_count, "karmas_count": karmas_count}
-
-
-async def user_global_karma(user_id) -> int:
-    total_karma = 0
-    async for chat in karmadb.find({"chat_id": {"$lt": 0}}):
-        karma = await get_karma(chat["chat_id"], await int_to_alpha(user_id))
-        if karma and (int(karma["karma"]) > 0):
-            total_karma += int(karma["karma"])
-    return total_karma
-
-
-async def get_karmas(chat_id: int) -> Dict[str, int]:
-    karma = await karmadb.find_one({"chat_id": chat_id})
-    return karma["karma"] if karma else {}
-
-
-async def get_karma(chat_id: int, name: str) -> Union[bool, dict]:
-    name = name.lower().strip()
-    karmas = await get_karmas(chat_id)
-    if name in karmas:
-        return karmas[name]
-
-
-async def update_karma(chat_id: int, name: str, karma: dict):
-    name = name.lower().strip()
-    karmas = await get_karmas(chat_id)
-    karmas[name] = karma
-    await karmadb.update_one(
-        {"chat_id": chat_id}, {"$set": {"karma": karmas}}, upsert=True
+    result = await karmausersdb.aggregate(
+        [
+            {
+                "$group": {
+                    "_id": "$chat_id",
+                    "karma": {"$sum": {"$max": ["$karma", 0]}},
+                }
+            },
+            {
+                "$group": {
+                    "_id": None,
+                    "chats_count": {"$sum": 1},
+                    "karmas_count": {"$sum": "$karma"},
+                }
+            },
+        ]
+    ).to_list(length=1)
+    if not result:
+        return {"chats_count": 0, "karmas_count": 0}
+    return {
+        "chats_count": result[0]["chats_count"],
+        "karmas_count": result[0]["karmas_count"],
+    }
+
+
+async def user_global_karma(user_id: int) -> int:
+    result = await karmausersdb.aggregate(
+        [
+            {"$match": {"user_id": user_id, "karma": {"$gt": 0}}},
+            {"$group": {"_id": None, "total": {"$sum": "$karma"}}},
+        ]
+    ).to_list(length=1)
+    return result[0]["total"] if result else 0
+
+
+async def get_karmas(chat_id: int) -> Dict[int, int]:
+    """Return user_id -> karma for a chat, highest karma first."""
+    return {
+        doc["user_id"]: doc["karma"]
+        async for doc in karmausersdb.find({"chat_id": chat_id}).sort(
+            "karma", DESCENDING
+        )
+    }
+
+
+async def get_karma(chat_id: int, user_id: int) -> Optional[dict]:
+    return await karmausersdb.find_one(
+        {"chat_id": chat_id, "user_id": user_id}, {"_id": 0, "karma": 1}
+    )
+
+
+async def change_karma(chat_id: int, user_id: int, delta: int) -> int:
+    """Atomically add ``delta`` to a user's karma and return the new total."""
+    doc = await karmausersdb.find_one_and_update(
+        {"chat_id": chat_id, "user_id": user_id},
+        {"$inc": {"karma": delta}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
     )
+    return doc["karma"]
 
 
 async def is_karma_on(chat_id: int) -> bool:
@@ -1,5 +1,7 @@
-from typing import Iterable
+from itertools import count
+from typing import Iterable, Optional, Union
 
+from cachetools import TTLCache
 from pyrogram.enums import ChatType
 
 from database import dbname
@@ -8,6 +10,40 @@ localesdb = dbname["locale"]  # DB for localization
 
 group_types: Iterable[ChatType] = (ChatType.GROUP, ChatType.SUPERGROUP)
 
+# Write-through cache of the stored language per chat, checked before hitting Mongo
+lang_cache = TTLCache(maxsize=20000, ttl=6 * 60 * 60)
+lang_cache_stats = {"hits": 0, "misses": 0}
+# chat_id -> generation of its last language write, see WordMatcherCache
+_lang_generations = TTLCache(maxsize=20000, ttl=6 * 60 * 60)
+_lang_writes = count(1)
+
+
+def get_cached_lang(chat_id: int) -> Optional[Union[str, dict]]:
+    """Return the cached language of a chat, or None if it must be fetched."""
+    lang = lang_cache.get(chat_id)
+    if lang is None:
+        lang_cache_stats["misses"] += 1
+    else:
+        lang_cache_stats["hits"] += 1
+    return lang
+
+
+def lang_generation(chat_id: int) -> Optional[int]:
+    """Take before reading a chat's language from Mongo, pass it to :func:`fill_lang`."""
+    return _lang_generations.get(chat_id)
+
+
+def fill_lang(chat_id: int, lang: Union[str, dict], generation: Optional[int]):
+    """Cache a language read from Mongo, unless it was written since the read began."""
+    if _lang_generations.get(chat_id) == generation:
+        lang_cache[chat_id] = lang
+
+
+def cache_lang(chat_id: int, lang: Union[str, dict]):
+    """Write through a stored language, reads that began before it won't be cached."""
+    _lang_generations[chat_id] = next(_lang_writes)
+    lang_cache[chat_id] = lang
+
 
 async def set_db_lang(chat_id: int, chat_type: str, lang_code: str):
     await localesdb.update_one(
@@ -15,8 +51,15 @@ async def set_db_lang(chat_id: int, chat_type: str, lang_code: str):
         {"$set": {"lang": lang_code, "chat_type": chat_type.value}},
         upsert=True,
     )
+    cache_lang(chat_id, lang_code)
 
 
 async def get_db_lang(chat_id: int) -> str:
+    lang = get_cached_lang(chat_id)
+    if lang is not None:
+        return lang
+    generation = lang_generation(chat_id)
     ul = await localesdb.find_one({"chat_id": chat_id})
-    return ul["lang"] if ul else {}
+    lang = ul["lang"] if ul else {}
+    fill_lang(chat_id, lang, generation)
+    return lang
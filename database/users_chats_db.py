@@ -1,11 +1,10 @@
-from async_pymongo import AsyncClient
-
-from misskaty.vars import DATABASE_NAME, DATABASE_URI
+from database import mongo
+from misskaty.vars import DATABASE_NAME
 
 
 class UsersData:
-    def __init__(self, uri, database_name):
-        self._client = AsyncClient(uri)
+    def __init__(self, client, database_name):
+        self._client = client
         self.db = self._client[database_name]
         self.col = self.db["userlist"]
         self.grp = self.db["groups"]
@@ -106,4 +105,4 @@ class UsersData:
         return (await self.db.command("dbstats"))["dataSize"]
 
 
-db = UsersData(DATABASE_URI, DATABASE_NAME)
+db = UsersData(mongo, DATABASE_NAME)
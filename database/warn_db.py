@@ -1,51 +1,84 @@
-from typing import Dict, Union
+from typing import Optional
+
+from pymongo import ReturnDocument, UpdateOne
 
 from database import dbname
+from misskaty.helper.functions import alpha_to_int
 
+# Legacy per-chat warn maps, emptied by migrate_legacy_warns
 warnsdb = dbname["warn"]
+# One document per (chat_id, user_id): {"chat_id", "user_id", "warns"}
+warnusersdb = dbname["warn_users"]
 
 
-async def get_warns_count() -> dict:
-    chats_count = 0
-    warns_count = 0
-    async for chat in warnsdb.find({"chat_id": {"$lt": 0}}):
-        for user in chat["warns"]:
-            warns_count += chat["warns"][user]["warns"]
-        chats_count += 1
-    return {"chats_count": chats_count, "warns_count": warns_count}
+async def migrate_legacy_warns() -> int:
+    """Split legacy per-chat warn maps into per-user documents. Safe to run repeatedly."""
+    migrated = 0
+    async for chat in warnsdb.find({"warns": {"$exists": True}}):
+        ops = [
+            UpdateOne(
+                {"chat_id": chat["chat_id"], "user_id": await alpha_to_int(name)},
+                {"$setOnInsert": {"warns": int(value.get("warns", 0))}},
+                upsert=True,
+            )
+            for name, value in chat["warns"].items()
+            if value.get("warns")
+        ]
+        if ops:
+            await warnusersdb.bulk_write(ops, ordered=False)
+        await warnsdb.delete_one({"_id": chat["_id"]})
+        migrated += len(ops)
+    return migrated
+
 
+async def get_warns_count() -> dict:
+    result = await warnusersdb.aggregate(
+        [
+            {"$group": {"_id": "$chat_id", "warns": {"$sum": "$warns"}}},
+            {
+                "$group": {
+                    "_id": None,
+                    "chats_count": {"$sum": 1},
+                    "warns_count": {"$sum": "$warns"},
+                }
+            },
+        ]
+    ).to_list(length=1)
+    if not result:
+        return {"chats_count": 0, "warns_count": 0}
+    return {
+        "chats_count": result[0]["chats_count"],
+        "warns_count": result[0]["warns_count"],
+    }
 
-async def get_warns(chat_id: int) -> Dict[str, int]:
-    warns = await warnsdb.find_one({"chat_id": chat_id})
-    return warns["warns"] if warns else {}
 
+async def get_warn(chat_id: int, user_id: int) -> Optional[dict]:
+    return await warnusersdb.find_one(
+        {"chat_id": chat_id, "user_id": user_id}, {"_id": 0, "warns": 1}
+    )
 
-async def get_warn(chat_id: int, name: str) -> Union[bool, dict]:
-    name = name.lower().strip()
-    warns = await get_warns(chat_id)
-    if name in warns:
-        return warns[name]
 
+async def add_warn(chat_id: int, user_id: int) -> int:
+    """Atomically add a warn to a user and return the new count."""
+    doc = await warnusersdb.find_one_and_update(
+        {"chat_id": chat_id, "user_id": user_id},
+        {"$inc": {"warns": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return doc["warns"]
 
-async def add_warn(chat_id: int, name: str, warn: dict):
-    name = name.lower().strip()
-    warns = await get_warns(chat_id)
-    warns[name] = warn
 
-    await warnsdb.update_one(
-        {"chat_id": chat_id}, {"$set": {"warns": warns}}, upsert=True
+async def remove_warn(chat_id: int, user_id: int) -> Optional[int]:
+    """Atomically take one warn from a user, returns the new count or None if they had none."""
+    doc = await warnusersdb.find_one_and_update(
+        {"chat_id": chat_id, "user_id": user_id, "warns": {"$gt": 0}},
+        {"$inc": {"warns": -1}},
+        return_document=ReturnDocument.AFTER,
     )
+    return doc["warns"] if doc else None
 
 
-async def remove_warns(chat_id: int, name: str) -> bool:
-    warnsd = await get_warns(chat_id)
-    name = name.lower().strip()
-    if name in warnsd:
-        del warnsd[name]
-        await warnsdb.update_one(
-            {"chat_id": chat_id},
-            {"$set": {"warns": warnsd}},
-            upsert=True,
-        )
-        return True
-    return False
+async def remove_warns(chat_id: int, user_id: int) -> bool:
+    result = await warnusersdb.delete_one({"chat_id": chat_id, "user_id": user_id})
+    return result.deleted_count > 0
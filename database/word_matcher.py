@@ -0,0 +1,78 @@
+import re
+from itertools import count
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+from cachetools import TTLCache
+
+
+class WordMatcher:
+    """One compiled alternation over every stored word of a chat.
+
+    Words match on the same boundaries as the old per-word
+    ``( |^|[^\\w])word( |$|[^\\w])`` search, longest word first.
+    """
+
+    def __init__(self, words: Dict[str, Any]):
+        # Keyed by casefold, IGNORECASE also matches forms like "ſus" for "sus"
+        self.words = {
+            word.casefold(): (word.lower(), payload) for word, payload in words.items()
+        }
+        self.regex = None
+        if self.words:
+            stored = sorted(
+                (word for word, _ in self.words.values()), key=len, reverse=True
+            )
+            alternation = "|".join(re.escape(word) for word in stored)
+            self.regex = re.compile(rf"(?<!\w)({alternation})(?!\w)", re.IGNORECASE)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def search(self, text: str) -> Optional[Tuple[str, Any]]:
+        """Return the first matching word in ``text`` with its stored payload."""
+        if self.regex is None:
+            return None
+        return next(self.finditer(text), None)
+
+    def finditer(self, text: str) -> Iterator[Tuple[str, Any]]:
+        """Every matching word in ``text`` with its payload, in order of appearance."""
+        if self.regex is None:
+            return
+        for match in self.regex.finditer(text):
+            entry = self.words.get(match.group(1).casefold())
+            if entry is not None:
+                yield entry
+
+
+class WordMatcherCache:
+    """Compiled matchers per chat, built from ``load(chat_id)`` on first use.
+
+    Call :meth:`invalidate` after every write to a chat's words. A matcher
+    whose load raced such a write is returned but not stored, so words read
+    before the write can't keep matching after it.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[int], Awaitable[Dict[str, Any]]],
+        maxsize: int = 5000,
+        ttl: int = 60 * 60,
+    ):
+        self._load = load
+        self._matchers = TTLCache(maxsize=maxsize, ttl=ttl)
+        # chat_id -> generation of its last write, from one counter so values never repeat
+        self._generations = TTLCache(maxsize=maxsize * 4, ttl=ttl)
+        self._counter = count(1)
+
+    async def get(self, chat_id: int) -> WordMatcher:
+        matcher = self._matchers.get(chat_id)
+        if matcher is None:
+            generation = self._generations.get(chat_id)
+            matcher = WordMatcher(await self._load(chat_id))
+            if self._generations.get(chat_id) == generation:
+                self._matchers[chat_id] = matcher
+        return matcher
+
+    def invalidate(self, chat_id: int) -> None:
+        self._generations[chat_id] = next(self._counter)
+        self._matchers.pop(chat_id, None)
@@ -9,10 +9,9 @@ from faulthandler import enable as faulthandler_enable
 from logging import ERROR, INFO, StreamHandler, basicConfig, getLogger, handlers
 
 import uvloop
+from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.jobstores.mongodb import MongoDBJobStore
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from async_pymongo import AsyncClient
-from pymongo import MongoClient
 from pyrogram import Client
 
 from misskaty.vars import (
@@ -20,7 +19,6 @@ from misskaty.vars import (
     API_ID,
     BOT_TOKEN,
     DATABASE_NAME,
-    DATABASE_URI,
     TZ,
     USER_SESSION,
 )
@@ -44,13 +42,13 @@ getLogger("iytdl").setLevel(ERROR)
 MOD_LOAD = []
 MOD_NOLOAD = ["subscene_dl"]
 HELPABLE = {}
-cleanmode = {}
 botStartTime = time.time()
 misskaty_version = "v2.14"
 
 uvloop.install()
 faulthandler_enable()
 from misskaty.core import misskaty_patch
+from database import mongo, sync_mongo
 
 # Pyrogram Bot Client
 app = Client(
@@ -58,28 +56,30 @@ app = Client(
     api_id=API_ID,
     api_hash=API_HASH,
     bot_token=BOT_TOKEN,
-    mongodb=dict(connection=AsyncClient(DATABASE_URI), remove_peers=True),
+    mongodb=dict(connection=mongo, remove_peers=True),
     sleep_threshold=180,
     app_version="MissKatyPyro Stable",
     workers=50,
     max_concurrent_transmissions=4,
 )
-app.db = AsyncClient(DATABASE_URI)
+app.db = mongo
 app.log = getLogger("MissKaty")
 
 # Pyrogram UserBot Client
 user = Client(
     "YasirUBot",
     session_string=USER_SESSION,
-    mongodb=dict(connection=AsyncClient(DATABASE_URI), remove_peers=False),
+    mongodb=dict(connection=mongo, remove_peers=False),
     sleep_threshold=180,
     app_version="MissKaty Ubot",
 )
 
 jobstores = {
     "default": MongoDBJobStore(
-        client=MongoClient(DATABASE_URI), database=DATABASE_NAME, collection="nightmode"
-    )
+        client=sync_mongo, database=DATABASE_NAME, collection="nightmode"
+    ),
+    # In-process housekeeping jobs that must not be persisted
+    "memory": MemoryJobStore(),
 }
 scheduler = AsyncIOScheduler(jobstores=jobstores, timezone=TZ)
 
@@ -9,13 +9,18 @@ import asyncio
 import importlib
 import os
 import pickle
+import sys
+import time
 import traceback
+from datetime import datetime, timedelta
 from logging import getLogger
+from typing import Dict
 
+from apscheduler.triggers.interval import IntervalTrigger
+from psutil import Process
 from pyrogram import __version__, idle
 from pyrogram.raw.all import layer
 
-from database import dbname
 from misskaty import (
     BOT_NAME,
     BOT_USERNAME,
@@ -25,25 +30,70 @@ from misskaty import (
     get_event_loop,
     scheduler,
 )
-from misskaty.plugins import ALL_MODULES
-from misskaty.plugins.web_scraper import web
-from misskaty.vars import SUDO, USER_SESSION
-from utils import auto_clean
-from apscheduler.triggers.interval import IntervalTrigger
-from datetime import datetime, timedelta
-from misskaty.plugins.auto_kick import check_kicks
+
+# misskaty.helper star-imports every helper module, and through ffmpeg_helper the
+# dev plugin. The imports below all pull it in, so it is timed apart from the core.
+_helper_start = time.perf_counter()
+importlib.import_module("misskaty.helper")
+HELPER_IMPORT_TIME = time.perf_counter() - _helper_start
+
+from database import dbname  # noqa: E402
+from database.indexes import ensure_indexes  # noqa: E402
+from database.karma_db import migrate_legacy_karma  # noqa: E402
+from database.warn_db import migrate_legacy_warns  # noqa: E402
+from misskaty.helper import sweep_caches  # noqa: E402
+from misskaty.helper.parse_pool import shutdown_parser_pool  # noqa: E402
+from misskaty.helper.sys_metrics import SAMPLE_INTERVAL, metrics  # noqa: E402
+from misskaty.plugins import ALL_MODULES  # noqa: E402
+from misskaty.vars import SUDO, USER_SESSION  # noqa: E402
+from utils import auto_clean  # noqa: E402
 
 LOGGER = getLogger("MissKaty")
+# Log how long each startup step and plugin import takes, then exit
+PROFILE_STARTUP = "--profile-startup" in sys.argv
 
 
-# Run Bot
-async def start_bot():
+def load_plugins() -> Dict[str, float]:
+    """Import every plugin and register its help, returns the import time of each."""
+    timings = {}
     for module in ALL_MODULES:
+        start = time.perf_counter()
         imported_module = importlib.import_module(f"misskaty.plugins.{module}")
+        timings[module] = time.perf_counter() - start
         if hasattr(imported_module, "__MODULE__") and imported_module.__MODULE__:
             imported_module.__MODULE__ = imported_module.__MODULE__
             if hasattr(imported_module, "__HELP__") and imported_module.__HELP__:
                 HELPABLE[imported_module.__MODULE__.lower()] = imported_module
+    return timings
+
+
+def report_startup(core: float, timings: Dict[str, float]):
+    LOGGER.info(
+        "[PROFILE]: Interpreter, core modules and clients: %.2fs",
+        core - HELPER_IMPORT_TIME,
+    )
+    LOGGER.info("[PROFILE]: misskaty.helper and its imports: %.2fs", HELPER_IMPORT_TIME)
+    for module, seconds in sorted(timings.items(), key=lambda i: i[1], reverse=True):
+        LOGGER.info("[PROFILE]: %-20s %.3fs", module, seconds)
+    LOGGER.info(
+        "[PROFILE]: %d plugins imported in %.2fs", len(timings), sum(timings.values())
+    )
+
+
+# Run Bot
+async def start_bot():
+    core = time.time() - Process().create_time()
+    timings = load_plugins()
+    if PROFILE_STARTUP:
+        return report_startup(core, timings)
+    from misskaty.plugins.auto_kick import check_kicks
+    from misskaty.plugins.broadcast import resume_broadcasts
+    from misskaty.plugins.inline_search import (
+        INLINE_STATUS_REFRESH,
+        refresh_inline_status,
+    )
+    from misskaty.plugins.web_scraper import web
+
     bot_modules = ""
     j = 1
     for i in ALL_MODULES:
@@ -87,7 +137,46 @@ async def start_bot():
         replace_existing=True,
     )
     LOGGER.info("[INFO]: Add Jobs Check Kick")
+    scheduler.add_job(
+        sweep_caches,
+        trigger=IntervalTrigger(minutes=10),
+        id="sweep_caches",
+        name="Sweep SQLite Caches",
+        jobstore="memory",
+        misfire_grace_time=60,
+        max_instances=1,
+        next_run_time=datetime.now() + timedelta(seconds=60),
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        metrics.collect,
+        trigger=IntervalTrigger(seconds=SAMPLE_INTERVAL),
+        id="sys_metrics",
+        name="Sample System Metrics",
+        jobstore="memory",
+        misfire_grace_time=SAMPLE_INTERVAL,
+        max_instances=1,
+        next_run_time=datetime.now(),
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        refresh_inline_status,
+        trigger=IntervalTrigger(seconds=INLINE_STATUS_REFRESH),
+        id="inline_status",
+        name="Refresh Inline Status",
+        jobstore="memory",
+        misfire_grace_time=60,
+        max_instances=1,
+        next_run_time=datetime.now(),
+        replace_existing=True,
+    )
     scheduler.start()
+    if failed := await ensure_indexes():
+        LOGGER.warning("[WARNING]: %d database indexes could not be created", failed)
+    if migrated := await migrate_legacy_karma():
+        LOGGER.info("[INFO]: Migrated %d legacy karma entries", migrated)
+    if migrated := await migrate_legacy_warns():
+        LOGGER.info("[INFO]: Migrated %d legacy warn entries", migrated)
     if "web" not in await dbname.list_collection_names():
         webdb = dbname["web"]
         for key, value in web.items():
@@ -102,19 +191,22 @@ async def start_bot():
             text="<b>Bot restarted successfully!</b>",
         )
     asyncio.create_task(auto_clean())
+    asyncio.create_task(resume_broadcasts())
     await idle()
 
 
 if __name__ == "__main__":
     try:
         get_event_loop().run_until_complete(start_bot())
-        app.loop.run_forever()
+        if not PROFILE_STARTUP:
+            app.loop.run_forever()
     except KeyboardInterrupt:
         pass
     except Exception:
         err = traceback.format_exc()
         LOGGER.info(err)
     finally:
+        shutdown_parser_pool()
         app.loop.stop()
         LOGGER.info(
             "------------------------ Stopped Services ------------------------"
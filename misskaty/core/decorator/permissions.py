@@ -1,14 +1,16 @@
+import asyncio
 from functools import partial, wraps
 from time import time
 from traceback import format_exc as err
-from typing import Optional, Union
+from typing import Dict, Optional, Set, Tuple, Union
 
+from cachetools import TTLCache
 from pyrogram import Client, enums
 from pyrogram.errors import ChannelPrivate, ChatAdminRequired, ChatWriteForbidden
 from pyrogram.types import CallbackQuery, Message
 
 from misskaty import app
-from misskaty.helper.sqlite_helper import Cache
+from misskaty.helper.sqlite_helper import AsyncCache
 from misskaty.vars import SUDO
 
 from ...helper.localization import (
@@ -93,40 +95,92 @@ async def check_perms(
     return False
 
 
-admins_in_chat = Cache(filename="admin_cache.db", path="cache", in_memory=False)
+# Persistent copy of the rosters, only read to warm up after a restart
+admins_in_chat = AsyncCache(
+    filename="admin_cache.db", path="cache", in_memory=False, max_entries=20000
+)
+ADMIN_ROSTER_TTL = 6 * 60 * 60
+ADMIN_ROSTER_MAX_CHATS = 5000
+# chat_id -> (fetched at, admin ids), kept current by ChatMemberUpdated deltas
+_admin_rosters: TTLCache = TTLCache(maxsize=ADMIN_ROSTER_MAX_CHATS, ttl=ADMIN_ROSTER_TTL)
+_admin_fetches: Dict[int, asyncio.Task] = {}
+
+
+async def _save_admin_roster(chat_id: int, roster: Tuple[float, Set[int]]) -> None:
+    fetched_at, admins = roster
+    await admins_in_chat.set(
+        chat_id,
+        {"last_updated_at": fetched_at, "data": list(admins)},
+        timeout=ADMIN_ROSTER_TTL,
+    )
+
+
+async def _fetch_admin_roster(chat_id: int) -> Optional[Set[int]]:
+    try:
+        admins = {
+            member.user.id
+            async for member in app.get_chat_members(
+                chat_id, filter=enums.ChatMembersFilter.ADMINISTRATORS
+            )
+        }
+    except ChannelPrivate:
+        return None
+    _admin_rosters[chat_id] = (time(), admins)
+    await _save_admin_roster(chat_id, _admin_rosters[chat_id])
+    return admins
 
 
 async def list_admins(chat_id: int):
-    """Gets a list of admin IDs in a chat. Caches the result for 6 hours.
-    
+    """Gets the set of admin IDs in a chat.
+
+    The roster is kept in memory and updated from member updates, it is
+    refetched after 6 hours. Concurrent misses share a single fetch.
+
     Args:
         chat_id (int): The ID of the chat to query.
-    
+
     Returns:
-        List[int]: A list of admin IDs, or None if the chat is private.
+        Set[int]: The admin IDs, or None if the chat is private.
     """
-    if chat_id in admins_in_chat:
-        interval = time() - admins_in_chat[chat_id]["last_updated_at"]
-        if interval < 3600:
-            return admins_in_chat[chat_id]["data"]
-
-    try:
-        admins_in_chat.add(
-            chat_id,
-            {
-                "last_updated_at": time(),
-                "data": [
-                    member.user.id
-                    async for member in app.get_chat_members(
-                        chat_id, filter=enums.ChatMembersFilter.ADMINISTRATORS
-                    )
-                ],
-            },
-            timeout=6 * 60 * 60,
+    roster = _admin_rosters.get(chat_id)
+    if roster is None and (cached := await admins_in_chat.get(chat_id)):
+        roster = _admin_rosters[chat_id] = (
+            cached["last_updated_at"],
+            set(cached["data"]),
         )
-        return admins_in_chat[chat_id]["data"]
-    except ChannelPrivate:
+    if roster and time() - roster[0] < ADMIN_ROSTER_TTL:
+        return roster[1]
+
+    task = _admin_fetches.get(chat_id)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_admin_roster(chat_id))
+        _admin_fetches[chat_id] = task
+        task.add_done_callback(lambda _: _admin_fetches.pop(chat_id, None))
+    return await asyncio.shield(task)
+
+
+async def update_admin_roster(chat_id: int, user_id: int, is_admin: bool) -> None:
+    """Apply a promotion or demotion to a loaded roster.
+
+    For a chat not in memory the persisted copy is dropped instead, so the
+    next use fetches a fresh roster rather than warm starting from a stale one.
+    """
+    roster = _admin_rosters.get(chat_id)
+    if roster is None:
+        await admins_in_chat.delete(chat_id)
+        return
+    if (user_id in roster[1]) == is_admin:
         return
+    if is_admin:
+        roster[1].add(user_id)
+    else:
+        roster[1].discard(user_id)
+    await _save_admin_roster(chat_id, roster)
+
+
+async def clear_admin_rosters() -> None:
+    _admin_rosters.clear()
+    await admins_in_chat.clear()
 
 
 async def authorised(func, subFunc2, client, message, *args, **kwargs):
@@ -1,51 +1,113 @@
 import asyncio
+import time
+from contextlib import suppress
+from typing import Dict, List, Optional, Tuple
 
+from cachetools import TTLCache
 from pyrogram import filters
 from pyrogram.errors import MessageDeleteForbidden
 
 from misskaty.vars import SUDO
 
-data = {}
+# Users in cooldown and chats with a bucket, per filter. Entries expire with the cooldown.
+COOLDOWN_MAX_USERS = 10000
+COOLDOWN_MAX_CHATS = 5000
 
 
-async def task(msg, warn=False, sec=None):
-    if warn:
+def _take(buckets: TTLCache, key, limit: Tuple[int, float]) -> bool:
+    """Token bucket allowing ``count`` calls per ``period`` seconds, with a burst of ``count``.
+
+    An idle bucket is full again after ``period``, so it can expire from the cache.
+    """
+    count, period = limit
+    now = time.monotonic()
+    tokens, updated = buckets.get(key, (count, now))
+    tokens = min(count, tokens + (now - updated) * count / period)
+    if tokens < 1:
+        buckets[key] = (tokens, now)
+        return False
+    buckets[key] = (tokens - 1, now)
+    return True
+
+
+class _Warning:
+    """One warning per user in cooldown. Messages sent meanwhile are queued for one batched delete."""
+
+    def __init__(self, msg, until: float):
+        self.msg = msg
+        self.until = until
+        self.pending: List[int] = [msg.id]
+        self.wakeup = asyncio.Event()
+
+    def add(self, msg):
+        self.pending.append(msg.id)
+        self.wakeup.set()
+
+    async def _delete_pending(self):
+        ids, self.pending = self.pending, []
+        if ids:
+            with suppress(MessageDeleteForbidden):
+                await self.msg._client.delete_messages(self.msg.chat.id, ids)
+
+    async def run(self, warnings: Dict[int, "_Warning"], user_id: int):
+        msg = self.msg
         user = msg.from_user or msg.sender_chat
-        ids = await msg.reply_msg(
-            f"Sorry {user.mention if msg.from_user else msg.sender_chat.title} [<code>{user.id}</code>], you must wait for {sec}s before using this feature again.."
-        )
+        name = user.mention if msg.from_user else msg.sender_chat.title
         try:
-            await msg.delete_msg()
-        except MessageDeleteForbidden:
-            pass
-        await asyncio.sleep(sec)
+            ids = await msg.reply_msg(
+                f"Sorry {name} [<code>{user.id}</code>], you must wait for {round(self.until - time.time())}s before using this feature again.."
+            )
+            while True:
+                await self._delete_pending()
+                remaining = self.until - time.time()
+                if remaining <= 0:
+                    break
+                self.wakeup.clear()
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self.wakeup.wait(), remaining)
+        finally:
+            warnings.pop(user_id, None)
         await ids.edit_msg(
-            f"Alright {user.mention if msg.from_user else msg.sender_chat.title} [<code>{user.id}</code>], your cooldown is over you can command again.",
+            f"Alright {name} [<code>{user.id}</code>], your cooldown is over you can command again.",
             del_in=3,
         )
 
 
-def wait(sec):
+def wait(
+    sec,
+    chat_limit: Optional[Tuple[int, float]] = None,
+    command_limit: Optional[Tuple[int, float]] = None,
+):
+    """Filter allowing a user one use every ``sec`` seconds.
+
+    ``chat_limit`` and ``command_limit`` are optional (count, period) token
+    buckets shared by everyone in a chat, and by everyone using the command.
+    """
+    cooldowns = TTLCache(maxsize=COOLDOWN_MAX_USERS, ttl=sec)
+    chat_buckets = (
+        TTLCache(maxsize=COOLDOWN_MAX_CHATS, ttl=chat_limit[1]) if chat_limit else None
+    )
+    command_bucket = {}
+    warnings: Dict[int, _Warning] = {}
+
     async def ___(flt, _, msg):
         user_id = msg.from_user.id if msg.from_user else msg.sender_chat.id
         if user_id in SUDO:
             return True
-        if user_id in data:
-            if msg.date.timestamp() >= data[user_id]["timestamp"] + flt.data:
-                data[user_id] = {"timestamp": msg.date.timestamp(), "warned": False}
-                return True
+        now = msg.date.timestamp()
+        until = cooldowns.get(user_id)
+        if until is not None and now < until:
+            if user_id in warnings:
+                warnings[user_id].add(msg)
             else:
-                if not data[user_id]["warned"]:
-                    data[user_id]["warned"] = True
-                    asyncio.ensure_future(
-                        task(msg, True, flt.data)
-                    )  # for super accuracy use (future - time.time())
-                    return False  # cause we dont need delete again
-
-                asyncio.ensure_future(task(msg))
-                return False
-        else:
-            data.update({user_id: {"timestamp": msg.date.timestamp(), "warned": False}})
-            return True
+                warnings[user_id] = _Warning(msg, until)
+                asyncio.ensure_future(warnings[user_id].run(warnings, user_id))
+            return False
+        if chat_limit and not _take(chat_buckets, msg.chat.id, chat_limit):
+            return False
+        if command_limit and not _take(command_bucket, None, command_limit):
+            return False
+        cooldowns[user_id] = now + flt.data
+        return True
 
     return filters.create(___, data=sec)
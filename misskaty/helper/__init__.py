@@ -8,7 +8,7 @@ from .localization import *
 from .media_helper import *
 from .misc import *
 from .pyro_progress import *
-from .sqlite_helper import Cache
+from .sqlite_helper import AsyncCache, Cache, cache_stats, sweep_caches
 from .stickerset import *
 from .subscene_helper import *
 from .time_gap import *
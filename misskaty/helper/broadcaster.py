@@ -0,0 +1,138 @@
+import asyncio
+import os
+from logging import getLogger
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from bson import ObjectId
+from pyrogram import Client
+from pyrogram.errors import (
+    FloodWait,
+    InputUserDeactivated,
+    PeerIdInvalid,
+    UserIsBlocked,
+)
+
+from database import mongo
+from database.broadcast_db import (
+    add_dead_peers,
+    finish_broadcast,
+    get_dead_peers,
+    save_broadcast_progress,
+)
+from database.users_chats_db import db
+from misskaty.helper.rate_limit import TokenBucket
+
+__all__ = ["Broadcaster", "peersdb"]
+
+LOGGER = getLogger("MissKaty")
+# Telegram allows about 30 bulk messages per second, keep some headroom
+BROADCAST_RATE = float(os.environ.get("BROADCAST_RATE", 25))
+BROADCAST_WORKERS = int(os.environ.get("BROADCAST_WORKERS", 8))
+# Peers fetched, sent and checkpointed together
+BROADCAST_PAGE = 500
+BROADCAST_ATTEMPTS = 5
+
+# Pyrogram session storage of the bot client, only read here
+peersdb = mongo["MissKatyBot"]["peers"]
+
+
+class Broadcaster:
+    """Copy one message to every user peer, resuming from a Mongo checkpoint.
+
+    Peers are walked in ``_id`` order one page at a time. A page is sent by
+    ``workers`` concurrent tasks behind a shared :class:`TokenBucket`, then its
+    dead peers are recorded in bulk and the last ``_id`` is checkpointed, so a
+    restart re-sends at most one page. Peers recorded dead are skipped.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        job: dict,
+        on_progress: Optional[Callable[[Dict[str, int]], Awaitable]] = None,
+        rate: float = BROADCAST_RATE,
+        workers: int = BROADCAST_WORKERS,
+    ):
+        self.client = client
+        self.job_id: ObjectId = job["_id"]
+        self.from_chat_id: int = job["from_chat_id"]
+        self.message_id: int = job["message_id"]
+        self.last_peer: Optional[int] = job.get("last_peer")
+        self.counters: Dict[str, int] = dict(job["counters"])
+        self.on_progress = on_progress
+        self.bucket = TokenBucket(rate)
+        self.workers = workers
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._dead: List[int] = []
+
+    async def _send(self, peer_id: int) -> str:
+        for _ in range(BROADCAST_ATTEMPTS):
+            await self.bucket.acquire()
+            try:
+                await self.client.copy_message(
+                    peer_id, self.from_chat_id, self.message_id
+                )
+            except FloodWait as e:
+                LOGGER.warning("Broadcast got floodwait for %ss", e.value)
+                self.bucket.penalize(int(e.value))
+                continue
+            except (InputUserDeactivated, PeerIdInvalid):
+                return "deleted"
+            except UserIsBlocked:
+                return "blocked"
+            except Exception as e:
+                LOGGER.info("Broadcast to %s failed: %s", peer_id, e)
+                return "failed"
+            self.bucket.reward()
+            return "success"
+        return "failed"
+
+    async def _worker(self):
+        while True:
+            peer_id = await self._queue.get()
+            try:
+                status = await self._send(peer_id)
+                self.counters[status] += 1
+                self.counters["done"] += 1
+                if status == "deleted":
+                    self._dead.append(peer_id)
+            finally:
+                self._queue.task_done()
+
+    async def _next_page(self) -> List[int]:
+        query = {"type": "user"}
+        if self.last_peer is not None:
+            query["_id"] = {"$gt": self.last_peer}
+        cursor = peersdb.find(query, {"_id": 1}).sort("_id", 1).limit(BROADCAST_PAGE)
+        return [doc["_id"] async for doc in cursor]
+
+    async def _purge_dead(self):
+        if not self._dead:
+            return
+        dead, self._dead = self._dead, []
+        await add_dead_peers(dead)
+        await db.col.delete_many({"id": {"$in": dead}})
+        LOGGER.info("Recorded %d dead peers after broadcast page", len(dead))
+
+    async def run(self) -> Dict[str, int]:
+        tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        try:
+            while page := await self._next_page():
+                dead = await get_dead_peers(page)
+                # Still counted as done so progress reaches the total
+                self.counters["done"] += len(dead)
+                for peer_id in page:
+                    if peer_id not in dead:
+                        self._queue.put_nowait(peer_id)
+                await self._queue.join()
+                await self._purge_dead()
+                self.last_peer = page[-1]
+                await save_broadcast_progress(self.job_id, self.last_peer, self.counters)
+                if self.on_progress:
+                    await self.on_progress(self.counters)
+            await finish_broadcast(self.job_id)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return self.counters
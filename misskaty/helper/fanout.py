@@ -0,0 +1,138 @@
+import asyncio
+import os
+from logging import getLogger
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from cachetools import TTLCache
+from pyrogram import Client
+from pyrogram.errors import (
+    ChannelPrivate,
+    ChatAdminRequired,
+    FloodWait,
+    UserNotParticipant,
+)
+from pyrogram.types import ChatPrivileges
+
+from misskaty import BOT_ID
+from misskaty.helper.rate_limit import TokenBucket
+
+__all__ = ["FanOut", "FanOutResult", "forget_bot_rights"]
+
+LOGGER = getLogger("MissKaty")
+FANOUT_WORKERS = int(os.environ.get("FANOUT_WORKERS", 10))
+FANOUT_RATE = float(os.environ.get("FANOUT_RATE", 20))
+FANOUT_ATTEMPTS = 3
+
+# Shared by every fan-out so parallel fed actions can't exceed the limit together
+fanout_bucket = TokenBucket(FANOUT_RATE)
+# chat_id -> the bot's privileges there, None when it is not an admin
+bot_rights = TTLCache(maxsize=5000, ttl=600)
+
+
+def forget_bot_rights(chat_id: int):
+    bot_rights.pop(chat_id, None)
+
+
+class FanOutResult:
+    """Per chat outcome of a fan-out."""
+
+    def __init__(self):
+        self.done: List[int] = []
+        self.unchanged: List[int] = []
+        self.skipped: List[int] = []
+        self.failed: Dict[int, str] = {}
+        self.elapsed = 0.0
+
+    @property
+    def total(self) -> int:
+        return len(self.done) + len(self.unchanged) + len(self.skipped) + len(self.failed)
+
+    def summary(self) -> str:
+        return (
+            f"Done: {len(self.done)} | Unchanged: {len(self.unchanged)} | "
+            f"Skipped: {len(self.skipped)} | Failed: {len(self.failed)} | "
+            f"Time: {self.elapsed:.1f}s"
+        )
+
+
+class FanOut:
+    """Run one action in many chats with bounded concurrency.
+
+    Every API call made through :meth:`call` takes a token from the shared
+    limiter and is retried after a FloodWait, which also slows down every
+    other fan-out. With ``required_right`` set, chats where the cached bot
+    privileges lack that right are skipped without calling the action.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        required_right: Optional[str] = None,
+        workers: int = FANOUT_WORKERS,
+    ):
+        self.client = client
+        self.required_right = required_right
+        self.workers = workers
+
+    async def call(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        for attempt in range(FANOUT_ATTEMPTS):
+            await fanout_bucket.acquire()
+            try:
+                result = await func(*args, **kwargs)
+            except FloodWait as e:
+                if attempt == FANOUT_ATTEMPTS - 1:
+                    raise
+                fanout_bucket.penalize(int(e.value))
+                continue
+            fanout_bucket.reward()
+            return result
+
+    async def has_right(self, chat_id: int, right: str) -> bool:
+        if chat_id not in bot_rights:
+            # Only definitive answers are cached, transient errors fail this chat
+            try:
+                member = await self.call(self.client.get_chat_member, chat_id, BOT_ID)
+            except (UserNotParticipant, ChatAdminRequired, ChannelPrivate):
+                bot_rights[chat_id] = None
+            else:
+                bot_rights[chat_id] = member.privileges
+        privileges: Optional[ChatPrivileges] = bot_rights[chat_id]
+        return bool(privileges and getattr(privileges, right, False))
+
+    async def _run_one(
+        self,
+        chat_id: int,
+        action: Callable[["FanOut", int], Awaitable[bool]],
+        result: FanOutResult,
+        slots: asyncio.Semaphore,
+    ):
+        async with slots:
+            try:
+                if self.required_right and not await self.has_right(
+                    chat_id, self.required_right
+                ):
+                    result.skipped.append(chat_id)
+                elif await action(self, chat_id):
+                    result.done.append(chat_id)
+                else:
+                    result.unchanged.append(chat_id)
+            except Exception as e:
+                result.failed[chat_id] = str(e)
+
+    async def run(
+        self,
+        chat_ids: Iterable[int],
+        action: Callable[["FanOut", int], Awaitable[bool]],
+    ) -> FanOutResult:
+        """Call ``action(fanout, chat_id)`` for every chat, it returns whether it changed anything."""
+        result = FanOutResult()
+        slots = asyncio.Semaphore(self.workers)
+        start = perf_counter()
+        await asyncio.gather(
+            *(self._run_one(chat_id, action, result, slots) for chat_id in chat_ids)
+        )
+        result.elapsed = perf_counter() - start
+        if result.failed:
+            LOGGER.info("Fan-out failed in %d chats: %s", len(result.failed), result.summary())
+        return result
@@ -1,11 +1,30 @@
 import asyncio
+import bisect
 import os
 import time
+from typing import List, NamedTuple, Optional
+from uuid import uuid4
 
+from pyrogram import Client
 from pyrogram.errors import FloodWait
-from pyrogram.types import InputMediaPhoto
+from pyrogram.types import InputMediaPhoto, Message
 
+from misskaty.helper.parse_pool import run_parser
+from misskaty.helper.partial_download import CHUNK_SIZE, SparseFile
 from misskaty.plugins.dev import shell_exec
+from parsers.render import render_contact_sheet
+
+# Concurrent ffmpeg frame grabs
+SS_WORKERS = 4
+SS_GRID = (4, 4)
+SS_SHEET_WIDTH = 1340
+# Like vcsi --end-delay-percent 20, credits are not worth a screenshot
+SS_SPAN = 0.8
+# Chunks fetched from Telegram media. The head and tail hold the container
+# header and index (mp4 moov atom), each sample point gets its keyframe.
+SS_EDGE_CHUNKS = 6
+
+_frame_slots: Optional[asyncio.Semaphore] = None
 
 
 def hhmmss(seconds):
@@ -19,10 +38,88 @@ async def take_ss(video_file):
     return out_put_file_name if os.path.lexists(out_put_file_name) else None
 
 
-async def ssgen_link(video, output_directory, ttl):
-    out_put_file_name = f"{output_directory}/{str(time.time())}.png"
+async def probe_duration(source: str) -> float:
+    """Duration in seconds of a local file or a seekable URL, 0 when unknown."""
+    process = await asyncio.create_subprocess_exec(
+        "ffprobe",
+        "-v",
+        "quiet",
+        "-show_entries",
+        "format=duration",
+        "-of",
+        "csv=p=0",
+        source,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    stdout, _ = await process.communicate()
+    try:
+        return float(stdout.decode().strip())
+    except ValueError:
+        return 0.0
+
+
+class Keyframe(NamedTuple):
+    time: float
+    pos: int
+    size: int
+
+
+async def probe_keyframes(source: str) -> List[Keyframe]:
+    """Video keyframes listed by the container index, with times relative to the start.
+
+    Only the packet index is read, not the frame data, so this works on a
+    :class:`SparseFile` holding just the head and tail of an mp4.
+    """
+    process = await asyncio.create_subprocess_exec(
+        "ffprobe",
+        "-v",
+        "quiet",
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "format=start_time:packet=pts_time,pos,size,flags",
+        "-of",
+        "compact",
+        source,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    stdout, _ = await process.communicate()
+    start, packets = 0.0, []
+    for line in stdout.decode().splitlines():
+        section, *fields = line.split("|")
+        entry = dict(field.split("=", 1) for field in fields if "=" in field)
+        try:
+            if section == "format":
+                start = float(entry["start_time"])
+            elif section == "packet" and entry["flags"].startswith("K"):
+                packets.append(
+                    (float(entry["pts_time"]), int(entry["pos"]), int(entry["size"]))
+                )
+        except (KeyError, ValueError):
+            continue
+    return sorted(Keyframe(pts - start, pos, size) for pts, pos, size in packets)
+
+
+async def ssgen_link(video, output_directory, ttl, keyframe: bool = False):
+    """Grab one frame at ``ttl`` seconds. ``-ss`` before ``-i`` seeks the input, so
+    only the data around that point is read, also over HTTP.
+
+    With ``keyframe`` the keyframe at or before ``ttl`` is returned as is,
+    without decoding the frames after it.
+    """
+    global _frame_slots
+    if _frame_slots is None:
+        _frame_slots = asyncio.Semaphore(SS_WORKERS)
+    os.makedirs(output_directory, exist_ok=True)
+    out_put_file_name = f"{output_directory}/{time.time()}-{ttl}.png"
     cmd = [
         "ffmpeg",
+        "-loglevel",
+        "error",
+        "-xerror",
+        *(["-noaccurate_seek"] if keyframe else []),
         "-ss",
         str(ttl),
         "-i",
@@ -33,45 +130,123 @@ async def ssgen_link(video, output_directory, ttl):
         "image2",
         out_put_file_name,
     ]
-    process = await asyncio.create_subprocess_exec(
-        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    async with _frame_slots:
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL
+        )
+        await process.wait()
+    if not os.path.isfile(out_put_file_name):
+        return None
+    # A frame decoded from missing data is written too, but ffmpeg reports the error
+    if process.returncode != 0:
+        os.remove(out_put_file_name)
+        return None
+    return out_put_file_name
+
+
+async def genss_link(msg, video_link, output_directory, min_duration, no_of_photos):
+    duration = round(await probe_duration(video_link))
+    if duration <= min_duration:
+        return None
+    ttl_step = duration // no_of_photos
+    timestamps = [ttl_step * (looper + 1) for looper in range(no_of_photos)]
+    try:
+        await msg.edit(
+            f"📸 <b>Take Screenshoot:</b>\n<code>Generating {no_of_photos} screenshots..</code>"
+        )
+    except FloodWait as e:
+        await asyncio.sleep(e.value)
+    images = await asyncio.gather(
+        *(ssgen_link(video_link, output_directory, ttl) for ttl in timestamps)
     )
+    return [
+        InputMediaPhoto(media=ss_img, caption=f"Screenshot at {hhmmss(ttl)}")
+        for ttl, ss_img in zip(timestamps, images)
+        if ss_img
+    ]
 
-    stdout, stderr = await process.communicate()
-    stderr.decode().strip()
-    stdout.decode().strip()
-    return out_put_file_name if os.path.isfile(out_put_file_name) else None
 
+def _ss_timestamps(duration: float) -> List[float]:
+    count = SS_GRID[0] * SS_GRID[1]
+    return [duration * SS_SPAN * (i + 0.5) / count for i in range(count)]
 
-async def genss_link(msg, video_link, output_directory, min_duration, no_of_photos):
-    metadata = (
-        await shell_exec(
-            f"ffprobe -i {video_link} -show_entries format=duration -v quiet -of csv='p=0'"
+
+async def take_ss_seek(
+    source: str,
+    output_directory: str = "downloads",
+    duration: float = 0,
+    timestamps: Optional[List[float]] = None,
+) -> Optional[str]:
+    """Contact sheet like :func:`take_ss`, built from frames grabbed in parallel by seeking.
+
+    ``timestamps`` must be keyframe times when given, only the keyframes are
+    decoded. Returns None when too few frames could be decoded, the caller
+    should then fall back to a full download.
+    """
+    keyframe = timestamps is not None
+    if not keyframe:
+        duration = duration or await probe_duration(source)
+        if duration <= 0:
+            return None
+        timestamps = _ss_timestamps(duration)
+    paths = await asyncio.gather(
+        *(
+            ssgen_link(source, output_directory, ttl, keyframe=keyframe)
+            for ttl in timestamps
+        )
+    )
+    frames = [(ttl, path) for ttl, path in zip(timestamps, paths) if path]
+    try:
+        if len(frames) < len(timestamps) // 2:
+            return None
+        return await run_parser(
+            render_contact_sheet,
+            frames,
+            f"genss-{time.time()}.png",
+            SS_GRID[0],
+            SS_SHEET_WIDTH,
+        )
+    finally:
+        for _, path in frames:
+            os.remove(path)
+
+
+async def take_ss_telegram(
+    client: Client, message: Message, media, output_directory: str = "downloads"
+) -> Optional[str]:
+    """Contact sheet of Telegram media, downloading only the keyframes it shows.
+
+    The keyframe offsets come from the container index in the head or tail of
+    the file. Returns None when that index doesn't cover the file, like for
+    mkv whose packets can only be listed by reading the clusters.
+    """
+    ext = os.path.splitext(getattr(media, "file_name", None) or "")[1] or ".mp4"
+    # Unique per call, SparseFile truncates the path when opening it
+    path = os.path.join(
+        output_directory, f"genss-{media.file_unique_id}-{uuid4().hex[:8]}{ext}"
+    )
+    async with SparseFile(client, message, media, path) as part:
+        await part.fetch_edges(SS_EDGE_CHUNKS)
+        duration = getattr(media, "duration", 0) or await probe_duration(path)
+        keyframes = await probe_keyframes(path)
+        if not duration or not keyframes:
+            return None
+        if keyframes[-1].time < duration * SS_SPAN / 2:
+            return None
+        times = [kf.time for kf in keyframes]
+        # The keyframe at or before each sample point, once each
+        picked = sorted(
+            {
+                keyframes[max(0, bisect.bisect_right(times, ttl) - 1)]
+                for ttl in _ss_timestamps(duration)
+            }
+        )
+        ranges = []
+        for kf in picked:
+            first, last = kf.pos // CHUNK_SIZE, (kf.pos + kf.size - 1) // CHUNK_SIZE
+            ranges.append((first, last - first + 1))
+        await part.fetch(ranges)
+        # Just past the keyframe time, so rounding in ffprobe's output can't seek to the one before
+        return await take_ss_seek(
+            path, output_directory, duration, [kf.time + 0.001 for kf in picked]
         )
-    )[0]
-    duration = round(float(metadata))
-    if duration > min_duration:
-        images = []
-        ttl_step = duration // no_of_photos
-        current_ttl = ttl_step
-        for looper in range(no_of_photos):
-            ss_img = await ssgen_link(video_link, output_directory, current_ttl)
-            images.append(
-                InputMediaPhoto(
-                    media=ss_img, caption=f"Screenshot at {hhmmss(current_ttl)}"
-                )
-            )
-            try:
-                await msg.edit(
-                    f"📸 <b>Take Screenshoot:</b>\n<code>{looper+1} of {no_of_photos} screenshot generated..</code>"
-                )
-            except FloodWait as e:
-                await asyncio.sleep(e.value)
-                await msg.edit(
-                    f"📸 <b>Take Screenshoot:</b>\n<code>{looper+1} of {no_of_photos} screenshot generated..</code>"
-                )
-            current_ttl = current_ttl + ttl_step
-            await asyncio.sleep(2)
-        return images
-    else:
-        return None
@@ -0,0 +1,70 @@
+import asyncio
+import os
+from typing import Dict
+
+from pyrogram import Client
+from pyrogram.types import User
+
+from misskaty.helper.parse_pool import run_parser
+from parsers.render import (
+    crop_avatar,
+    render_meme,
+    render_nulis,
+    render_stats,
+    render_welcome,
+)
+
+__all__ = [
+    "avatar_crop",
+    "render_meme",
+    "render_nulis",
+    "render_stats",
+    "render_welcome",
+]
+
+# Circular avatar crops, keyed by the profile photo unique id
+AVATAR_DIR = "cache/avatars"
+AVATAR_CACHE_MAX = 2000
+AVATAR_SIZE = (265, 265)
+DEFAULT_AVATAR = "assets/profilepic.png"
+# photo_id -> crop in progress, concurrent joins share one download
+_avatar_crops: Dict[str, asyncio.Future] = {}
+
+
+def _prune_avatars() -> None:
+    crops = [entry for entry in os.scandir(AVATAR_DIR) if entry.name.endswith(".png")]
+    if len(crops) <= AVATAR_CACHE_MAX:
+        return
+    crops.sort(key=lambda entry: entry.stat().st_mtime)
+    for entry in crops[: len(crops) - AVATAR_CACHE_MAX * 9 // 10]:
+        os.remove(entry.path)
+
+
+async def _make_avatar(client: Client, user: User, path: str) -> str:
+    if not user.photo:
+        return await run_parser(crop_avatar, DEFAULT_AVATAR, path, AVATAR_SIZE)
+    pic = await client.download_media(
+        user.photo.big_file_id, file_name=f"pp{user.photo.big_photo_unique_id}.png"
+    )
+    try:
+        await run_parser(crop_avatar, pic, path, AVATAR_SIZE)
+    finally:
+        os.remove(pic)
+    _prune_avatars()
+    return path
+
+
+async def avatar_crop(client: Client, user: User) -> str:
+    """Path to the circular crop of the user's profile photo, downloaded and cropped once per photo."""
+    os.makedirs(AVATAR_DIR, exist_ok=True)
+    photo_id = user.photo.big_photo_unique_id if user.photo else "default"
+    path = os.path.join(AVATAR_DIR, f"{photo_id}.png")
+    # Checked before the file, which exists half written while its crop runs
+    task = _avatar_crops.get(photo_id)
+    if task is None:
+        if os.path.exists(path):
+            return path
+        task = asyncio.ensure_future(_make_avatar(client, user, path))
+        _avatar_crops[photo_id] = task
+        task.add_done_callback(lambda _: _avatar_crops.pop(photo_id, None))
+    return await asyncio.shield(task)
@@ -4,12 +4,13 @@ from html import escape
 from typing import Optional
 
 import chevron
-from bs4 import BeautifulSoup
 from telegraph.aio import Telegraph
 
 from misskaty import BOT_USERNAME
 from misskaty.helper.http import fetch
 from misskaty.helper.media_helper import post_to_telegraph
+from misskaty.helper.parse_pool import run_parser
+from parsers.scrapers import parse_kusonime_page
 
 LOGGER = logging.getLogger("MissKaty")
 
@@ -20,160 +21,7 @@ async def kusonimeBypass(url: str):
     if page.status_code != 200:
         raise Exception("ERROR: Hostname might be blocked by server!")
     try:
-        soup = BeautifulSoup(page.text, "lxml")
-        thumb = soup.find("div", {"class": "post-thumb"}).find("img").get("src")
-        data = []
-        # title = soup.select("#venkonten > div.vezone > div.venser > div.venutama > div.lexot > p:nth-child(3) > strong")[0].text.strip()
-        try:
-            title = soup.find("h1", {"class": "jdlz"}).text  # fix title njing haha
-            season = (
-                soup.select(
-                    "#venkonten > div.vezone > div.venser > div.venutama > div.lexot > div.info > p:nth-child(3)"
-                )[0]
-                .text.split(":")
-                .pop()
-                .strip()
-            )
-            tipe = (
-                soup.select(
-                    "#venkonten > div.vezone > div.venser > div.venutama > div.lexot > div.info > p:nth-child(5)"
-                )[0]
-                .text.split(":")
-                .pop()
-                .strip()
-            )
-            status_anime = (
-                soup.select(
-                    "#venkonten > div.vezone > div.venser > div.venutama > div.lexot > div.info > p:nth-child(6)"
-                )[0]
-                .text.split(":")
-                .pop()
-                .strip()
-            )
-            ep = (
-                soup.select(
-                    "#venkonten > div.vezone > div.venser > div.venutama > div.lexot > div.info > p:nth-child(7)"
-                )[0]
-                .text.split(":")
-                .pop()
-                .strip()
-            )
-            score = (
-                soup.select(
-                    "#venkonten > div.vezone > div.venser > div.venutama > div.lexot > div.info > p:nth-child(8)"
-                )[0]
-                .text.split(":")
-                .pop()
-                .strip()
-            )
-            duration = (
-                soup.select(
-                    "#venkonten > div.vezone > div.venser > div.venutama > div.lexot > div.info > p:nth-child(9)"
-                )[0]
-                .text.split(":")
-                .pop()
-                .strip()
-            )
-            rilis = (
-                soup.select(
-                    "#venkonten > div.vezone > div.venser > div.venutama > div.lexot > div.info > p:nth-child(10)"
-                )[0]
-                .text.split(":")
-                .pop()
-                .strip()
-            )
-        except Exception:
-            e = traceback.format_exc()
-            LOGGER.error(e)
-            title, season, tipe, status_anime, ep, score, duration, rilis = (
-                "None",
-                "None",
-                "None",
-                "None",
-                0,
-                0,
-                0,
-                "None",
-            )
-        num = 1
-        genre = []
-        for _genre in soup.select(
-            "#venkonten > div.vezone > div.venser > div.venutama > div.lexot > div.info > p:nth-child(2)"
-        ):
-            gen = _genre.text.split(":").pop().strip().split(", ")
-            genre = gen
-        for smokedl in soup.find("div", {"class": "dlbodz"}).find_all(
-            "div", {"class": "smokeddlrh"}
-        ):
-            if not smokedl:
-                continue
-            mendata = {"name": title, "links": []}
-            for smokeurl in smokedl.find_all("div", {"class": "smokeurl"}):
-                if not smokeurl:
-                    continue
-                quality = smokeurl.find("strong").text
-                links = []
-                for link in smokeurl.find_all("a"):
-                    url = link.get("href")
-                    client = link.text
-                    links.append({"client": client, "url": url})
-                mendata["links"].append({"quality": quality, "link_download": links})
-            for smokeurl in smokedl.find_all("div", {"class": "smokeurlrh"}):
-                if not smokeurl:
-                    continue
-                quality = smokeurl.find("strong").text
-                links = []
-                for link in smokeurl.find_all("a"):
-                    url = link.get("href")
-                    client = link.text
-                    links.append({"client": client, "url": url})
-                mendata["links"].append({"quality": quality, "link_download": links})
-            data.append(mendata)
-            num += 1
-        for smokedl in soup.find("div", {"class": "dlbodz"}).find_all(
-            "div", {"class": "smokeddl"}
-        ):
-            if not smokedl:
-                continue
-            mendata = {"name": title, "links": []}
-            for smokeurl in smokedl.find_all("div", {"class": "smokeurl"}):
-                if not smokeurl:
-                    continue
-                quality = smokeurl.find("strong").text
-                links = []
-                for link in smokeurl.find_all("a"):
-                    url = link.get("href")
-                    client = link.text
-                    links.append({"client": client, "url": url})
-                mendata["links"].append({"quality": quality, "link_download": links})
-            for smokeurl in smokedl.find_all("div", {"class": "smokeurlrh"}):
-                if not smokeurl:
-                    continue
-                quality = smokeurl.find("strong").text
-                links = []
-                for link in smokeurl.find_all("a"):
-                    url = link.get("href")
-                    client = link.text
-                    links.append({"client": client, "url": url})
-                mendata["links"].append({"quality": quality, "link_download": links})
-            data.append(mendata)
-            num += 1
-        result.update(
-            {
-                "title": title,
-                "thumb": thumb,
-                "genre": genre,
-                "genre_string": ", ".join(genre),
-                "status_anime": status_anime,
-                "season": season,
-                "tipe": tipe,
-                "ep": ep,
-                "score": score,
-                "duration": duration,
-                "rilis": rilis,
-                "data": data,
-            }
-        )
+        result = await run_parser(parse_kusonime_page, page.text)
     except Exception as e:
         if result:
             result.clear()
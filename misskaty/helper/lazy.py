@@ -0,0 +1,24 @@
+import importlib.util
+import sys
+from types import ModuleType
+
+__all__ = ["lazy_import"]
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Module that is only executed on first attribute access.
+
+    For heavy top level packages (cv2, openai, iytdl...) that most plugins
+    import but rarely use, so they don't slow down startup.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -1,6 +1,6 @@
-import inspect
 import json
 import os.path
+import sys
 from functools import partial, wraps
 from glob import glob
 from typing import Dict, List
@@ -8,7 +8,8 @@ from typing import Dict, List
 from pyrogram.enums import ChatType
 from pyrogram.types import CallbackQuery, ChatMemberUpdated, InlineQuery, Message
 
-from database.locale_db import get_db_lang
+from database.context_db import get_update_context
+from database.locale_db import get_db_lang, group_types
 
 enabled_locales: List[str] = [
     # "en-GB",  # English (United Kingdom)
@@ -62,7 +63,10 @@ async def get_lang(message) -> str:
     else:
         raise TypeError(f"Update type '{message.__name__}' is not supported.")
 
-    lang = await get_db_lang(chat.id)
+    if isinstance(message, Message) and chat.type in group_types:
+        lang = (await get_update_context(message)).lang
+    else:
+        lang = await get_db_lang(chat.id)
 
     if chat.type == ChatType.PRIVATE:
         lang = lang or message.from_user.language_code or default_language
@@ -84,9 +88,9 @@ async def get_lang(message) -> str:
 def use_chat_lang(context: str = None):
     if not context:
         cwd = os.getcwd()
-        frame = inspect.stack()[1]
-
-        fname = frame.filename
+        # Only the caller's file name is needed, inspect.stack() would read
+        # the source of every frame for each decorated handler at import time
+        fname = sys._getframe(1).f_code.co_filename
 
         if fname.startswith(cwd):
             fname = fname[len(cwd) + 1 :]
@@ -0,0 +1,56 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from logging import getLogger
+from typing import Any, Callable, Optional
+
+__all__ = ["run_parser", "shutdown_parser_pool"]
+
+LOGGER = getLogger("MissKaty")
+PARSE_WORKERS = int(os.environ.get("PARSE_WORKERS", min(4, os.cpu_count() or 1)))
+# Jobs allowed to wait for a worker before callers queue on the event loop instead
+PARSE_BACKLOG = PARSE_WORKERS * 4
+# Imported once by the fork server, every worker forked from it starts with them
+PARSER_MODULES = ["parsers.imdb", "parsers.render", "parsers.scrapers"]
+
+_executor: Optional[ProcessPoolExecutor] = None
+_slots: Optional[asyncio.Semaphore] = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # Workers are forked from a fresh single threaded server process that only
+        # imported the parsers package. Forking the bot itself would copy its
+        # clients, sockets and locks held by other threads into every worker.
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(PARSER_MODULES)
+        _executor = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=context)
+    return _executor
+
+
+async def run_parser(func: Callable[..., Any], *args) -> Any:
+    """Run a CPU bound parser or image renderer from the parsers package in the shared process pool.
+
+    It must take and return plain picklable data such as HTML text, dicts and file paths.
+    """
+    global _executor, _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(PARSE_BACKLOG)
+    loop = asyncio.get_running_loop()
+    async with _slots:
+        try:
+            return await loop.run_in_executor(_get_executor(), func, *args)
+        except BrokenProcessPool:
+            LOGGER.warning("Parser pool broke while running %s, restarting it", func.__name__)
+            _executor = None
+            return await loop.run_in_executor(_get_executor(), func, *args)
+
+
+def shutdown_parser_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
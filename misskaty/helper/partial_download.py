@@ -0,0 +1,90 @@
+import asyncio
+import math
+import os
+from typing import Iterable, List, Optional, Set, Tuple
+
+from pyrogram import Client
+from pyrogram.types import Message
+
+__all__ = ["SparseFile", "CHUNK_SIZE"]
+
+# Telegram streams files in 1 MiB chunks
+CHUNK_SIZE = 1024 * 1024
+STREAM_WORKERS = 4
+
+_stream_slots: Optional[asyncio.Semaphore] = None
+
+
+def _missing_ranges(chunks: Iterable[int], have: Set[int]) -> List[Tuple[int, int]]:
+    """Group the chunk indexes not in ``have`` into (offset, limit) runs."""
+    runs: List[List[int]] = []
+    for index in sorted(set(chunks) - have):
+        if runs and index == runs[-1][0] + runs[-1][1]:
+            runs[-1][1] += 1
+        else:
+            runs.append([index, 1])
+    return [(offset, limit) for offset, limit in runs]
+
+
+class SparseFile:
+    """Parts of a Telegram file, written at their real offsets into a sparse file of full size.
+
+    Tools like ffprobe or mediainfo can open ``path`` as if it were the
+    whole file, as long as the parts they read have been fetched. Chunks are
+    only downloaded once, the file is removed on exit.
+    """
+
+    def __init__(self, client: Client, message: Message, media, path: str):
+        self.client = client
+        self.message = message
+        self.path = path
+        self.size = media.file_size
+        self.total = math.ceil(self.size / CHUNK_SIZE)
+        self._have: Set[int] = set()
+        self._fd: Optional[int] = None
+
+    async def __aenter__(self) -> "SparseFile":
+        # downloads/ is wiped by the nightly cleanup and only recreated by download_media
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        os.ftruncate(self._fd, self.size)
+        return self
+
+    async def __aexit__(self, *_):
+        os.close(self._fd)
+        os.remove(self.path)
+
+    @property
+    def complete(self) -> bool:
+        return len(self._have) == self.total
+
+    async def _fetch_run(self, offset: int, limit: int):
+        global _stream_slots
+        if _stream_slots is None:
+            _stream_slots = asyncio.Semaphore(STREAM_WORKERS)
+        async with _stream_slots:
+            index = offset
+            async for chunk in self.client.stream_media(
+                self.message, limit=limit, offset=offset
+            ):
+                os.pwrite(self._fd, chunk, index * CHUNK_SIZE)
+                self._have.add(index)
+                index += 1
+
+    async def fetch(self, ranges: Iterable[Tuple[int, int]]):
+        """Download (offset, limit) chunk ranges, clamped to the file and skipping fetched chunks."""
+        chunks = (
+            index
+            for offset, limit in ranges
+            for index in range(max(0, offset), min(offset + limit, self.total))
+        )
+        await asyncio.gather(
+            *(self._fetch_run(*run) for run in _missing_ranges(chunks, self._have))
+        )
+
+    async def fetch_edges(self, chunks: int):
+        """Download the first and last ``chunks`` chunks, where containers keep their headers and index."""
+        await self.fetch([(0, chunks), (self.total - chunks, chunks)])
+
+    async def fetch_all(self):
+        await self.fetch([(0, self.total)])
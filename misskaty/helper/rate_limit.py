@@ -0,0 +1,48 @@
+import asyncio
+from time import monotonic
+from typing import Optional
+
+__all__ = ["TokenBucket"]
+
+
+class TokenBucket:
+    """Async token bucket shared by every sender of a broadcast.
+
+    A FloodWait pauses the whole bucket and halves its rate, each success
+    raises the rate again by a small step up to the configured maximum.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None, min_rate: float = 1.0):
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def penalize(self, seconds: float):
+        self._paused_until = max(self._paused_until, monotonic() + seconds)
+        self._tokens = 0.0
+        self._updated = self._paused_until
+        self.rate = max(self.min_rate, self.rate / 2)
+
+    def reward(self):
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 500)
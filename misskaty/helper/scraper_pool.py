@@ -0,0 +1,124 @@
+import asyncio
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import Lock
+from typing import Any, Callable, Dict, Literal, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.cookies import RequestsCookieJar
+
+from misskaty.helper.lazy import lazy_import
+
+__all__ = ["ScraperPool", "scrapers"]
+
+SessionKind = Literal["requests", "cloudscraper"]
+cloudscraper = lazy_import("cloudscraper")
+
+
+class ScraperPool:
+    """Long-lived requests and cloudscraper sessions, pooled per host.
+
+    Sessions of one host share a cookie jar, so a solved challenge or
+    clearance cookie is reused by every later request. A session is only
+    used by one thread at a time. Blocking calls run on a dedicated bounded
+    thread pool instead of the default executor.
+    """
+
+    def __init__(self, sessions_per_host: int = 2, max_workers: int = 4):
+        self.sessions_per_host = sessions_per_host
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="scraper"
+        )
+        self._lock = Lock()
+        self._idle: Dict[Tuple[str, str], queue.LifoQueue] = {}
+        self._created: Dict[Tuple[str, str], int] = {}
+        self._jars: Dict[str, RequestsCookieJar] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    @staticmethod
+    def _new_session(kind: SessionKind) -> requests.Session:
+        if kind == "cloudscraper":
+            return cloudscraper.create_scraper()
+        return requests.Session()
+
+    def _stat(self, host: str) -> Dict[str, float]:
+        return self._stats.setdefault(
+            host,
+            {"requests": 0, "errors": 0, "seconds": 0.0, "fetches": 0, "fallbacks": 0},
+        )
+
+    def _checkout(self, kind: SessionKind, host: str) -> requests.Session:
+        key = (kind, host)
+        with self._lock:
+            idle = self._idle.setdefault(key, queue.LifoQueue())
+            if idle.empty() and self._created.get(key, 0) < self.sessions_per_host:
+                self._created[key] = self._created.get(key, 0) + 1
+                session = self._new_session(kind)
+                session.cookies = self._jars.setdefault(host, RequestsCookieJar())
+                return session
+        return idle.get()
+
+    def _checkin(self, kind: SessionKind, host: str, session: requests.Session) -> None:
+        self._idle[(kind, host)].put(session)
+
+    def request(
+        self, kind: SessionKind, method: str, url: str, **kwargs
+    ) -> requests.Response:
+        """Blocking request on a pooled session. Call from a worker thread."""
+        host = urlsplit(url).netloc
+        session = self._checkout(kind, host)
+        start = time.perf_counter()
+        try:
+            return session.request(method, url, **kwargs)
+        except Exception:
+            with self._lock:
+                self._stat(host)["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                stat = self._stat(host)
+                stat["requests"] += 1
+                stat["seconds"] += time.perf_counter() - start
+            self._checkin(kind, host, session)
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking scraping function on the scraper thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+
+    async def get(
+        self, url: str, kind: SessionKind = "cloudscraper", **kwargs
+    ) -> requests.Response:
+        return await self.run(self.request, kind, "GET", url, **kwargs)
+
+    def record_fetch(self, url: str, fallback: bool) -> None:
+        """Count one logical fetch of ``url`` and whether it needed a fallback path."""
+        with self._lock:
+            stat = self._stat(urlsplit(url).netloc)
+            stat["fetches"] += 1
+            stat["fallbacks"] += int(fallback)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Per host request count, errors, average latency and fallback rate."""
+        with self._lock:
+            return {
+                host: {
+                    "requests": stat["requests"],
+                    "errors": stat["errors"],
+                    "avg_latency": stat["seconds"] / stat["requests"]
+                    if stat["requests"]
+                    else 0.0,
+                    "fallback_rate": stat["fallbacks"] / stat["fetches"]
+                    if stat["fetches"]
+                    else 0.0,
+                }
+                for host, stat in self._stats.items()
+            }
+
+
+scrapers = ScraperPool()
@@ -0,0 +1,76 @@
+import asyncio
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from cachetools import TTLCache
+
+__all__ = ["SearchCache"]
+
+
+class SearchCache:
+    """Shared search results keyed by (site, normalized query).
+
+    Each site gets its own TTL. Concurrent lookups of the same key share a
+    single in-flight fetch instead of hitting the upstream site once per user.
+    Empty results and errors are never cached.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[Dict[str, int]] = None,
+        default_ttl: int = 600,
+        maxsize: int = 256,
+    ):
+        self.ttl = ttl or {}
+        self.default_ttl = default_ttl
+        self.maxsize = maxsize
+        self._caches: Dict[str, TTLCache] = {}
+        self._pending: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "shared": 0}
+
+    @staticmethod
+    def normalize(query: Optional[str]) -> str:
+        return " ".join((query or "").lower().split())
+
+    def key(self, site: str, query: Optional[str]) -> Tuple[str, str]:
+        return site, self.normalize(query)
+
+    def _cache(self, site: str) -> TTLCache:
+        if site not in self._caches:
+            self._caches[site] = TTLCache(
+                maxsize=self.maxsize, ttl=self.ttl.get(site, self.default_ttl)
+            )
+        return self._caches[site]
+
+    def _store(self, key: Tuple[str, str], task: asyncio.Future):
+        self._pending.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        if result := task.result():
+            self._cache(key[0])[key] = result
+
+    async def get(
+        self,
+        site: str,
+        query: Optional[str],
+        fetcher: Callable[[Optional[str]], Awaitable[Any]],
+    ) -> Any:
+        """Return the cached result for ``query`` on ``site``, calling ``fetcher(query)`` on a miss."""
+        key = self.key(site, query)
+        cache = self._cache(site)
+        if key in cache:
+            self.stats["hits"] += 1
+            return cache[key]
+        task = self._pending.get(key)
+        if task is None:
+            self.stats["misses"] += 1
+            task = asyncio.ensure_future(fetcher(query))
+            self._pending[key] = task
+            task.add_done_callback(partial(self._store, key))
+        else:
+            self.stats["shared"] += 1
+        return await asyncio.shield(task)
+
+    def clear(self):
+        for cache in self._caches.values():
+            cache.clear()
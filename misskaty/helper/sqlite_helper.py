@@ -1,18 +1,35 @@
+import asyncio
 import os
 import pickle
 import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 from datetime import datetime, timedelta, timezone
-from functools import wraps
+from functools import partial, wraps
 from pathlib import Path
-from threading import local
+from logging import getLogger
+from threading import Lock, local
 from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
+from weakref import WeakSet
 
-__all__ = ["Cache"]
+__all__ = ["AsyncCache", "Cache", "cache_stats", "sweep_caches"]
+
+LOGGER = getLogger("MissKaty")
+_MISSING = object()
+# Current unix time inside SQLite, comparable with the indexed `exp` column
+_NOW = "((julianday('now') - 2440587.5) * 86400.0)"
+_async_caches: "WeakSet[AsyncCache]" = WeakSet()
 
 
 class Cache:
-    """Simple SQLite Cache."""
+    """Simple SQLite Cache.
+
+    Reads go through a small in-memory LRU of already unpickled values, so
+    reading the same key again before it expires skips SQLite and pickle.
+    Values returned from that tier are shared, treat them as read-only.
+    """
 
     PICKLE_PROTOCOL = pickle.HIGHEST_PROTOCOL
     DEFAULT_TIMEOUT = 300
@@ -30,13 +47,14 @@ class Cache:
 
     _create_sql = "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, exp FLOAT);"
     _create_index_sql = "CREATE UNIQUE INDEX IF NOT EXISTS cache_key ON cache(key);"
+    _create_exp_index_sql = "CREATE INDEX IF NOT EXISTS cache_exp ON cache(exp);"
     _set_pragma = "PRAGMA {};"
     _set_pragma_equal = "PRAGMA {}={};"
 
     _add_sql = (
         "INSERT INTO cache (key, value, exp) VALUES (:key, :value, :exp) "
         "ON CONFLICT(key) DO UPDATE SET value = :value, exp = :exp "
-        "WHERE (exp <> -1.0 AND DATETIME(exp, 'unixepoch') <= DATETIME('now'));"
+        "WHERE (exp <> -1.0 AND exp <= " + _NOW + ");"
     )
     _get_sql = "SELECT value, exp FROM cache WHERE key = :key;"
     _set_sql = (
@@ -45,25 +63,25 @@ class Cache:
     )
     _check_sql = (
         "SELECT value, exp FROM cache WHERE key = :key "
-        "AND (exp = -1.0 OR DATETIME(exp, 'unixepoch') > DATETIME('now'));"
+        "AND (exp = -1.0 OR exp > " + _NOW + ");"
     )
     _update_sql = (
         "UPDATE cache SET value = :value WHERE key = :key "
-        "AND (exp = -1.0 OR DATETIME(exp, 'unixepoch') > DATETIME('now'));"
+        "AND (exp = -1.0 OR exp > " + _NOW + ");"
     )
 
     # TODO: add 'RETURNING COUNT(*)!=0' to these when sqlite3 version >=3.35.0
     _delete_sql = "DELETE FROM cache WHERE key = :key;"
     _touch_sql = (
         "UPDATE cache SET exp = :exp WHERE key = :key "
-        "AND (exp = -1.0 OR DATETIME(exp, 'unixepoch') > DATETIME('now'));"
+        "AND (exp = -1.0 OR exp > " + _NOW + ");"
     )
     _clear_sql = "DELETE FROM cache;"
 
     _add_many_sql = (
         "INSERT INTO cache (key, value, exp) VALUES {}"
         "ON CONFLICT(key) DO UPDATE SET value = excluded.value, exp = excluded.exp "
-        "WHERE (exp <> -1.0 AND DATETIME(exp, 'unixepoch') <= DATETIME('now'));"
+        "WHERE (exp <> -1.0 AND exp <= " + _NOW + ");"
     )
     _get_many_sql = "SELECT key, value, exp FROM cache WHERE key IN ({});"
     _set_many_sql = (
@@ -71,6 +89,13 @@ class Cache:
         "ON CONFLICT(key) DO UPDATE SET value = excluded.value, exp = excluded.exp;"
     )
     _delete_many_sql = "DELETE FROM cache WHERE key IN ({});"
+    _expire_sql = "DELETE FROM cache WHERE exp <> -1.0 AND exp <= " + _NOW + ";"
+    _size_sql = "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache;"
+    # Entries closest to expiry go first, entries without expiry last
+    _evict_order_sql = (
+        "SELECT key, LENGTH(value) FROM cache "
+        "ORDER BY exp = -1.0, exp LIMIT :limit;"
+    )
 
     def __init__(
         self,
@@ -82,6 +107,10 @@ class Cache:
         isolation_level: Optional[
             Literal["DEFERRED", "IMMEDIATE", "EXCLUSIVE"]
         ] = "DEFERRED",
+        memory_size: int = 128,
+        commit_delay: float = 0,
+        max_entries: int = 0,
+        max_bytes: int = 0,
         **kwargs,
     ):
         """Create a cache using sqlite3.
@@ -93,6 +122,11 @@ class Cache:
         :param isolation_level: Controls the transaction handling performed by sqlite3.
                                 If set to None, transactions are never implicitly opened.
                                 https://www.sqlite.org/lang_transaction.html
+        :param memory_size: How many unpickled values to keep in memory. 0 disables the memory tier.
+        :param commit_delay: Batch commits, committing at most once per this many seconds.
+                             Pending writes are visible on the same connection; call `flush()` to commit them.
+        :param max_entries: Evict entries above this count on `sweep()`. 0 means unlimited.
+        :param max_bytes: Evict entries above this total value size on `sweep()`. 0 means unlimited.
         :param kwargs: Pragma settings. https://www.sqlite.org/pragma.html
         """
 
@@ -105,9 +139,20 @@ class Cache:
         self.isolation_level = isolation_level
         self.local = local()
         self.local.instances = getattr(self.local, "instances", 0) + 1
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._memory_lock = Lock()
+        self.commit_delay = commit_delay
+        self._dirty = False
+        self._last_commit = time.monotonic()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.expirations = 0
+        self.evictions = 0
 
         self._con.execute(self._create_sql)
         self._con.execute(self._create_index_sql)
+        self._con.execute(self._create_exp_index_sql)
         self._con.commit()
 
     @property
@@ -138,6 +183,8 @@ class Cache:
         self.delete(key)
 
     def __contains__(self, key):
+        if self._recall(key) is not _MISSING:
+            return True
         return self._con.execute(self._check_sql, {"key": key}).fetchone() is not None
 
     def __enter__(self):
@@ -152,8 +199,24 @@ class Cache:
         if self.local.instances <= 0:
             self.close()
 
+    def _commit(self) -> None:
+        if self.commit_delay <= 0:
+            self._con.commit()
+            return
+        self._dirty = True
+        if time.monotonic() - self._last_commit >= self.commit_delay:
+            self.flush()
+
+    def flush(self) -> None:
+        """Commit writes held back by `commit_delay`."""
+        if self._dirty:
+            self._con.commit()
+            self._dirty = False
+        self._last_commit = time.monotonic()
+
     def close(self) -> None:
         """Closes the cache."""
+        self.flush()
         self._con.execute(
             self._set_pragma.format("optimize")
         )  # https://www.sqlite.org/pragma.html#pragma_optimize
@@ -175,6 +238,32 @@ class Cache:
     def _exp_datetime(exp: float) -> Optional[datetime]:
         return None if exp == -1.0 else datetime.utcfromtimestamp(exp)
 
+    def _remember(self, key: str, value: Any, exp: float) -> None:
+        if self.memory_size <= 0:
+            return
+        with self._memory_lock:
+            self._memory[key] = (value, exp)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def _recall(self, key: str) -> Any:
+        with self._memory_lock:
+            item = self._memory.get(key)
+            if item is None:
+                return _MISSING
+            value, exp = item
+            if exp != -1.0 and time.time() >= exp:
+                del self._memory[key]
+                return _MISSING
+            self._memory.move_to_end(key)
+            return value
+
+    def _forget(self, *keys: str) -> None:
+        with self._memory_lock:
+            for key in keys:
+                self._memory.pop(key, None)
+
     def _stream(self, value: Any) -> bytes:
         return pickle.dumps(value, protocol=self.PICKLE_PROTOCOL)
 
@@ -195,8 +284,9 @@ class Cache:
             "value": self._stream(value),
             "exp": self._exp_timestamp(timeout),
         }
+        self._forget(key)
         self._con.execute(self._add_sql, data)
-        self._con.commit()
+        self._commit()
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get the value under some key. Return `default` if key not in the cache or expired.
@@ -204,6 +294,10 @@ class Cache:
         :param key: Cache key.
         :param default: Value to return if key not in the cache.
         """
+        value = self._recall(key)
+        if value is not _MISSING:
+            return value
+
         result: Optional[Tuple[bytes, float]] = self._con.execute(
             self._get_sql, {"key": key}
         ).fetchone()
@@ -214,10 +308,12 @@ class Cache:
         exp = self._exp_datetime(result[1])
         if exp is not None and datetime.utcnow() >= exp:
             self._con.execute(self._delete_sql, {"key": key})
-            self._con.commit()
+            self._commit()
             return default
 
-        return self._unstream(result[0])
+        value = self._unstream(result[0])
+        self._remember(key, value, result[1])
+        return value
 
     def set(self, key: str, value: Any, timeout: int = DEFAULT_TIMEOUT) -> None:
         """Set a value in cache under some key.
@@ -232,8 +328,9 @@ class Cache:
             "value": self._stream(value),
             "exp": self._exp_timestamp(timeout),
         }
+        self._forget(key)
         self._con.execute(self._set_sql, data)
-        self._con.commit()
+        self._commit()
 
     def update(self, key: str, value: Any) -> None:
         """Update value in the cache. Does nothing if key not in the cache or expired.
@@ -242,8 +339,9 @@ class Cache:
         :param value: Picklable object to store.
         """
         data = {"key": key, "value": self._stream(value)}
+        self._forget(key)
         self._con.execute(self._update_sql, data)
-        self._con.commit()
+        self._commit()
 
     def touch(self, key: str, timeout: int = DEFAULT_TIMEOUT) -> None:
         """Extend the lifetime of an object in cache. Does nothing if key is not in the cache or is expired.
@@ -253,16 +351,18 @@ class Cache:
                         Negative numbers will keep the key in cache until manually removed.
         """
         data = {"exp": self._exp_timestamp(timeout), "key": key}
+        self._forget(key)
         self._con.execute(self._touch_sql, data)
-        self._con.commit()
+        self._commit()
 
     def delete(self, key: str) -> None:
         """Remove the value under the given key from the cache. Does nothing if key is not in the cache.
 
         :param key: Cache key.
         """
+        self._forget(key)
         self._con.execute(self._delete_sql, {"key": key})
-        self._con.commit()
+        self._commit()
 
     def add_many(self, dict_: Dict[str, Any], timeout: int = DEFAULT_TIMEOUT) -> None:
         """For all keys in the given dict, add the value to the cache only if the key is not
@@ -283,8 +383,9 @@ class Cache:
             data[f"value{i}"] = self._stream(value)
             data[f"exp{i}"] = exp
 
+        self._forget(*dict_)
         self._con.execute(command, data)
-        self._con.commit()
+        self._commit()
 
     def get_many(self, keys: List[str]) -> Dict[str, Any]:
         """Get all values that exist and aren't expired from the given cache keys, and return a dict.
@@ -315,7 +416,7 @@ class Cache:
                     ", ".join([f"'{value}'" for value in to_delete])
                 )
             )
-            self._con.commit()
+            self._commit()
 
         return results
 
@@ -337,8 +438,9 @@ class Cache:
             data[f"value{i}"] = self._stream(value)
             data[f"exp{i}"] = exp
 
+        self._forget(*dict_)
         self._con.execute(command, data)
-        self._con.commit()
+        self._commit()
 
     def update_many(self, dict_: Dict[str, Any]) -> None:
         """Update values to the cache for all keys in the given dict. Does nothing if key not in cache or expired.
@@ -348,8 +450,9 @@ class Cache:
         seq = [
             {"key": key, "value": self._stream(value)} for key, value in dict_.items()
         ]
+        self._forget(*dict_)
         self._con.executemany(self._update_sql, seq)
-        self._con.commit()
+        self._commit()
 
     def touch_many(self, keys: List[str], timeout: int = DEFAULT_TIMEOUT) -> None:
         """Extend the lifetime for all objects under the given keys in cache.
@@ -361,18 +464,20 @@ class Cache:
         """
         exp = self._exp_timestamp(timeout)
         seq = [{"key": key, "exp": exp} for key in keys]
+        self._forget(*keys)
         self._con.executemany(self._touch_sql, seq)
-        self._con.commit()
+        self._commit()
 
     def delete_many(self, keys: List[str]) -> None:
         """Remove all the values under the given keys from the cache.
 
         :param keys: List of cache keys.
         """
+        self._forget(*keys)
         self._con.execute(
             self._delete_many_sql.format(", ".join([f"'{value}'" for value in keys]))
         )
-        self._con.commit()
+        self._commit()
 
     def get_or_set(self, key: str, default: Any, timeout: int = DEFAULT_TIMEOUT) -> Any:
         """Get a value under some key, or set the default if key is not in cache.
@@ -382,6 +487,10 @@ class Cache:
         :param timeout: How long the value is valid in the cache.
                         Negative numbers will keep the key in cache until manually removed.
         """
+        value = self._recall(key)
+        if value is not _MISSING:
+            return value
+
         result: Optional[Tuple[bytes, float]] = self._con.execute(
             self._get_sql, {"key": key}
         ).fetchone()
@@ -399,7 +508,7 @@ class Cache:
             "exp": self._exp_timestamp(timeout),
         }
         self._con.execute(self._set_sql, data)
-        self._con.commit()
+        self._commit()
         return default
 
     def get_all(self) -> Dict[str, Any]:
@@ -409,8 +518,52 @@ class Cache:
 
     def clear(self) -> None:
         """Clear the cache from all values."""
+        with self._memory_lock:
+            self._memory.clear()
         self._con.execute(self._clear_sql)
-        self._con.commit()
+        self._commit()
+
+    def size(self) -> Tuple[int, int]:
+        """Return the number of stored entries and the total size of their values in bytes."""
+        return self._con.execute(self._size_sql).fetchone()
+
+    def sweep(self) -> Tuple[int, int]:
+        """Delete expired entries, then evict down to `max_entries` and `max_bytes`.
+
+        Returns how many entries expired and how many were evicted.
+        """
+        expired = self._con.execute(self._expire_sql).rowcount
+        entries, size = self.size()
+        over_entries = entries - self.max_entries if self.max_entries > 0 else 0
+        over_bytes = size - self.max_bytes if self.max_bytes > 0 else 0
+        victims = []
+        if over_entries > 0 or over_bytes > 0:
+            limit = over_entries if over_bytes <= 0 else entries
+            for key, length in self._con.execute(
+                self._evict_order_sql, {"limit": limit}
+            ):
+                if len(victims) >= over_entries and over_bytes <= 0:
+                    break
+                victims.append(key)
+                over_bytes -= length or 0
+            self._con.executemany(self._delete_sql, [{"key": key} for key in victims])
+        with self._memory_lock:
+            self._memory.clear()
+        self.expirations += expired
+        self.evictions += len(victims)
+        self._commit()
+        self.flush()
+        return expired, len(victims)
+
+    def stats(self) -> Dict[str, int]:
+        """Return size and eviction counters for this cache."""
+        entries, size = self.size()
+        return {
+            "entries": entries,
+            "bytes": size,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+        }
 
     def incr(self, key: str, delta: int = 1) -> int:
         """Increment the value in cache by the given delta.
@@ -432,10 +585,11 @@ class Cache:
             raise ValueError("Value is not a number.")
 
         new_value = value + delta
+        self._forget(key)
         self._con.execute(
             self._update_sql, {"key": key, "value": self._stream(new_value)}
         )
-        self._con.commit()
+        self._commit()
         return new_value
 
     def decr(self, key: str, delta: int = 1) -> int:
@@ -458,10 +612,11 @@ class Cache:
             raise ValueError("Value is not a number.")
 
         new_value = value - delta
+        self._forget(key)
         self._con.execute(
             self._update_sql, {"key": key, "value": self._stream(new_value)}
         )
-        self._con.commit()
+        self._commit()
         return new_value
 
     def memoize(
@@ -511,7 +666,7 @@ class Cache:
         ttl = int((exp - datetime.utcnow()).total_seconds())
         if ttl <= 0:
             self._con.execute(self._delete_sql, {"key": key})
-            self._con.commit()
+            self._commit()
             return -2
 
         return ttl
@@ -555,6 +710,149 @@ class Cache:
                     ", ".join([f"'{value}'" for value in to_delete])
                 )
             )
-            self._con.commit()
+            self._commit()
 
         return results
+
+
+class AsyncCache:
+    """Non-blocking variant of `Cache` for coroutines.
+
+    Every SQLite call runs on one dedicated thread that owns the connection,
+    and commits are batched through `Cache.commit_delay`. Reads answered by
+    the in-memory tier never leave the event loop. Methods mirror `Cache`
+    but must be awaited, including `await cache[key]`.
+    """
+
+    def __init__(self, *, commit_delay: float = 1.0, **kwargs):
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"cache-{kwargs.get('filename', '')}"
+        )
+        self._cache: Cache = self._executor.submit(
+            partial(Cache, commit_delay=commit_delay, **kwargs)
+        ).result()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self.name = kwargs.get("filename", ".cache")
+        _async_caches.add(self)
+
+    async def _run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+        if self._cache._dirty and self._flush_handle is None:
+            self._flush_handle = loop.call_later(
+                self._cache.commit_delay, self._scheduled_flush
+            )
+        return result
+
+    def _scheduled_flush(self) -> None:
+        self._flush_handle = None
+        self._executor.submit(self._cache.flush)
+
+    async def __getitem__(self, item: str) -> Any:
+        value = await self.get(item)
+        if value is None:
+            raise KeyError("Key not in cache.")
+        return value
+
+    async def contains(self, key: str) -> bool:
+        if self._cache._recall(key) is not _MISSING:
+            return True
+        return await self._run(self._cache.__contains__, key)
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        value = self._cache._recall(key)
+        if value is not _MISSING:
+            return value
+        return await self._run(self._cache.get, key, default)
+
+    async def add(self, key: str, value: Any, timeout: int = Cache.DEFAULT_TIMEOUT) -> None:
+        await self._run(self._cache.add, key, value, timeout)
+
+    async def set(self, key: str, value: Any, timeout: int = Cache.DEFAULT_TIMEOUT) -> None:
+        await self._run(self._cache.set, key, value, timeout)
+
+    async def update(self, key: str, value: Any) -> None:
+        await self._run(self._cache.update, key, value)
+
+    async def touch(self, key: str, timeout: int = Cache.DEFAULT_TIMEOUT) -> None:
+        await self._run(self._cache.touch, key, timeout)
+
+    async def delete(self, key: str) -> None:
+        await self._run(self._cache.delete, key)
+
+    async def add_many(
+        self, dict_: Dict[str, Any], timeout: int = Cache.DEFAULT_TIMEOUT
+    ) -> None:
+        await self._run(self._cache.add_many, dict_, timeout)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        return await self._run(self._cache.get_many, keys)
+
+    async def set_many(
+        self, dict_: Dict[str, Any], timeout: int = Cache.DEFAULT_TIMEOUT
+    ) -> None:
+        await self._run(self._cache.set_many, dict_, timeout)
+
+    async def update_many(self, dict_: Dict[str, Any]) -> None:
+        await self._run(self._cache.update_many, dict_)
+
+    async def touch_many(
+        self, keys: List[str], timeout: int = Cache.DEFAULT_TIMEOUT
+    ) -> None:
+        await self._run(self._cache.touch_many, keys, timeout)
+
+    async def delete_many(self, keys: List[str]) -> None:
+        await self._run(self._cache.delete_many, keys)
+
+    async def get_or_set(
+        self, key: str, default: Any, timeout: int = Cache.DEFAULT_TIMEOUT
+    ) -> Any:
+        return await self._run(self._cache.get_or_set, key, default, timeout)
+
+    async def get_all(self) -> Dict[str, Any]:
+        return await self._run(self._cache.get_all)
+
+    async def clear(self) -> None:
+        await self._run(self._cache.clear)
+
+    async def incr(self, key: str, delta: int = 1) -> int:
+        return await self._run(self._cache.incr, key, delta)
+
+    async def decr(self, key: str, delta: int = 1) -> int:
+        return await self._run(self._cache.decr, key, delta)
+
+    async def ttl(self, key: str) -> int:
+        return await self._run(self._cache.ttl, key)
+
+    async def ttl_many(self, keys: List[str]) -> Dict[str, int]:
+        return await self._run(self._cache.ttl_many, keys)
+
+    async def flush(self) -> None:
+        await self._run(self._cache.flush)
+
+    async def sweep(self) -> Tuple[int, int]:
+        return await self._run(self._cache.sweep)
+
+    async def stats(self) -> Dict[str, int]:
+        return await self._run(self._cache.stats)
+
+    async def close(self) -> None:
+        await self._run(self._cache.close)
+        self._executor.shutdown(wait=False)
+
+
+async def sweep_caches() -> None:
+    """Expire and evict entries of every live AsyncCache. Scheduled from ``__main__``."""
+    for cache in list(_async_caches):
+        expired, evicted = await cache.sweep()
+        if expired or evicted:
+            LOGGER.info(
+                "Cache %s: %d expired, %d evicted", cache.name, expired, evicted
+            )
+
+
+async def cache_stats() -> Dict[str, Dict[str, int]]:
+    """Return `Cache.stats()` of every live AsyncCache, keyed by file name."""
+    return {cache.name: await cache.stats() for cache in list(_async_caches)}
@@ -1,6 +1,9 @@
-import cloudscraper
 from bs4 import BeautifulSoup
 
+from misskaty.helper.lazy import lazy_import
+
+cloudscraper = lazy_import("cloudscraper")
+
 
 async def down_page(url):
     f = cloudscraper.create_scraper()
@@ -0,0 +1,80 @@
+import asyncio
+import time
+from collections import deque
+from typing import Deque, NamedTuple, Optional
+
+import psutil
+
+__all__ = ["MetricsSampler", "Sample", "metrics"]
+
+SAMPLE_INTERVAL = 5
+# Enough samples for the 5 minute average
+SAMPLE_HISTORY = 5 * 60 // SAMPLE_INTERVAL
+
+
+class Sample(NamedTuple):
+    timestamp: float
+    cpu: float
+    ram_percent: float
+    ram_used: int
+    ram_total: int
+    disk_percent: float
+    disk_used: int
+    disk_total: int
+    disk_free: int
+    net_sent: int
+    net_recv: int
+    rss: int
+
+
+class MetricsSampler:
+    """System and process metrics sampled in the background into a ring buffer.
+
+    ``collect`` is scheduled every ``SAMPLE_INTERVAL`` seconds, readers get the
+    latest sample and CPU averages without calling psutil themselves.
+    """
+
+    def __init__(self, history: int = SAMPLE_HISTORY):
+        self._samples: Deque[Sample] = deque(maxlen=history)
+        self._process = psutil.Process()
+        # The first call only sets the reference point for the next ones
+        psutil.cpu_percent(interval=None)
+
+    def sample(self) -> Sample:
+        ram = psutil.virtual_memory()
+        disk = psutil.disk_usage("/")
+        net = psutil.net_io_counters()
+        return Sample(
+            timestamp=time.time(),
+            cpu=psutil.cpu_percent(interval=None),
+            ram_percent=ram.percent,
+            ram_used=ram.used,
+            ram_total=ram.total,
+            disk_percent=disk.percent,
+            disk_used=disk.used,
+            disk_total=disk.total,
+            disk_free=disk.free,
+            net_sent=net.bytes_sent,
+            net_recv=net.bytes_recv,
+            rss=self._process.memory_info().rss,
+        )
+
+    async def collect(self):
+        loop = asyncio.get_running_loop()
+        self._samples.append(await loop.run_in_executor(None, self.sample))
+
+    def latest(self) -> Sample:
+        if not self._samples:
+            self._samples.append(self.sample())
+        return self._samples[-1]
+
+    def cpu_average(self, seconds: int) -> Optional[float]:
+        """Mean CPU percent over the last ``seconds``, None before any sample."""
+        if not self._samples:
+            return None
+        since = self._samples[-1].timestamp - seconds
+        values = [s.cpu for s in self._samples if s.timestamp > since]
+        return round(sum(values) / len(values), 1)
+
+
+metrics = MetricsSampler()
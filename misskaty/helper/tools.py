@@ -1,5 +1,4 @@
 import logging
-import os
 import random
 import re
 import string
@@ -10,17 +9,17 @@ from googletrans import Translator
 from typing import Union
 from urllib.parse import urlparse
 
-import cv2
-import numpy as np
-import psutil
-
 from misskaty import BOT_NAME, UBOT_NAME, botStartTime
 from misskaty.core.decorator import asyncify
 from misskaty.helper.http import fetch
 from misskaty.helper.human_read import get_readable_time
+from misskaty.helper.lazy import lazy_import
+from misskaty.helper.sys_metrics import metrics
 from misskaty.plugins import ALL_MODULES
 
 LOGGER = logging.getLogger("MissKaty")
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
 URL_REGEX = r"(http|ftp|https):\/\/([\w_-]+(?:(?:\.[\w_-]+)+))([\w.,@?^=%&:\/~+#-]*[\w@?^=%&\/~+#-])"
 GENRES_EMOJI = {
     "Action": "👊",
@@ -61,18 +60,15 @@ def is_url(url):
 
 async def bot_sys_stats():
     bot_uptime = int(time.time() - botStartTime)
-    cpu = psutil.cpu_percent(interval=0.5)
-    mem = psutil.virtual_memory().percent
-    disk = psutil.disk_usage("/").percent
-    process = psutil.Process(os.getpid())
+    sample = metrics.latest()
     return f"""
 {UBOT_NAME}@{BOT_NAME}
 ------------------
 UPTIME: {get_readable_time(bot_uptime)}
-BOT: {round(process.memory_info()[0] / 1024**2)} MB
-CPU: {cpu}%
-RAM: {mem}%
-DISK: {disk}%
+BOT: {round(sample.rss / 1024**2)} MB
+CPU: {sample.cpu}% (1m {metrics.cpu_average(60)}%, 5m {metrics.cpu_average(300)}%)
+RAM: {sample.ram_percent}%
+DISK: {sample.disk_percent}%
 
 TOTAL PLUGINS: {len(ALL_MODULES)}
 """
@@ -26,7 +26,6 @@ import asyncio
 import os
 import re
 from logging import getLogger
-from time import time
 
 from pyrogram import Client, enums, filters
 from pyrogram.errors import (
@@ -37,19 +36,19 @@ from pyrogram.errors import (
 )
 from pyrogram.types import ChatMember, ChatPermissions, ChatPrivileges, Message
 
-from database.warn_db import add_warn, get_warn, remove_warns
+from database.warn_db import add_warn, get_warn, remove_warn, remove_warns
 from misskaty import app
 from misskaty.core.decorator.errors import capture_err
 from misskaty.core.decorator.permissions import (
-    admins_in_chat,
     list_admins,
     member_permissions,
+    update_admin_roster,
 )
 from misskaty.core.keyboard import ikb
+from misskaty.helper.fanout import forget_bot_rights
 from misskaty.helper.functions import (
     extract_user,
     extract_user_and_reason,
-    int_to_alpha,
     time_converter,
 )
 from misskaty.helper.localization import use_chat_lang
@@ -90,23 +89,20 @@ __HELP__ = """
 """
 
 
-# Admin cache reload
+# Admin cache delta update
 @app.on_chat_member_updated(filters.group, group=5)
 async def admin_cache_func(_, cmu):
-    if cmu.old_chat_member and cmu.old_chat_member.promoted_by:
-        try:
-            admins_in_chat[cmu.chat.id] = {
-                "last_updated_at": time(),
-                "data": [
-                    member.user.id
-                    async for member in app.get_chat_members(
-                        cmu.chat.id, filter=enums.ChatMembersFilter.ADMINISTRATORS
-                    )
-                ],
-            }
-            LOGGER.info(f"Updated admin cache for {cmu.chat.id} [{cmu.chat.title}]")
-        except:
-            pass
+    member = cmu.new_chat_member or cmu.old_chat_member
+    if not member or not member.user:
+        return
+    admin_status = (enums.ChatMemberStatus.ADMINISTRATOR, enums.ChatMemberStatus.OWNER)
+    was_admin = bool(cmu.old_chat_member) and cmu.old_chat_member.status in admin_status
+    is_admin = bool(cmu.new_chat_member) and cmu.new_chat_member.status in admin_status
+    # Joins, leaves and restrictions of regular members don't touch the roster
+    if was_admin or is_admin:
+        await update_admin_roster(cmu.chat.id, member.user.id, is_admin)
+    if member.user.is_self:
+        forget_bot_rights(cmu.chat.id)
 
 
 # Purge CMD
@@ -610,29 +606,27 @@ async def warn_user(client, message, strings):
         return await message.reply_text(strings("warn_sudo_err"))
     if user_id in (await list_admins(chat_id)):
         return await message.reply_text(strings("warn_admin_err"))
-    user, warns = await asyncio.gather(
+    # Decide from the count the increment returned, concurrent warns each see their own
+    user, twarn = await asyncio.gather(
         app.get_users(user_id),
-        get_warn(chat_id, await int_to_alpha(user_id)),
+        add_warn(chat_id, user_id),
     )
     mention = user.mention
     keyboard = ikb({strings("rm_warn_btn"): f"unwarn_{user_id}"})
-    warns = warns["warns"] if warns else 0
     if message.command[0][0] == "d":
         await message.reply_to_message.delete()
-    if warns >= 2:
+    if twarn >= 3:
         await message.chat.ban_member(user_id)
         await message.reply_text(strings("exceed_warn_msg").format(mention=mention))
-        await remove_warns(chat_id, await int_to_alpha(user_id))
+        await remove_warns(chat_id, user_id)
     else:
-        warn = {"warns": warns + 1}
         msg = strings("warn_msg").format(
             mention=mention,
             warner=message.from_user.mention if message.from_user else "Anon",
             reas=reason or "No Reason Provided.",
-            twarn=warns + 1,
+            twarn=twarn,
         )
         await message.reply_text(msg, reply_markup=keyboard)
-        await add_warn(chat_id, await int_to_alpha(user_id), warn)
 
 
 @app.on_callback_query(filters.regex("unwarn_"))
@@ -648,17 +642,12 @@ async def remove_warning(_, cq, strings):
             show_alert=True,
         )
     user_id = int(cq.data.split("_")[1])
-    warns = await get_warn(chat_id, await int_to_alpha(user_id))
-    if warns:
-        warns = warns["warns"]
-    if not warns or warns == 0:
+    if await remove_warn(chat_id, user_id) is None:
         return await cq.answer(
             strings("user_no_warn").format(
                 mention=cq.message.reply_to_message.from_user.id
             )
         )
-    warn = {"warns": warns - 1}
-    await add_warn(chat_id, await int_to_alpha(user_id), warn)
     text = cq.message.text.markdown
     text = f"~~{text}~~\n\n"
     text += strings("unwarn_msg").format(mention=from_user.mention)
@@ -721,13 +710,13 @@ async def remove_warnings(_, message, strings):
     user_id = message.reply_to_message.from_user.id
     mention = message.reply_to_message.from_user.mention
     chat_id = message.chat.id
-    warns = await get_warn(chat_id, await int_to_alpha(user_id))
+    warns = await get_warn(chat_id, user_id)
     if warns:
         warns = warns["warns"]
     if warns == 0 or not warns:
         await message.reply_text(strings("user_no_warn").format(mention=mention))
     else:
-        await remove_warns(chat_id, await int_to_alpha(user_id))
+        await remove_warns(chat_id, user_id)
         await message.reply_text(strings("rmwarn_msg").format(mention=mention))
 
 
@@ -740,7 +729,7 @@ async def check_warns(_, message, strings):
     user_id = await extract_user(message)
     if not user_id:
         return await message.reply_text(strings("user_not_found"))
-    warns = await get_warn(message.chat.id, await int_to_alpha(user_id))
+    warns = await get_warn(message.chat.id, user_id)
     mention = (await app.get_users(user_id)).mention
     if warns:
         warns = warns["warns"]
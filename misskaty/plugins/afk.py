@@ -17,6 +17,7 @@ from pyrogram import Client, enums, filters
 from pyrogram.types import Message
 
 from database.afk_db import add_afk, cleanmode_off, cleanmode_on, is_afk, remove_afk
+from database.context_db import get_update_context
 from misskaty import app
 from misskaty.core.decorator.permissions import adminsOnly
 from misskaty.helper import get_readable_time2
@@ -253,9 +254,10 @@ async def afk_watcher_func(self: Client, ctx: Message, strings):
 
     msg = ""
     replied_user_id = 0
+    uctx = await get_update_context(ctx)
 
     # Self AFK
-    verifier, reasondb = await is_afk(userid)
+    verifier, reasondb = await uctx.is_afk(userid)
     if verifier:
         await remove_afk(userid)
         try:
@@ -310,7 +312,7 @@ async def afk_watcher_func(self: Client, ctx: Message, strings):
         try:
             replied_first_name = ctx.reply_to_message.from_user.mention
             replied_user_id = ctx.reply_to_message.from_user.id
-            verifier, reasondb = await is_afk(replied_user_id)
+            verifier, reasondb = await uctx.is_afk(replied_user_id)
             if verifier:
                 try:
                     afktype = reasondb["type"]
@@ -392,7 +394,7 @@ async def afk_watcher_func(self: Client, ctx: Message, strings):
                 except:
                     j += 1
                     continue
-                verifier, reasondb = await is_afk(user.id)
+                verifier, reasondb = await uctx.is_afk(user.id)
                 if verifier:
                     try:
                         afktype = reasondb["type"]
@@ -461,7 +463,7 @@ async def afk_watcher_func(self: Client, ctx: Message, strings):
                 except:
                     j += 1
                     continue
-                verifier, reasondb = await is_afk(user_id)
+                verifier, reasondb = await uctx.is_afk(user_id)
                 if verifier:
                     try:
                         afktype = reasondb["type"]
@@ -1,50 +1,76 @@
 import asyncio
 import datetime
 import time
+from contextlib import suppress
+from logging import getLogger
+from typing import Dict, Optional
 
-from async_pymongo import AsyncClient
 from pyrogram import filters
 from pyrogram.types import Message
 
-from misskaty import DATABASE_URI, app
+from database.broadcast_db import get_unfinished_broadcasts, new_broadcast
+from misskaty import app
+from misskaty.helper.broadcaster import Broadcaster, peersdb
 from misskaty.vars import SUDO
-from utils import broadcast_messages
+
+LOGGER = getLogger("MissKaty")
+_running: Optional[asyncio.Task] = None
+
+
+def broadcast_text(job: dict, counters: Dict[str, int], completed: bool = False) -> str:
+    total = job["total"]
+    head = "Broadcast Completed" if completed else "Broadcast in progress"
+    text = f"{head}:\n"
+    if completed:
+        time_taken = datetime.timedelta(seconds=int(time.time() - job["started"]))
+        text += f"Completed in {time_taken} seconds.\n"
+    return (
+        f"{text}\nTotal Users {total}\nCompleted: {counters['done']} / {total}\n"
+        f"Success: {counters['success']}\nBlocked: {counters['blocked']}\n"
+        f"Deleted: {counters['deleted']}\nFailed: {counters['failed']}"
+    )
+
+
+async def run_broadcast(job: dict):
+    async def on_progress(counters):
+        # A deleted or unchanged status message must not stop the broadcast
+        with suppress(Exception):
+            await app.edit_message_text(
+                job["status_chat_id"],
+                job["status_message_id"],
+                broadcast_text(job, counters),
+            )
+
+    try:
+        counters = await Broadcaster(app, job, on_progress).run()
+        await app.edit_message_text(
+            job["status_chat_id"],
+            job["status_message_id"],
+            broadcast_text(job, counters, completed=True),
+        )
+    except Exception as e:
+        LOGGER.error("Broadcast %s stopped: %s", job["_id"], e)
+
+
+def start_broadcast(job: dict) -> asyncio.Task:
+    global _running
+    _running = asyncio.create_task(run_broadcast(job))
+    return _running
+
+
+async def resume_broadcasts():
+    """Continue broadcasts interrupted by a restart, one after another."""
+    for job in await get_unfinished_broadcasts():
+        LOGGER.info("[INFO]: Resuming broadcast %s after %s", job["_id"], job["last_peer"])
+        await start_broadcast(job)
 
 
 @app.on_message(filters.command("broadcast") & filters.user(SUDO) & filters.reply)
 async def broadcast(_, ctx: Message):
-    mongo = AsyncClient(DATABASE_URI)
-    userdb = mongo["MissKatyBot"]["peers"]
+    if _running and not _running.done():
+        return await ctx.reply_msg("Another broadcast is still running, try again later.")
     b_msg = ctx.reply_to_message
     sts = await ctx.reply_msg("Broadcasting your messages...")
-    start_time = time.time()
-    total_users = await userdb.count_documents({})
-    done = 0
-    blocked = 0
-    deleted = 0
-    failed = 0
-
-    success = 0
-    async for chat in userdb.find({"type": "user"}):
-        if chat["type"] != "user":
-            continue
-        pti, sh = await broadcast_messages(int(chat["_id"]), b_msg)
-        if pti:
-            success += 1
-        elif pti is False:
-            if sh == "Blocked":
-                blocked += 1
-            elif sh == "Deleted":
-                deleted += 1
-            elif sh == "Error":
-                failed += 1
-        done += 1
-        await asyncio.sleep(2)
-        if not done % 20:
-            await sts.edit_msg(
-                f"Broadcast in progress:\n\nTotal Users {total_users}\nCompleted: {done} / {total_users}\nSuccess: {success}\nBlocked: {blocked}\nDeleted: {deleted}"
-            )
-    time_taken = datetime.timedelta(seconds=int(time.time() - start_time))
-    await sts.edit_msg(
-        f"Broadcast Completed:\nCompleted in {time_taken} seconds.\n\nTotal Users {total_users}\nCompleted: {done} / {total_users}\nSuccess: {success}\nBlocked: {blocked}\nDeleted: {deleted}"
-    )
+    total_users = await peersdb.count_documents({"type": "user"})
+    job = await new_broadcast(b_msg.chat.id, b_msg.id, sts.chat.id, sts.id, total_users)
+    start_broadcast(job)
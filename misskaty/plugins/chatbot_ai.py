@@ -6,7 +6,6 @@ import asyncio
 import html
 
 from cachetools import TTLCache
-from openai import APIConnectionError, APIStatusError, AsyncOpenAI, RateLimitError
 from pyrogram import filters
 from pyrogram.errors import MessageTooLong
 from pyrogram.types import Message
@@ -14,6 +13,7 @@ from pyrogram.types import Message
 from misskaty import app
 from misskaty.core import pyro_cooldown
 from misskaty.helper import check_time_gap, post_to_telegraph, use_chat_lang
+from misskaty.helper.lazy import lazy_import
 from misskaty.vars import COMMAND_HANDLER, GOOGLEAI_KEY, OPENAI_KEY, SUDO
 
 __MODULE__ = "ChatBot"
@@ -22,11 +22,12 @@ __HELP__ = """
 /ask - Generate text response from AI using OpenAI.
 """
 
+openai = lazy_import("openai")
 duckai_conversations = TTLCache(maxsize=4000, ttl=24*60*60)
 gemini_conversations = TTLCache(maxsize=4000, ttl=24*60*60)
 
 async def get_openai_stream_response(is_stream, key, base_url, model, messages, bmsg, strings):
-    ai = AsyncOpenAI(api_key=key, base_url=base_url)
+    ai = openai.AsyncOpenAI(api_key=key, base_url=base_url)
     response = await ai.chat.completions.create(
         model=model,
         messages=messages,
@@ -58,17 +59,17 @@ async def get_openai_stream_response(is_stream, key, base_url, model, messages,
             strings("answers_too_long").format(answerlink=answerlink),
             disable_web_page_preview=True,
         )
-    except APIConnectionError as e:
+    except openai.APIConnectionError as e:
         await bmsg.edit_msg(f"The server could not be reached because {e.__cause__}")
         return None
-    except RateLimitError as e:
+    except openai.RateLimitError as e:
         if "billing details" in str(e):
             return await bmsg.edit_msg(
                 "This openai key from this bot has expired, please give openai key donation for bot owner."
             )
         await bmsg.edit_msg("You're got rate limit, please try again later.")
         return None
-    except APIStatusError as e:
+    except openai.APIStatusError as e:
         await bmsg.edit_msg(
             f"Another {e.status_code} status code was received with response {e.response}"
         )
@@ -12,19 +12,15 @@ import traceback
 from datetime import datetime
 from inspect import getfullargspec
 from logging import getLogger
-from shutil import disk_usage
 from time import time
 from typing import Any, Optional, Tuple
 
 import aiohttp
-import cloudscraper
 import requests
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from bs4 import BeautifulSoup
-from PIL import Image, ImageDraw, ImageFont
-from psutil import Process, boot_time, cpu_count, cpu_percent
-from psutil import disk_usage as disk_usage_percent
-from psutil import net_io_counters, virtual_memory
+from cachetools import TTLCache
+from psutil import boot_time, cpu_count
 from pyrogram import Client
 from pyrogram import __version__ as pyrover
 from pyrogram import enums, filters
@@ -45,6 +41,8 @@ from pyrogram.types import (
     PreCheckoutQuery,
 )
 
+from database import pool_stats
+from database.indexes import DB_SLOW_MS, audit_queries
 from database.gban_db import add_gban_user, is_gbanned_user, remove_gban_user
 from database.users_chats_db import db
 from misskaty import BOT_NAME, app, botStartTime, misskaty_version, user
@@ -52,6 +50,10 @@ from misskaty.core.decorator import new_task
 from misskaty.helper.eval_helper import format_exception, meval
 from misskaty.helper.functions import extract_user, extract_user_and_reason
 from misskaty.helper.http import fetch
+from misskaty.helper.image_render import render_stats
+from misskaty.helper.lazy import lazy_import
+from misskaty.helper.parse_pool import run_parser
+from misskaty.helper.sys_metrics import metrics
 from misskaty.helper.human_read import get_readable_file_size, get_readable_time
 from misskaty.helper.localization import use_chat_lang
 from misskaty.vars import AUTO_RESTART, COMMAND_HANDLER, LOG_CHANNEL, SUDO
@@ -79,6 +81,9 @@ __HELP__ = """
 var = {}
 teskode = {}
 LOGGER = getLogger("MissKaty")
+neofetch_cache = TTLCache(maxsize=1, ttl=3600)
+# Only needed by the eval namespace
+cloudscraper = lazy_import("cloudscraper")
 
 
 async def edit_or_reply(self, msg, **kwargs):
@@ -219,32 +224,35 @@ async def server_stats(_, ctx: Message) -> "Message":
     """
     Give system stats of the server.
     """
-    total, used, free = disk_usage(".")
-    process = Process(os.getpid())
+    sample = metrics.latest()
 
     botuptime = get_readable_time(time() - botStartTime)
     osuptime = get_readable_time(time() - boot_time())
     currentTime = get_readable_time(time() - botStartTime)
-    botusage = f"{round(process.memory_info()[0]/1024 ** 2)} MB"
+    botusage = f"{round(sample.rss/1024 ** 2)} MB"
 
-    upload = get_readable_file_size(net_io_counters().bytes_sent)
-    download = get_readable_file_size(net_io_counters().bytes_recv)
+    upload = get_readable_file_size(sample.net_sent)
+    download = get_readable_file_size(sample.net_recv)
 
-    cpu_percentage = cpu_percent()
+    cpu_percentage = sample.cpu
     cpu_counts = cpu_count()
 
-    ram_percentage = virtual_memory().percent
-    ram_total = get_readable_file_size(virtual_memory().total)
-    ram_used = get_readable_file_size(virtual_memory().used)
+    ram_percentage = sample.ram_percent
+    ram_total = get_readable_file_size(sample.ram_total)
+    ram_used = get_readable_file_size(sample.ram_used)
 
-    disk_percenatge = disk_usage_percent("/").percent
-    disk_total = get_readable_file_size(total)
-    disk_used = get_readable_file_size(used)
-    disk_free = get_readable_file_size(free)
+    disk_percenatge = sample.disk_percent
+    disk_total = get_readable_file_size(sample.disk_total)
+    disk_used = get_readable_file_size(sample.disk_used)
+    disk_free = get_readable_file_size(sample.disk_free)
 
-    neofetch = (await shell_exec("neofetch --stdout"))[0]
+    # Host details barely change, don't spawn neofetch on every request
+    if "neofetch" not in neofetch_cache:
+        neofetch_cache["neofetch"] = (await shell_exec("neofetch --stdout"))[0]
+    neofetch = neofetch_cache["neofetch"]
+    pool = pool_stats.snapshot()
 
-    caption = f"<b>{BOT_NAME} {misskaty_version} is Up and Running successfully.</b>\n\n<code>{neofetch}</code>\n\n**OS Uptime:** <code>{osuptime}</code>\n<b>Bot Uptime:</b> <code>{currentTime}</code>\n**Bot Usage:** <code>{botusage}</code>\n\n**Total Space:** <code>{disk_total}</code>\n**Free Space:** <code>{disk_free}</code>\n\n**Download:** <code>{download}</code>\n**Upload:** <code>{upload}</code>\n\n<b>PyroFork Version</b>: <code>{pyrover}</code>\n<b>Python Version</b>: <code>{sys.version_info[0]}.{sys.version_info[1]}.{sys.version_info[2]} {sys.version_info[3].title()}</code>"
+    caption = f"<b>{BOT_NAME} {misskaty_version} is Up and Running successfully.</b>\n\n<code>{neofetch}</code>\n\n**OS Uptime:** <code>{osuptime}</code>\n<b>Bot Uptime:</b> <code>{currentTime}</code>\n**Bot Usage:** <code>{botusage}</code>\n**CPU Load (1m/5m):** <code>{metrics.cpu_average(60)}% / {metrics.cpu_average(300)}%</code>\n**DB Pool:** <code>{pool['checked_out']}/{pool['open']} in use, wait {pool['wait_avg_ms']} ms avg / {pool['wait_max_ms']} ms max</code>\n\n**Total Space:** <code>{disk_total}</code>\n**Free Space:** <code>{disk_free}</code>\n\n**Download:** <code>{download}</code>\n**Upload:** <code>{upload}</code>\n\n<b>PyroFork Version</b>: <code>{pyrover}</code>\n<b>Python Version</b>: <code>{sys.version_info[0]}.{sys.version_info[1]}.{sys.version_info[2]} {sys.version_info[3].title()}</code>"
 
     if "oracle" in platform.uname().release:
         return await ctx.reply_msg(caption, quote=True)
@@ -257,55 +265,44 @@ async def server_stats(_, ctx: Message) -> "Message":
     )
     end = datetime.now()
 
-    image = Image.open("assets/statsbg.jpg").convert("RGB")
-    IronFont = ImageFont.truetype("assets/IronFont.otf", 42)
-    draw = ImageDraw.Draw(image)
-
-    def draw_progressbar(coordinate, progress):
-        progress = 110 + (progress * 10.8)
-        draw.ellipse((105, coordinate - 25, 127, coordinate), fill="#FFFFFF")
-        draw.rectangle((120, coordinate - 25, progress, coordinate), fill="#FFFFFF")
-        draw.ellipse(
-            (progress - 7, coordinate - 25, progress + 15, coordinate), fill="#FFFFFF"
-        )
-
-    draw_progressbar(243, int(cpu_percentage))
-    draw.text(
-        (225, 153),
-        f"( {cpu_counts} core, {cpu_percentage}% )",
-        (255, 255, 255),
-        font=IronFont,
-    )
-
-    draw_progressbar(395, int(disk_percenatge))
-    draw.text(
-        (335, 302),
-        f"( {disk_used} / {disk_total}, {disk_percenatge}% )",
-        (255, 255, 255),
-        font=IronFont,
-    )
-
-    draw_progressbar(533, int(ram_percentage))
-    draw.text(
-        (225, 445),
-        f"( {ram_used} / {ram_total} , {ram_percentage}% )",
-        (255, 255, 255),
-        font=IronFont,
-    )
-
-    draw.text((335, 600), f"{botuptime}", (255, 255, 255), font=IronFont)
-    draw.text(
-        (857, 607),
+    await run_parser(
+        render_stats,
+        (cpu_percentage, cpu_counts),
+        (disk_percenatge, disk_used, disk_total),
+        (ram_percentage, ram_used, ram_total),
+        botuptime,
         f"{(end-start).microseconds/1000} ms",
-        (255, 255, 255),
-        font=IronFont,
+        "stats.png",
     )
-
-    image.save("stats.png")
     await msg.edit_media(media=InputMediaPhoto("stats.png", caption=caption))
     os.remove("stats.png")
 
 
+# Database query audit
+@app.on_message(filters.command(["dbaudit"], COMMAND_HANDLER) & filters.user(SUDO))
+async def db_audit(_, ctx: Message):
+    """Explain the hot database queries and report slow ones or collection scans."""
+    threshold = DB_SLOW_MS
+    if len(ctx.command) > 1 and ctx.command[1].isdigit():
+        threshold = int(ctx.command[1])
+    msg = await ctx.reply_msg("<b>Explaining database queries ...</b>", quote=True)
+    reports = await audit_queries(threshold)
+    if not reports:
+        return await msg.edit_msg(
+            f"All hot queries use an index and take less than {threshold} ms."
+        )
+    lines = [
+        f"<b>{len(reports)} queries over {threshold} ms or scanning a collection:</b>\n"
+    ]
+    lines.extend(
+        f"<code>{r['collection']} {html.escape(json.dumps(r['filter']))}</code>\n"
+        f"{' > '.join(r['stages'])}, {r['millis']} ms, "
+        f"{r['docs_examined']} docs / {r['keys_examined']} keys examined"
+        for r in reports
+    )
+    await msg.edit_msg("\n".join(lines))
+
+
 # Gban
 @app.on_message(filters.command("gban", COMMAND_HANDLER) & filters.user(SUDO))
 async def ban_globally(self: Client, ctx: Message):
@@ -23,17 +23,17 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-import asyncio
 import uuid
 
 from pyrogram import filters
 from pyrogram.enums import ChatMemberStatus, ChatType, ParseMode
-from pyrogram.errors import FloodWait, PeerIdInvalid
+from pyrogram.errors import PeerIdInvalid, UserNotParticipant
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from database.feds_db import *
 from misskaty import BOT_ID, app
 from misskaty.core.decorator.errors import capture_err
+from misskaty.helper.fanout import FANOUT_RATE, FanOut
 from misskaty.helper.functions import extract_user, extract_user_and_reason
 from misskaty.vars import COMMAND_HANDLER, LOG_GROUP_ID, SUDO
 
@@ -48,6 +48,10 @@ You can even designate federation admins, so your trusted admin can ban all the
 SUPPORT_CHAT = "@YasirArisM"
 
 
+def fanout_eta(chats, calls: int = 2) -> int:
+    return max(1, round(len(chats) * calls / FANOUT_RATE))
+
+
 @app.on_message(filters.command("newfed", COMMAND_HANDLER))
 @capture_err
 async def new_fed(self, message):
@@ -618,26 +622,27 @@ async def fban_user(client, message):
     served_chats, _ = await chat_id_and_names_in_fed(fed_id)
     m = await message.reply_text(
         f"**Fed Banning {user.mention}!**"
-        + f" **This Action Should Take About {len(served_chats)} Seconds.**"
+        + f" **This Action Should Take About {fanout_eta(served_chats)} Seconds.**"
     )
     await add_fban_user(fed_id, user_id, reason)
-    number_of_chats = 0
-    for served_chat in served_chats:
+    silent = message.text.startswith("/s")
+
+    async def fban_in_chat(fan, served_chat):
         try:
-            chat_member = await app.get_chat_member(served_chat, user.id)
-            if chat_member.status == ChatMemberStatus.MEMBER:
-                await app.ban_chat_member(served_chat, user.id)
-                if served_chat != chat.id:
-                    if not message.text.startswith("/s"):
-                        await app.send_message(
-                            served_chat, f"**Fed Banned {user.mention} !**"
-                        )
-                number_of_chats += 1
-            await asyncio.sleep(1)
-        except FloodWait as e:
-            await asyncio.sleep(int(e.value))
-        except Exception:
-            pass
+            chat_member = await fan.call(app.get_chat_member, served_chat, user.id)
+        except UserNotParticipant:
+            return False
+        if chat_member.status != ChatMemberStatus.MEMBER:
+            return False
+        await fan.call(app.ban_chat_member, served_chat, user.id)
+        if served_chat != chat.id and not silent:
+            await fan.call(
+                app.send_message, served_chat, f"**Fed Banned {user.mention} !**"
+            )
+        return True
+
+    result = await FanOut(app, "can_restrict_members").run(served_chats, fban_in_chat)
+    number_of_chats = len(result.done)
     try:
         await app.send_message(
             user.id,
@@ -645,7 +650,7 @@ async def fban_user(client, message):
         )
     except Exception:
         pass
-    await m.edit(f"Fed Banned {user.mention} !")
+    await m.edit(f"Fed Banned {user.mention} !\n{result.summary()}")
     ban_text = f"""
 __**New Federation Ban**__
 **Origin:** {message.chat.title} [`{message.chat.id}`]
@@ -661,7 +666,7 @@ __**New Federation Ban**__
             disable_web_page_preview=True,
         )
         await m.edit(
-            f"Fed Banned {user.mention} !\nAction Log: {m2.link}",
+            f"Fed Banned {user.mention} !\n{result.summary()}\nAction Log: {m2.link}",
             disable_web_page_preview=True,
         )
     except Exception:
@@ -710,26 +715,29 @@ async def funban_user(client, message):
     served_chats, _ = await chat_id_and_names_in_fed(fed_id)
     m = await message.reply_text(
         f"**Fed UnBanning {user.mention}!**"
-        + f" **This Action Should Take About {len(served_chats)} Seconds.**"
+        + f" **This Action Should Take About {fanout_eta(served_chats)} Seconds.**"
     )
     await remove_fban_user(fed_id, user_id)
-    number_of_chats = 0
-    for served_chat in served_chats:
+    silent = message.text.startswith("/s")
+
+    async def funban_in_chat(fan, served_chat):
         try:
-            chat_member = await app.get_chat_member(served_chat, user.id)
-            if chat_member.status == ChatMemberStatus.BANNED:
-                await app.unban_chat_member(served_chat, user.id)
-                if served_chat != chat.id:
-                    if not message.text.startswith("/s"):
-                        await app.send_message(
-                            served_chat, f"**Fed UnBanned {user.mention} !**"
-                        )
-                number_of_chats += 1
-            await asyncio.sleep(1)
-        except FloodWait as e:
-            await asyncio.sleep(int(e.value))
-        except Exception:
-            pass
+            chat_member = await fan.call(app.get_chat_member, served_chat, user.id)
+        except UserNotParticipant:
+            return False
+        if chat_member.status != ChatMemberStatus.BANNED:
+            return False
+        await fan.call(app.unban_chat_member, served_chat, user.id)
+        if served_chat != chat.id and not silent:
+            await fan.call(
+                app.send_message, served_chat, f"**Fed UnBanned {user.mention} !**"
+            )
+        return True
+
+    result = await FanOut(app, "can_restrict_members").run(
+        served_chats, funban_in_chat
+    )
+    number_of_chats = len(result.done)
     try:
         await app.send_message(
             user.id,
@@ -737,7 +745,7 @@ async def funban_user(client, message):
         )
     except Exception:
         pass
-    await m.edit(f"Fed UnBanned {user.mention} !")
+    await m.edit(f"Fed UnBanned {user.mention} !\n{result.summary()}")
     ban_text = f"""
 __**New Federation UnBan**__
 **Origin:** {message.chat.title} [`{message.chat.id}`]
@@ -753,7 +761,7 @@ __**New Federation UnBan**__
             disable_web_page_preview=True,
         )
         await m.edit(
-            f"Fed UnBanned {user.mention} !\nAction Log: {m2.link}",
+            f"Fed UnBanned {user.mention} !\n{result.summary()}\nAction Log: {m2.link}",
             disable_web_page_preview=True,
         )
     except Exception:
@@ -823,8 +831,6 @@ async def fbroadcast_message(client, message):
         return await message.reply_text(
             "**You need to reply to a text message to Broadcasted it.**"
         )
-    sleep_time = 0.1
-
     if reply_message.text:
         text = reply_message.text.markdown
     else:
@@ -833,25 +839,19 @@ async def fbroadcast_message(client, message):
     reply_markup = None
     if reply_message.reply_markup:
         reply_markup = InlineKeyboardMarkup(reply_message.reply_markup.inline_keyboard)
-    sent = 0
     chats, _ = await chat_id_and_names_in_fed(fed_id)
     m = await message.reply_text(
-        f"Broadcast in progress, will take {len(chats) * sleep_time} seconds."
+        f"Broadcast in progress, will take {fanout_eta(chats, calls=1)} seconds."
+    )
+
+    async def send_to_chat(fan, chat_id):
+        await fan.call(app.send_message, chat_id, text=text, reply_markup=reply_markup)
+        return True
+
+    result = await FanOut(app).run(chats, send_to_chat)
+    await m.edit(
+        f"**Broadcasted Message In {len(result.done)} Chats.**\n{result.summary()}"
     )
-    for i in chats:
-        try:
-            await app.send_message(
-                i,
-                text=text,
-                reply_markup=reply_markup,
-            )
-            sent += 1
-            await asyncio.sleep(sleep_time)
-        except FloodWait as e:
-            await asyncio.sleep(e.value)
-        except Exception:
-            pass
-    await m.edit(f"**Broadcasted Message In {sent} Chats.**")
 
 
 @app.on_callback_query(filters.regex("rmfed_(.*)"))
@@ -13,12 +13,12 @@ from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from misskaty import app
 from misskaty.core.decorator.errors import capture_err
-from misskaty.core.decorator.permissions import admins_in_chat
+from misskaty.core.decorator.permissions import clear_admin_rosters
 from misskaty.helper.time_gap import check_time_gap
 from utils import temp
 
 from .pypi_search import PYPI_DICT
-from .web_scraper import SCRAP_DICT, data_kuso
+from .web_scraper import SCRAP_DICT, SEARCH_CACHE, data_kuso
 from .ytdl_plugins import YT_DB
 
 chat = [-1001128045651, -1001255283935, -1001455886928]
@@ -136,12 +136,13 @@ async def request_user(client, message):
 
 # To reduce cache and disk
 async def clear_reqdict():
-    SCRAP_DICT.clear()
-    data_kuso.clear()
+    await SCRAP_DICT.clear()
+    SEARCH_CACHE.clear()
+    await data_kuso.clear()
     REQUEST_DB.clear()
-    PYPI_DICT.clear()
+    await PYPI_DICT.clear()
     YT_DB.clear()
-    admins_in_chat.clear()
+    await clear_admin_rosters()
     temp.MELCOW.clear()
     shutil.rmtree("downloads", ignore_errors=True)
     shutil.rmtree("GensSS", ignore_errors=True)
@@ -1,154 +1,18 @@
-import textwrap
 from asyncio import gather
 from os import remove as hapus
 
 import regex
-from PIL import Image, ImageDraw, ImageFont
 from pyrogram import filters
 from pyrogram.errors import MessageIdInvalid, PeerIdInvalid, ReactionInvalid
 
 from misskaty import app, user
 from misskaty.core.decorator.errors import capture_err
+from misskaty.helper.image_render import render_meme
+from misskaty.helper.parse_pool import run_parser
 from misskaty.helper.localization import use_chat_lang
 from misskaty.vars import COMMAND_HANDLER, SUDO
 
 
-async def draw_meme_text(image_path, text):
-    img = Image.open(image_path)
-    hapus(image_path)
-    i_width, i_height = img.size
-    m_font = ImageFont.truetype(
-        "assets/MutantAcademyStyle.ttf", int((70 / 640) * i_width)
-    )
-    if ";" in text:
-        upper_text, lower_text = text.split(";")
-    else:
-        upper_text = text
-        lower_text = ""
-    draw = ImageDraw.Draw(img)
-    current_h, pad = 10, 5
-    if upper_text:
-        for u_text in textwrap.wrap(upper_text, width=15):
-            text_bbox = m_font.getbbox(u_text)
-            (left, top, right, bottom) = text_bbox
-            u_width = abs(right - left)
-            u_height = abs(top - bottom)
-
-            draw.text(
-                xy=(((i_width - u_width) / 2) - 1, int((current_h / 640) * i_width)),
-                text=u_text,
-                font=m_font,
-                fill=(0, 0, 0),
-                stroke_width=3,
-                stroke_fill="black",
-            )
-            draw.text(
-                xy=(((i_width - u_width) / 2) + 1, int((current_h / 640) * i_width)),
-                text=u_text,
-                font=m_font,
-                fill=(0, 0, 0),
-                stroke_width=3,
-                stroke_fill="black",
-            )
-            draw.text(
-                xy=((i_width - u_width) / 2, int(((current_h / 640) * i_width)) - 1),
-                text=u_text,
-                font=m_font,
-                fill=(0, 0, 0),
-                stroke_width=3,
-                stroke_fill="black",
-            )
-            draw.text(
-                xy=(((i_width - u_width) / 2), int(((current_h / 640) * i_width)) + 1),
-                text=u_text,
-                font=m_font,
-                fill=(0, 0, 0),
-                stroke_width=3,
-                stroke_fill="black",
-            )
-
-            draw.text(
-                xy=((i_width - u_width) / 2, int((current_h / 640) * i_width)),
-                text=u_text,
-                font=m_font,
-                fill=(255, 255, 255),
-            )
-            current_h += u_height + pad
-    if lower_text:
-        for l_text in textwrap.wrap(lower_text, width=15):
-            text_bbox = m_font.getbbox(l_text)
-            (left, top, right, bottom) = text_bbox
-            u_width = abs(right - left)
-            u_height = abs(top - bottom)
-
-            draw.text(
-                xy=(
-                    ((i_width - u_width) / 2) - 1,
-                    i_height - u_height - int((20 / 500) * i_width),
-                ),
-                text=l_text,
-                font=m_font,
-                fill=(0, 0, 0),
-                stroke_width=3,
-                stroke_fill="black",
-            )
-            draw.text(
-                xy=(
-                    ((i_width - u_width) / 2) + 1,
-                    i_height - u_height - int((20 / 500) * i_width),
-                ),
-                text=l_text,
-                font=m_font,
-                fill=(0, 0, 0),
-                stroke_width=3,
-                stroke_fill="black",
-            )
-            draw.text(
-                xy=(
-                    (i_width - u_width) / 2,
-                    (i_height - u_height - int((20 / 500) * i_width)) - 1,
-                ),
-                text=l_text,
-                font=m_font,
-                fill=(0, 0, 0),
-                stroke_width=3,
-                stroke_fill="black",
-            )
-            draw.text(
-                xy=(
-                    (i_width - u_width) / 2,
-                    (i_height - u_height - int((20 / 500) * i_width)) + 1,
-                ),
-                text=l_text,
-                font=m_font,
-                fill=(0, 0, 0),
-                stroke_width=3,
-                stroke_fill="black",
-            )
-
-            draw.text(
-                xy=(
-                    (i_width - u_width) / 2,
-                    i_height - u_height - int((20 / 500) * i_width),
-                ),
-                text=l_text,
-                font=m_font,
-                fill=(255, 255, 255),
-                stroke_width=3,
-                stroke_fill="black",
-            )
-            current_h += u_height + pad
-
-    webp_file = "misskatyfy.webp"
-    png_file = "misskatyfy.png"
-    new_size = (512, 512)
-    img.resize(new_size)
-    img.save(webp_file, "WebP")
-    img.save(png_file, "PNG")
-    img.close()
-    return webp_file, png_file
-
-
 @app.on_message(filters.command(["mmf"], COMMAND_HANDLER))
 @capture_err
 async def memify(_, message):
@@ -157,8 +21,12 @@ async def memify(_, message):
     ):
         try:
             file = await message.reply_to_message.download()
-            webp, png = await draw_meme_text(
-                file, message.text.split(None, 1)[1].strip()
+            webp, png = await run_parser(
+                render_meme,
+                file,
+                message.text.split(None, 1)[1].strip(),
+                f"misskatyfy-{message.id}.webp",
+                f"misskatyfy-{message.id}.png",
             )
             await gather(*[message.reply_document(png), message.reply_sticker(webp)])
             try:
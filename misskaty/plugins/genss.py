@@ -21,7 +21,13 @@ from pySmartDL import SmartDL
 
 from misskaty import app
 from misskaty.core.decorator import new_task
-from misskaty.helper import is_url, progress_for_pyrogram, take_ss
+from misskaty.helper import (
+    is_url,
+    progress_for_pyrogram,
+    take_ss,
+    take_ss_seek,
+    take_ss_telegram,
+)
 from misskaty.helper.localization import use_chat_lang
 from misskaty.helper.pyro_progress import humanbytes
 
@@ -34,6 +40,53 @@ __HELP__ = """"
 """
 
 
+async def upload_ss(self: Client, ctx: Message, status: Message, images, strings):
+    await status.edit_msg(strings("up_progress"))
+    await self.send_chat_action(chat_id=ctx.chat.id, action=enums.ChatAction.UPLOAD_PHOTO)
+    try:
+        await gather(
+            *[
+                ctx.reply_document(images, reply_to_message_id=ctx.id),
+                ctx.reply_photo(images, reply_to_message_id=ctx.id),
+            ]
+        )
+    except FloodWait as e:
+        await sleep(e.value)
+        await gather(
+            *[
+                ctx.reply_document(images, reply_to_message_id=ctx.id),
+                ctx.reply_photo(images, reply_to_message_id=ctx.id),
+            ]
+        )
+    await ctx.reply_msg(
+        strings("up_msg").format(
+            namma=ctx.from_user.mention if ctx.from_user else ctx.sender_chat.title,
+            id=ctx.from_user.id if ctx.from_user else ctx.sender_chat.id,
+            bot_uname=self.me.username,
+        ),
+        reply_to_message_id=ctx.id,
+    )
+    await status.delete()
+
+
+async def seek_ss(self: Client, ctx: Message, status: Message, job, strings) -> bool:
+    """Try a seek based contact sheet, False means the caller must download the whole file."""
+    try:
+        images = await job
+    except Exception as e:
+        LOGGER.info("Seek screenshot failed, downloading whole file: %s", e)
+        return False
+    if not images:
+        return False
+    try:
+        await upload_ss(self, ctx, status, images, strings)
+    except Exception as exc:
+        await ctx.reply_msg(strings("err_ssgen").format(exc=exc))
+    finally:
+        os.remove(images)
+    return True
+
+
 @app.on_cmd("genss")
 @new_task
 @use_chat_lang()
@@ -44,6 +97,8 @@ async def genss(self: Client, ctx: Message, strings):
         start_t = datetime.now()
         the_url_parts = " ".join(ctx.command[1:])
         url = the_url_parts.strip()
+        if await seek_ss(self, ctx, pesan, take_ss_seek(url), strings):
+            return
         file_name = os.path.basename(url)
         download_file_path = os.path.join("downloads/", file_name)
         try:
@@ -93,36 +148,7 @@ async def genss(self: Client, ctx: Message, strings):
             )
             try:
                 images = await take_ss(download_file_path)
-                await pesan.edit_msg(strings("up_progress"))
-                await self.send_chat_action(
-                    chat_id=ctx.chat.id, action=enums.ChatAction.UPLOAD_PHOTO
-                )
-                try:
-                    await gather(
-                        *[
-                            ctx.reply_document(images, reply_to_message_id=ctx.id),
-                            ctx.reply_photo(images, reply_to_message_id=ctx.id),
-                        ]
-                    )
-                except FloodWait as e:
-                    await sleep(e.value)
-                    await gather(
-                        *[
-                            ctx.reply_document(images, reply_to_message_id=ctx.id),
-                            ctx.reply_photo(images, reply_to_message_id=ctx.id),
-                        ]
-                    )
-                await ctx.reply_msg(
-                    strings("up_msg").format(
-                        namma=ctx.from_user.mention
-                        if ctx.from_user
-                        else ctx.sender_chat.title,
-                        id=ctx.from_user.id if ctx.from_user else ctx.sender_chat.title,
-                        bot_uname=self.me.username,
-                    ),
-                    reply_to_message_id=ctx.id,
-                )
-                await pesan.delete()
+                await upload_ss(self, ctx, pesan, images, strings)
                 try:
                     os.remove(images)
                     os.remove(download_file_path)
@@ -143,6 +169,10 @@ async def genss(self: Client, ctx: Message, strings):
         process = await ctx.reply_msg(strings("wait_dl"), quote=True)
         if media.file_size > 2097152000:
             return await process.edit_msg(strings("limit_dl"))
+        if await seek_ss(
+            self, ctx, process, take_ss_telegram(self, replied, media), strings
+        ):
+            return
         c_time = time.time()
         dc_id = FileId.decode(media.file_id).dc_id
         try:
@@ -161,37 +191,7 @@ async def genss(self: Client, ctx: Message, strings):
                 )
                 await sleep(2)
                 images = await take_ss(the_real_download_location)
-                await process.edit_msg(strings("up_progress"))
-                await self.send_chat_action(
-                    chat_id=ctx.chat.id, action=enums.ChatAction.UPLOAD_PHOTO
-                )
-
-                try:
-                    await gather(
-                        *[
-                            ctx.reply_document(images, reply_to_message_id=ctx.id),
-                            ctx.reply_photo(images, reply_to_message_id=ctx.id),
-                        ]
-                    )
-                except FloodWait as e:
-                    await sleep(e.value)
-                    await gather(
-                        *[
-                            ctx.reply_document(images, reply_to_message_id=ctx.id),
-                            ctx.reply_photo(images, reply_to_message_id=ctx.id),
-                        ]
-                    )
-                await ctx.reply_msg(
-                    strings("up_msg").format(
-                        namma=ctx.from_user.mention
-                        if ctx.from_user
-                        else ctx.sender_chat.title,
-                        id=ctx.from_user.id if ctx.from_user else ctx.sender_chat.id,
-                        bot_uname=self.me.username,
-                    ),
-                    reply_to_message_id=ctx.id,
-                )
-                await process.delete()
+                await upload_ss(self, ctx, process, images, strings)
                 try:
                     os.remove(images)
                     os.remove(the_real_download_location)
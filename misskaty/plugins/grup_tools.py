@@ -1,10 +1,8 @@
 import os
-import textwrap
 import time
 from datetime import datetime, timedelta
 from logging import getLogger
 
-from PIL import Image, ImageChops, ImageDraw, ImageFont
 from pyrogram import Client, enums, filters
 from pyrogram.enums import ChatMemberStatus as CMS
 from pyrogram.errors import (
@@ -19,76 +17,27 @@ from pyrogram.types import ChatMemberUpdated, InlineKeyboardButton, InlineKeyboa
 from database.greetings_db import is_welcome, toggle_welcome
 from database.users_chats_db import db
 from misskaty import BOT_USERNAME, app
-from misskaty.core.decorator import asyncify, capture_err
+from misskaty.core.decorator import capture_err
 from misskaty.helper import fetch, use_chat_lang
+from misskaty.helper.image_render import avatar_crop, render_welcome
+from misskaty.helper.parse_pool import run_parser
 from misskaty.vars import COMMAND_HANDLER, SUDO, SUPPORT_CHAT
 from utils import temp
 
 LOGGER = getLogger("MissKaty")
 
 
-def circle(pfp, size=(215, 215)):
-    pfp = pfp.resize(size, Image.LANCZOS).convert("RGBA")
-    bigsize = (pfp.size[0] * 3, pfp.size[1] * 3)
-    mask = Image.new("L", bigsize, 0)
-    draw = ImageDraw.Draw(mask)
-    draw.ellipse((0, 0) + bigsize, fill=255)
-    mask = mask.resize(pfp.size, Image.LANCZOS)
-    mask = ImageChops.darker(mask, pfp.split()[-1])
-    pfp.putalpha(mask)
-    return pfp
-
-
-def draw_multiple_line_text(image, text, font, text_start_height):
-    """
-    From unutbu on [python PIL draw multiline text on image](https://stackoverflow.com/a/7698300/395857)
-    """
-    draw = ImageDraw.Draw(image)
-    image_width, _ = image.size
-    y_text = text_start_height
-    lines = textwrap.wrap(text, width=50)
-    for line in lines:
-        text_bbox = font.getbbox(line)
-        (left, top, right, bottom) = text_bbox
-        line_width = abs(right - left)
-        line_height = abs(top - bottom)
-        draw.text(
-            ((image_width - line_width) / 2, y_text), line, font=font, fill="black"
-        )
-        y_text += line_height
-
-
-@asyncify
-def welcomepic(pic, user, chat, id, strings):
-    background = Image.open("assets/bg.png")  # <- Background Image (Should be PNG)
-    background = background.resize((1024, 500), Image.LANCZOS)
-    pfp = Image.open(pic).convert("RGBA")
-    pfp = circle(pfp)
-    pfp = pfp.resize(
-        (265, 265)
-    )  # Resizes the Profilepicture so it fits perfectly in the circle
-    font = ImageFont.truetype(
-        "assets/Calistoga-Regular.ttf", 37
-    )  # <- Text Font of the Member Count. Change the text size for your preference
-    member_text = strings("welcpic_msg").format(
-        userr=user, id=id
-    )  # <- Text under the Profilepicture with the Membercount
-    draw_multiple_line_text(background, member_text, font, 395)
-    draw_multiple_line_text(background, chat, font, 47)
-    ImageDraw.Draw(background).text(
-        (530, 460),
-        f"Generated by @{BOT_USERNAME}",
-        font=ImageFont.truetype("assets/Calistoga-Regular.ttf", 28),
-        size=20,
-        align="right",
+async def welcomepic(client: Client, user, chat, strings):
+    avatar = await avatar_crop(client, user)
+    member_text = strings("welcpic_msg").format(userr=user.first_name, id=user.id)
+    return await run_parser(
+        render_welcome,
+        avatar,
+        member_text,
+        chat,
+        BOT_USERNAME,
+        f"downloads/welcome#{user.id}.png",
     )
-    background.paste(
-        pfp, (379, 123), pfp
-    )  # Pastes the Profilepicture on the Background Image
-    background.save(
-        f"downloads/welcome#{id}.png"
-    )  # Saves the finished Image in the folder with the filename
-    return f"downloads/welcome#{id}.png"
 
 
 @app.on_chat_member_updated(
@@ -127,15 +76,7 @@ async def member_has_joined(c: Client, member: ChatMemberUpdated, strings):
         id = user.id
         dc = user.dc_id or "Member tanpa PP"
         try:
-            pic = await app.download_media(
-                user.photo.big_file_id, file_name=f"pp{user.id}.png"
-            )
-        except AttributeError:
-            pic = "assets/profilepic.png"
-        try:
-            welcomeimg = await welcomepic(
-                pic, user.first_name, member.chat.title, user.id, strings
-            )
+            welcomeimg = await welcomepic(c, user, member.chat.title, strings)
             temp.MELCOW[f"welcome-{member.chat.id}"] = await c.send_photo(
                 member.chat.id,
                 photo=welcomeimg,
@@ -164,7 +105,6 @@ async def member_has_joined(c: Client, member: ChatMemberUpdated, strings):
             await c.send_message(member.chat.id, userspammer)
         try:
             os.remove(f"downloads/welcome#{user.id}.png")
-            os.remove(f"downloads/pp{user.id}.png")
         except Exception:
             pass
 
@@ -5,18 +5,16 @@
 import asyncio
 import contextlib
 import html
-import json
 import logging
 import re
 import sys
+from datetime import datetime
 from os import environ
-from typing import Optional
+from time import time
+from typing import Awaitable, Callable, Dict, Optional
 from urllib.parse import quote_plus
 
 import httpx
-import cloudscraper
-from bs4 import BeautifulSoup
-import requests
 from pykeyboard import InlineButton, InlineKeyboard
 from pyrogram import Client, enums
 from pyrogram.errors import (
@@ -53,11 +51,26 @@ from database.imdb_db import (
     toggle_imdb_layout,
 )
 from misskaty import app
-from misskaty.helper import GENRES_EMOJI, Cache, fetch, gtranslate, get_random_string, search_jw
+from misskaty.helper import GENRES_EMOJI, AsyncCache, fetch, gtranslate, get_random_string, search_jw
+from misskaty.helper.parse_pool import run_parser
+from misskaty.helper.scraper_pool import scrapers
+from parsers.imdb import parse_imdb_title
 from utils import demoji
 
 LOGGER = logging.getLogger("MissKaty")
-LIST_CARI = Cache(filename="imdb_cache.db", path="cache", in_memory=False)
+LIST_CARI = AsyncCache(
+    filename="imdb_cache.db", path="cache", in_memory=False, max_entries=5000
+)
+# Built title contexts keyed by "tt<id>:<locale>", served stale while refreshing
+IMDB_TITLE_CACHE = AsyncCache(
+    filename="imdb_title_cache.db",
+    path="cache",
+    in_memory=False,
+    max_entries=10000,
+    max_bytes=128 * 1024 * 1024,
+)
+IMDB_STALE_TTL = 3 * 24 * 60 * 60
+_imdb_refreshing: Dict[str, asyncio.Task] = {}
 IMDB_HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -346,23 +359,23 @@ async def imdb_by_reset(_, query: CallbackQuery):
 
 
 def _scrape_imdb_html(imdb_url: str) -> str:
-    session = requests.Session()
-    session.headers.update(IMDB_HEADERS)
     waf_hint = None
     for _ in range(3):
-        resp = session.get(imdb_url, timeout=20)
+        resp = scrapers.request(
+            "requests", "GET", imdb_url, headers=IMDB_HEADERS, timeout=20
+        )
         waf_hint = resp.headers.get("x-amzn-waf-action")
         if resp.status_code != 202 and waf_hint != "challenge" and resp.text.strip():
             return resp.text
-    scraper = cloudscraper.create_scraper()
-    resp = scraper.get(imdb_url, timeout=30, headers=IMDB_HEADERS)
+    resp = scrapers.request(
+        "cloudscraper", "GET", imdb_url, headers=IMDB_HEADERS, timeout=30
+    )
     resp.raise_for_status()
     return resp.text
 
 
 async def _fetch_imdb_html_via_scraper(imdb_url: str) -> str:
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _scrape_imdb_html, imdb_url)
+    return await scrapers.run(_scrape_imdb_html, imdb_url)
 
 
 async def _fetch_imdb_html_via_solver(imdb_url: str) -> Optional[str]:
@@ -418,7 +431,11 @@ async def _fetch_imdb_html(
     waf_action = headers.get("x-amzn-waf-action") if headers else None
     text = getattr(resp, "text", "") or ""
     used_fallback = False
-    if status_code >= 400 or status_code == 202 or waf_action or not text.strip():
+    needs_fallback = (
+        status_code >= 400 or status_code == 202 or waf_action or not text.strip()
+    )
+    scrapers.record_fetch(imdb_url, bool(needs_fallback))
+    if needs_fallback:
         LOGGER.warning(
             "IMDB returned status=%s waf=%s for %s; retrying via cloudscraper",
             status_code,
@@ -433,28 +450,21 @@ async def _fetch_imdb_html(
     return text, status_code, waf_action, used_fallback
 
 
-def _parse_imdb_metadata(html: str) -> tuple[BeautifulSoup, Optional[dict]]:
-    soup = BeautifulSoup(html, "lxml")
-    script_tag = soup.find("script", attrs={"type": "application/ld+json"})
-    if not script_tag:
-        return soup, None
-    raw = script_tag.string
-    if raw is None and script_tag.contents:
-        raw = script_tag.contents[0]
-    if not raw:
-        return soup, None
-    try:
-        return soup, json.loads(raw)
-    except json.JSONDecodeError:
-        LOGGER.exception("Failed to decode IMDB metadata JSON.")
-    return soup, None
+async def _parse_imdb_title_async(html: str) -> Optional[dict]:
+    return await run_parser(parse_imdb_title, html)
+
 
+async def _get_imdb_title(imdb_url: str) -> dict:
+    """Fetch a title page and parse it off the event loop, see `parse_imdb_title`."""
+    return await _fetch_imdb_parsed(imdb_url, _parse_imdb_title_async)
 
-async def _get_imdb_page(imdb_url: str) -> tuple[BeautifulSoup, dict]:
+
+async def _fetch_imdb_parsed(
+    imdb_url: str, parse: Callable[[str], Awaitable[Optional[dict]]]
+) -> dict:
     html, status_code, waf_action, used_fallback = await _fetch_imdb_html(imdb_url)
-    soup, metadata = _parse_imdb_metadata(html)
-    if metadata:
-        return soup, metadata
+    if parsed := await parse(html):
+        return parsed
     LOGGER.warning(
         "IMDB metadata missing on first parse (status=%s, waf=%s, fallback=%s) for %s",
         status_code,
@@ -464,15 +474,13 @@ async def _get_imdb_page(imdb_url: str) -> tuple[BeautifulSoup, dict]:
     )
     solver_html = await _fetch_imdb_html_via_solver(imdb_url)
     if solver_html:
-        soup, metadata = _parse_imdb_metadata(solver_html)
-        if metadata:
+        if parsed := await parse(solver_html):
             LOGGER.info("Fetched IMDB metadata via Solver API for %s", imdb_url)
-            return soup, metadata
+            return parsed
     if not used_fallback:
         html = await _fetch_imdb_html_via_scraper(imdb_url)
-        soup, metadata = _parse_imdb_metadata(html)
-        if metadata:
-            return soup, metadata
+        if parsed := await parse(html):
+            return parsed
     raise ValueError(
         f"Tidak dapat mengambil metadata IMDB (status={status_code}, waf={waf_action}, solver={bool(solver_html)})."
     )
@@ -497,97 +505,19 @@ def _format_people_list(people_list, limit=None):
     return ", ".join(formatted)
 
 
-def _extract_people_from_imdb(soup: BeautifulSoup, metadata: dict) -> dict:
-    people = {"directors": [], "writers": [], "cast": []}
-    seen = {key: set() for key in people}
-
-    def add_person(
-        section: str, name: Optional[str], url: Optional[str] = None
-    ) -> None:
-        if not name:
-            return
-        key = (url or name).lower()
-        if key in seen[section]:
-            return
-        seen[section].add(key)
-        people[section].append({"name": name, "url": url})
-
-    next_script = soup.find("script", id="__NEXT_DATA__")
-    if next_script and next_script.string:
-        try:
-            next_data = json.loads(next_script.string)
-        except json.JSONDecodeError:
-            next_data = {}
-        main_column = (
-            next_data.get("props", {})
-            .get("pageProps", {})
-            .get("mainColumnData", {})
-        )
-        for section in main_column.get("crewV2") or []:
-            grouping = (section.get("grouping") or {}).get("text", "").lower()
-            for credit in section.get("credits") or []:
-                name_info = credit.get("name") or {}
-                name_text = (name_info.get("nameText") or {}).get("text")
-                imdb_id = name_info.get("id")
-                url = f"https://www.imdb.com/name/{imdb_id}/" if imdb_id else None
-                if "director" in grouping:
-                    add_person("directors", name_text, url)
-                elif "writer" in grouping:
-                    add_person("writers", name_text, url)
-        for section in main_column.get("castV2") or []:
-            for credit in section.get("credits") or []:
-                name_info = credit.get("name") or {}
-                name_text = (name_info.get("nameText") or {}).get("text")
-                imdb_id = name_info.get("id")
-                url = f"https://www.imdb.com/name/{imdb_id}/" if imdb_id else None
-                add_person("cast", name_text, url)
-            if people["cast"]:
-                break
-
-    def iter_people(field):
-        if not field:
-            return []
-        if isinstance(field, list):
-            return field
-        return [field]
-
-    if not people["directors"]:
-        for item in iter_people(metadata.get("director")):
-            name = item.get("name")
-            url = item.get("url")
-            add_person("directors", name, url)
-
-    if not people["writers"]:
-        for item in iter_people(metadata.get("creator")):
-            if item.get("@type") != "Person":
-                continue
-            name = item.get("name")
-            url = item.get("url")
-            add_person("writers", name, url)
-
-    if not people["cast"]:
-        for item in iter_people(metadata.get("actor")):
-            name = item.get("name")
-            url = item.get("url")
-            add_person("cast", name, url)
-
-    return people
-
-
 async def _build_imdb_context(
     client: Client,
-    soup: BeautifulSoup,
-    metadata: dict,
+    title_data: dict,
     imdb_url: str,
     ott: str,
     locale: str,
     imdb_code: str,
     imdb_by_override: Optional[str] = None,
 ) -> dict:
-    metadata = metadata or {}
+    metadata = title_data.get("metadata") or {}
     context = {key: "" for key, _ in CUSTOM_TEMPLATE_PLACEHOLDERS}
     title = metadata.get("name") or "N/A"
-    title_text = soup.title.text if soup and soup.title else ""
+    title_text = title_data.get("title_text") or ""
     year_match = re.findall(r"\d{4}\W\d{4}|\d{4}-?", title_text)
     year = year_match[0] if year_match else "N/A"
     title_with_year = f"{title} [{year}]"
@@ -612,19 +542,14 @@ async def _build_imdb_context(
             username = None
     default_tagline = f"@{username}" if username else ""
     context["imdb_by"] = imdb_by_override or default_tagline
-    runtime_node = soup.select('li[data-testid="title-techspec_runtime"]') if soup else []
-    if runtime_node:
-        runtime_container = runtime_node[0].find(
-            class_="ipc-metadata-list-item__content-container"
-        )
-        if runtime_container:
-            runtime_text = runtime_container.text.strip()
-            context["duration_raw"] = runtime_text
-            if locale == "id":
-                translated = (await gtranslate(runtime_text, "auto", "id")).text
-                context["duration"] = translated
-            else:
-                context["duration"] = runtime_text
+    runtime_text = title_data.get("runtime")
+    if runtime_text:
+        context["duration_raw"] = runtime_text
+        if locale == "id":
+            translated = (await gtranslate(runtime_text, "auto", "id")).text
+            context["duration"] = translated
+        else:
+            context["duration"] = runtime_text
     category = metadata.get("contentRating")
     if category:
         context["category"] = category
@@ -644,18 +569,12 @@ async def _build_imdb_context(
             context["rating_text"] = (
                 f"{rating_value}/10 from {rating_count} users"
             )
-    release_section = soup.select('li[data-testid="title-details-releasedate"]') if soup else []
-    if release_section:
-        release_node = release_section[0].find(
-            class_="ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link"
-        )
-        if release_node:
-            release_text = release_node.text.strip()
-            release_href = release_node.get("href", "")
-            release_url = f"https://www.imdb.com{release_href}"
-            context["release"] = release_text
-            context["release_url"] = release_url
-            context["release_link"] = f"<a href='{release_url}'>{html.escape(release_text)}</a>"
+    release_text = title_data.get("release")
+    if release_text:
+        release_url = f"https://www.imdb.com{title_data.get('release_href', '')}"
+        context["release"] = release_text
+        context["release_url"] = release_url
+        context["release_link"] = f"<a href='{release_url}'>{html.escape(release_text)}</a>"
     genres = metadata.get("genre") or []
     if isinstance(genres, str):
         genres = [genres]
@@ -668,14 +587,10 @@ async def _build_imdb_context(
         )
         context["genres"] = genre_tags[:-2]
         context["genres_list"] = ", ".join(genres)
-    origin_section = soup.select('li[data-testid="title-details-origin"]') if soup else []
-    if origin_section:
+    if title_data.get("countries"):
         country_tags = []
         country_names = []
-        for country in origin_section[0].findAll(
-            class_="ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link"
-        ):
-            name = country.text.strip()
+        for name in title_data["countries"]:
             if not name:
                 continue
             country_names.append(name)
@@ -686,14 +601,10 @@ async def _build_imdb_context(
             context["countries"] = ", ".join(country_tags)
         if country_names:
             context["countries_list"] = ", ".join(country_names)
-    language_section = soup.select('li[data-testid="title-details-languages"]') if soup else []
-    if language_section:
+    if title_data.get("languages"):
         lang_tags = []
         lang_names = []
-        for lang in language_section[0].findAll(
-            class_="ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link"
-        ):
-            name = lang.text.strip()
+        for name in title_data["languages"]:
             if not name:
                 continue
             lang_names.append(name)
@@ -702,7 +613,7 @@ async def _build_imdb_context(
             context["languages"] = ", ".join(lang_tags)
         if lang_names:
             context["languages_list"] = ", ".join(lang_names)
-    people = _extract_people_from_imdb(soup, metadata)
+    people = title_data.get("people") or {"directors": [], "writers": [], "cast": []}
     if people["directors"]:
         context["directors"] = _format_people_list(people["directors"])
     if people["writers"]:
@@ -726,18 +637,12 @@ async def _build_imdb_context(
                 f"#{kw.replace(' ', '_').replace('-', '_')}, " for kw in keywords_list
             )
             context["keywords"] = keywords_tags[:-2]
-    awards_section = soup.select('li[data-testid="award_information"]') if soup else []
-    if awards_section:
-        award_text = (
-            awards_section[0]
-            .find(class_="ipc-metadata-list-item__list-content-item")
-            .text
-        )
-        if award_text:
-            if locale == "id":
-                context["awards"] = (await gtranslate(award_text, "auto", "id")).text
-            else:
-                context["awards"] = award_text
+    award_text = title_data.get("awards")
+    if award_text:
+        if locale == "id":
+            context["awards"] = (await gtranslate(award_text, "auto", "id")).text
+        else:
+            context["awards"] = award_text
     trailer = metadata.get("trailer") or {}
     if trailer.get("url"):
         context["trailer_url"] = trailer["url"]
@@ -747,6 +652,75 @@ async def _build_imdb_context(
     return context
 
 
+def _imdb_fresh_ttl(context: dict) -> int:
+    """Recent titles change often (ratings, release dates), older ones rarely do."""
+    year = re.match(r"\d{4}", context.get("year") or "")
+    age = datetime.now().year - int(year.group()) if year else 0
+    if age <= 1:
+        return 6 * 60 * 60
+    if age <= 5:
+        return 3 * 24 * 60 * 60
+    return 14 * 24 * 60 * 60
+
+
+async def _load_imdb_context(client: Client, movie: str, locale: str) -> dict:
+    imdb_url = f"https://www.imdb.com/title/tt{movie}/"
+    title_data = await _get_imdb_title(imdb_url)
+    r_json = title_data["metadata"]
+    ott = await search_jw(
+        r_json.get("alternateName") or r_json.get("name"),
+        "ID" if locale == "id" else "US",
+    )
+    return await _build_imdb_context(
+        client, title_data, imdb_url, ott, locale, f"tt{movie}"
+    )
+
+
+async def _store_imdb_context(key: str, context: dict) -> None:
+    fresh_ttl = _imdb_fresh_ttl(context)
+    await IMDB_TITLE_CACHE.set(
+        key,
+        {"fresh_until": time() + fresh_ttl, "context": context},
+        timeout=fresh_ttl + IMDB_STALE_TTL,
+    )
+
+
+async def _refresh_imdb_context(
+    client: Client, movie: str, locale: str, key: str
+) -> None:
+    try:
+        await _store_imdb_context(key, await _load_imdb_context(client, movie, locale))
+    except Exception as exc:
+        LOGGER.warning("Background IMDb refresh failed for %s: %s", key, exc)
+    finally:
+        _imdb_refreshing.pop(key, None)
+
+
+async def _get_imdb_context(
+    client: Client, movie: str, locale: str, imdb_by_override: Optional[str] = None
+) -> dict:
+    """Return the title context from cache, fetching and parsing IMDb only on a miss.
+
+    Entries past their fresh TTL are still served while one refresh runs in the background.
+    """
+    key = f"tt{movie}:{locale}"
+    cached = await IMDB_TITLE_CACHE.get(key)
+    if cached:
+        if cached["fresh_until"] <= time() and key not in _imdb_refreshing:
+            _imdb_refreshing[key] = asyncio.create_task(
+                _refresh_imdb_context(client, movie, locale, key)
+            )
+        context = cached["context"]
+    else:
+        context = await _load_imdb_context(client, movie, locale)
+        await _store_imdb_context(key, context)
+    context = dict(context)
+    if imdb_by_override:
+        context["imdb_by"] = imdb_by_override
+        context["imdb_by_html"] = html.escape(imdb_by_override)
+    return context
+
+
 IMDB_FIELD_LABELS = {
     "id": {
         "title": "📹 Judul",
@@ -956,7 +930,7 @@ async def imdb_choose(_, ctx: Message):
             return await imdb_search_id(kuery, ctx)
     buttons = InlineKeyboard()
     ranval = get_random_string(4)
-    LIST_CARI.add(ranval, kuery, timeout=15)
+    await LIST_CARI.add(ranval, kuery, timeout=15)
     buttons.row(
         InlineButton("🇺🇸 English", f"imdbcari#eng#{ranval}#{ctx.from_user.id}"),
         InlineButton("🇮🇩 Indonesia", f"imdbcari#ind#{ranval}#{ctx.from_user.id}"),
@@ -1369,8 +1343,8 @@ async def imdbcari(_, query: CallbackQuery):
         if query.from_user.id != int(uid):
             return await query.answer("⚠️ Akses Ditolak!", True)
         try:
-            kueri = LIST_CARI.get(msg)
-            del LIST_CARI[msg]
+            kueri = await LIST_CARI[msg]
+            await LIST_CARI.delete(msg)
         except KeyError:
             return await query.message.edit_caption("⚠️ Callback Query Sudah Expired!")
         with contextlib.suppress(MessageIdInvalid, MessageNotModified):
@@ -1433,8 +1407,8 @@ async def imdbcari(_, query: CallbackQuery):
         if query.from_user.id != int(uid):
             return await query.answer("⚠️ Access Denied!", True)
         try:
-            kueri = LIST_CARI.get(msg)
-            del LIST_CARI[msg]
+            kueri = await LIST_CARI[msg]
+            await LIST_CARI.delete(msg)
         except KeyError:
             return await query.message.edit_caption("⚠️ Callback Query Expired!")
         await query.message.edit_caption("<i>🔎 Looking in the IMDB Database..</i>")
@@ -1500,16 +1474,10 @@ async def imdb_id_callback(self: Client, query: CallbackQuery):
         try:
             await query.message.edit_caption("<i>⏳ Permintaan kamu sedang diproses.. </i>")
             imdb_url = f"https://www.imdb.com/title/tt{movie}/"
-            sop, r_json = await _get_imdb_page(imdb_url)
-            ott = await search_jw(
-                r_json.get("alternateName") or r_json.get("name"), "ID"
-            )
             layout = await get_imdb_layout(query.from_user.id)
             custom_template = await get_custom_imdb_template(query.from_user.id)
             custom_imdb_by = await get_imdb_by(query.from_user.id)
-            context = await _build_imdb_context(
-                self, sop, r_json, imdb_url, ott, "id", f"tt{movie}", custom_imdb_by
-            )
+            context = await _get_imdb_context(self, movie, "id", custom_imdb_by)
             caption = ""
             markup = None
             if custom_template:
@@ -1540,7 +1508,7 @@ async def imdb_id_callback(self: Client, query: CallbackQuery):
                 markup = _build_imdb_action_markup(
                     layout, imdb_url, context.get("trailer_url")
                 )
-            thumb = r_json.get("image")
+            thumb = context.get("poster_url")
             await _edit_imdb_result_message(query, caption, thumb, markup)
         except httpx.HTTPError as exc:
             await query.message.edit_caption(
@@ -1562,16 +1530,10 @@ async def imdb_en_callback(self: Client, query: CallbackQuery):
         try:
             await query.message.edit_caption("<i>⏳ Getting IMDb source..</i>")
             imdb_url = f"https://www.imdb.com/title/tt{movie}/"
-            sop, r_json = await _get_imdb_page(imdb_url)
-            ott = await search_jw(
-                r_json.get("alternateName") or r_json.get("name"), "US"
-            )
             layout = await get_imdb_layout(query.from_user.id)
             custom_template = await get_custom_imdb_template(query.from_user.id)
             custom_imdb_by = await get_imdb_by(query.from_user.id)
-            context = await _build_imdb_context(
-                self, sop, r_json, imdb_url, ott, "en", f"tt{movie}", custom_imdb_by
-            )
+            context = await _get_imdb_context(self, movie, "en", custom_imdb_by)
             caption = ""
             markup = None
             if custom_template:
@@ -1602,7 +1564,7 @@ async def imdb_en_callback(self: Client, query: CallbackQuery):
                 markup = _build_imdb_action_markup(
                     layout, imdb_url, context.get("trailer_url")
                 )
-            thumb = r_json.get("image")
+            thumb = context.get("poster_url")
             await _edit_imdb_result_message(query, caption, thumb, markup)
         except httpx.HTTPError as exc:
             await query.message.edit_caption(
@@ -6,6 +6,7 @@ import html
 import json
 import re
 import traceback
+from importlib import metadata
 from logging import getLogger
 from sys import platform
 from sys import version as pyver
@@ -26,8 +27,7 @@ from pyrogram.types import (
 
 from misskaty import BOT_USERNAME, app, user
 from misskaty.helper import GENRES_EMOJI, fetch, gtranslate, post_to_telegraph, search_jw
-from misskaty.plugins.dev import shell_exec
-from misskaty.plugins.imdb_search import _get_imdb_page
+from misskaty.plugins.imdb_search import _get_imdb_title
 from misskaty.plugins.misc_tools import calc_btn
 from misskaty.vars import USER_SESSION
 from utils import demoji
@@ -46,69 +46,90 @@ keywords_list = ["imdb", "pypi", "git", "google", "secretmsg", "info", "botapi"]
 
 PRVT_MSGS = {}
 LOGGER = getLogger("MissKaty")
+# Answers to the empty inline query, rebuilt by refresh_inline_status
+INLINE_STATUS_REFRESH = 300
+inline_status_answers = []
 
 
-@app.on_inline_query()
-async def inline_menu(self, inline_query: InlineQuery):
-    if inline_query.query.strip().lower().strip() == "":
-        aspymon_ver = (await shell_exec("pip freeze | grep async-pymongo"))[0]
-        buttons = InlineKeyboard(row_width=2)
-        buttons.add(
-            *[
-                (InlineKeyboardButton(text=i, switch_inline_query_current_chat=i))
-                for i in keywords_list
-            ]
-        )
+async def refresh_inline_status():
+    """Rebuild the answers of the empty inline query, at startup and then periodically."""
+    global inline_status_answers
+    try:
+        mongo_ver = f"async-pymongo=={metadata.version('async-pymongo')}"
+    except metadata.PackageNotFoundError:
+        mongo_ver = "Unknown"
+    buttons = InlineKeyboard(row_width=2)
+    buttons.add(
+        *[
+            (InlineKeyboardButton(text=i, switch_inline_query_current_chat=i))
+            for i in keywords_list
+        ]
+    )
 
-        btn = InlineKeyboard(row_width=2)
-        bot_state = "Alive" if USER_SESSION and await app.get_me() else "Dead"
-        ubot_state = "Alive" if USER_SESSION and await user.get_me() else "Dead"
-        btn.add(
-            InlineKeyboardButton("Stats", callback_data="stats_callback"),
-            InlineKeyboardButton("Go Inline!", switch_inline_query_current_chat=""),
-        )
+    btn = InlineKeyboard(row_width=2)
+    bot_state = "Alive" if app.is_connected else "Dead"
+    ubot_me = None
+    if USER_SESSION:
+        try:
+            ubot_me = await user.get_me()
+        except Exception as e:
+            LOGGER.warning("UserBot health check failed: %s", e)
+    ubot_state = "Alive" if ubot_me else "Dead"
+    btn.add(
+        InlineKeyboardButton("Stats", callback_data="stats_callback"),
+        InlineKeyboardButton("Go Inline!", switch_inline_query_current_chat=""),
+    )
 
-        msg = f"""
+    msg = f"""
 **[MissKaty✨](https://github.com/yasirarism):**
 **MainBot Stats:** `{bot_state}`
 **UserBot Stats:** `{ubot_state}`
 **Python:** `{pyver.split()[0]}`
 **Pyrogram:** `{pyrover}`
-**MongoDB:** `{aspymon_ver}`
+**MongoDB:** `{mongo_ver}`
 **Platform:** `{platform}`
-**Bot:** {(await app.get_me()).first_name}
+**Bot:** {app.me.first_name}
 """
-        if USER_SESSION:
-            msg += f"**UserBot:** {(await user.get_me()).first_name}"
-        answerss = [
-            InlineQueryResultArticle(
-                title="Inline Commands",
-                description="Help Related To Inline Usage.",
-                input_message_content=InputTextMessageContent(
-                    "Click A Button To Get Started."
-                ),
-                thumb_url="https://hamker.me/cy00x5x.png",
-                reply_markup=buttons,
+    if ubot_me:
+        msg += f"**UserBot:** {ubot_me.first_name}"
+    inline_status_answers = [
+        InlineQueryResultArticle(
+            title="Inline Commands",
+            description="Help Related To Inline Usage.",
+            input_message_content=InputTextMessageContent(
+                "Click A Button To Get Started."
             ),
-            InlineQueryResultArticle(
-                title="Github Repo",
-                description="Github Repo of This Bot.",
-                input_message_content=InputTextMessageContent(
-                    f"<b>Github Repo @{BOT_USERNAME}</b>\n\nhttps://github.com/yasirarism/MissKatyPyro"
-                ),
-                thumb_url="https://hamker.me/gjc9fo3.png",
+            thumb_url="https://hamker.me/cy00x5x.png",
+            reply_markup=buttons,
+        ),
+        InlineQueryResultArticle(
+            title="Github Repo",
+            description="Github Repo of This Bot.",
+            input_message_content=InputTextMessageContent(
+                f"<b>Github Repo @{BOT_USERNAME}</b>\n\nhttps://github.com/yasirarism/MissKatyPyro"
             ),
-            InlineQueryResultArticle(
-                title="Alive",
-                description="Check Bot's Stats",
-                thumb_url="https://yt3.ggpht.com/ytc/AMLnZu-zbtIsllERaGYY8Aecww3uWUASPMjLUUEt7ecu=s900-c-k-c0x00ffffff-no-rj",
-                input_message_content=InputTextMessageContent(
-                    msg, disable_web_page_preview=True
-                ),
-                reply_markup=btn,
+            thumb_url="https://hamker.me/gjc9fo3.png",
+        ),
+        InlineQueryResultArticle(
+            title="Alive",
+            description="Check Bot's Stats",
+            thumb_url="https://yt3.ggpht.com/ytc/AMLnZu-zbtIsllERaGYY8Aecww3uWUASPMjLUUEt7ecu=s900-c-k-c0x00ffffff-no-rj",
+            input_message_content=InputTextMessageContent(
+                msg, disable_web_page_preview=True
             ),
-        ]
-        await inline_query.answer(results=answerss)
+            reply_markup=btn,
+        ),
+    ]
+
+
+@app.on_inline_query()
+async def inline_menu(self, inline_query: InlineQuery):
+    if inline_query.query.strip().lower().strip() == "":
+        if not inline_status_answers:
+            await refresh_inline_status()
+        await inline_query.answer(
+            results=inline_status_answers, cache_time=INLINE_STATUS_REFRESH
+        )
     elif inline_query.query.strip().lower().split()[0] == "calc":
         if len(inline_query.query.strip().lower().split()) < 2:
             answers = [
@@ -636,13 +657,14 @@ async def imdb_inl(_, query):
                 "⏳ <i>Permintaan kamu sedang diproses.. </i>"
             )
             url = f"https://www.imdb.com/title/{movie}/"
-            sop, r_json = await _get_imdb_page(url)
+            title_data = await _get_imdb_title(url)
+            r_json = title_data["metadata"]
             ott = await search_jw(r_json.get("alternateName") or r_json["name"], "ID")
             res_str = ""
             typee = r_json.get("@type", "")
             tahun = (
-                re.findall(r"\d{4}\W\d{4}|\d{4}-?", sop.title.text)[0]
-                if re.findall(r"\d{4}\W\d{4}|\d{4}-?", sop.title.text)
+                re.findall(r"\d{4}\W\d{4}|\d{4}-?", title_data["title_text"])[0]
+                if re.findall(r"\d{4}\W\d{4}|\d{4}-?", title_data["title_text"])
                 else "N/A"
             )
             res_str += f"<b>📹 Judul:</b> <a href='{url}'>{r_json['name']} [{tahun}]</a> (<code>{typee}</code>)\n"
@@ -652,28 +674,14 @@ async def imdb_inl(_, query):
                 )
             else:
                 res_str += "\n"
-            if durasi := sop.select('li[data-testid="title-techspec_runtime"]'):
-                durasi = (
-                    durasi[0]
-                    .find(class_="ipc-metadata-list-item__content-container")
-                    .text
-                )
+            if durasi := title_data["runtime"]:
                 res_str += f"<b>Durasi:</b> <code>{(await gtranslate(durasi, 'auto', 'id')).text}</code>\n"
             if r_json.get("contentRating"):
                 res_str += f"<b>Kategori:</b> <code>{r_json['contentRating']}</code> \n"
             if r_json.get("aggregateRating"):
                 res_str += f"<b>Peringkat:</b> <code>{r_json['aggregateRating']['ratingValue']}⭐️ dari {r_json['aggregateRating']['ratingCount']} pengguna</code> \n"
-            if release := sop.select('li[data-testid="title-details-releasedate"]'):
-                rilis = (
-                    release[0]
-                    .find(
-                        class_="ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link"
-                    )
-                    .text
-                )
-                rilis_url = release[0].find(
-                    class_="ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link"
-                )["href"]
+            if rilis := title_data["release"]:
+                rilis_url = title_data["release_href"]
                 res_str += f"<b>Rilis:</b> <a href='https://www.imdb.com{rilis_url}'>{rilis}</a>\n"
             if r_json.get("genre"):
                 genre = "".join(
@@ -683,20 +691,16 @@ async def imdb_inl(_, query):
                     for i in r_json["genre"]
                 )
                 res_str += f"<b>Genre:</b> {genre[:-2]}\n"
-            if negara := sop.select('li[data-testid="title-details-origin"]'):
+            if negara := title_data["countries"]:
                 country = "".join(
-                    f"{demoji(country.text)} #{country.text.replace(' ', '_').replace('-', '_')}, "
-                    for country in negara[0].findAll(
-                        class_="ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link"
-                    )
+                    f"{demoji(country)} #{country.replace(' ', '_').replace('-', '_')}, "
+                    for country in negara
                 )
                 res_str += f"<b>Negara:</b> {country[:-2]}\n"
-            if bahasa := sop.select('li[data-testid="title-details-languages"]'):
+            if bahasa := title_data["languages"]:
                 language = "".join(
-                    f"#{lang.text.replace(' ', '_').replace('-', '_')}, "
-                    for lang in bahasa[0].findAll(
-                        class_="ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link"
-                    )
+                    f"#{lang.replace(' ', '_').replace('-', '_')}, "
+                    for lang in bahasa
                 )
                 res_str += f"<b>Bahasa:</b> {language[:-2]}\n"
             res_str += "\n<b>🙎 Info Cast:</b>\n"
@@ -729,12 +733,7 @@ async def imdb_inl(_, query):
                 res_str += (
                     f"<b>🔥 Kata Kunci:</b>\n<blockquote>{key_[:-2]}</blockquote>\n"
                 )
-            if award := sop.select('li[data-testid="award_information"]'):
-                awards = (
-                    award[0]
-                    .find(class_="ipc-metadata-list-item__list-content-item")
-                    .text
-                )
+            if awards := title_data["awards"]:
                 res_str += f"<b>🏆 Penghargaan:</b>\n<blockquote><code>{(await gtranslate(awards, 'auto', 'id')).text}</code></blockquote>\n"
             else:
                 res_str += "\n"
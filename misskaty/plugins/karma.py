@@ -2,18 +2,17 @@ import re
 
 from pyrogram import filters
 
+from database.context_db import get_update_context
 from database.karma_db import (
+    change_karma,
     get_karma,
     get_karmas,
-    is_karma_on,
     karma_off,
     karma_on,
-    update_karma,
 )
 from misskaty import app
 from misskaty.core.decorator.errors import capture_err
 from misskaty.core.decorator.permissions import adminsOnly
-from misskaty.helper.functions import alpha_to_int, int_to_alpha
 
 __MODULE__ = "Karma"
 __HELP__ = """
@@ -74,7 +73,7 @@ async def get_user_id_and_usernames(client) -> dict:
 )
 @capture_err
 async def upvote(_, message):
-    if not await is_karma_on(message.chat.id):
+    if not (await get_update_context(message)).karma_on:
         return
     if not message.reply_to_message.from_user:
         return
@@ -87,14 +86,7 @@ async def upvote(_, message):
     chat_id = message.chat.id
     user_id = message.reply_to_message.from_user.id
     user_mention = message.reply_to_message.from_user.mention
-    current_karma = await get_karma(chat_id, await int_to_alpha(user_id))
-    if current_karma:
-        current_karma = current_karma["karma"]
-        karma = current_karma + 1
-    else:
-        karma = 1
-    new_karma = {"karma": karma}
-    await update_karma(chat_id, await int_to_alpha(user_id), new_karma)
+    karma = await change_karma(chat_id, user_id, 1)
     await message.reply_msg(
         f"Incremented Karma of {user_mention} By 1 \nTotal Points: {karma}"
     )
@@ -112,7 +104,7 @@ async def upvote(_, message):
 )
 @capture_err
 async def downvote(_, message):
-    if not await is_karma_on(message.chat.id):
+    if not (await get_update_context(message)).karma_on:
         return
     if not message.reply_to_message.from_user:
         return
@@ -124,25 +116,10 @@ async def downvote(_, message):
         return
 
     chat_id = message.chat.id
-    user_id = message.from_user.id
-    current_karma = await get_karma(chat_id, await int_to_alpha(user_id))
-    if current_karma:
-        current_karma = current_karma["karma"]
-        karma = current_karma - 1
-    else:
-        karma = 1
-    new_karma = {"karma": karma}
-    await update_karma(chat_id, await int_to_alpha(user_id), new_karma)
+    await change_karma(chat_id, message.from_user.id, -1)
     user_id = message.reply_to_message.from_user.id
     user_mention = message.reply_to_message.from_user.mention
-    current_karma = await get_karma(chat_id, await int_to_alpha(user_id))
-    if current_karma:
-        current_karma = current_karma["karma"]
-        karma = current_karma - 1
-    else:
-        karma = 1
-    new_karma = {"karma": karma}
-    await update_karma(chat_id, await int_to_alpha(user_id), new_karma)
+    karma = await change_karma(chat_id, user_id, -1)
     await message.reply_msg(
         f"Decremented Karma of {user_mention} By 1 \nTotal Points: {karma}"
     )
@@ -159,20 +136,7 @@ async def command_karma(_, message):
             return await m.edit("No karma in DB for this chat.")
         msg = f"Karma list of {message.chat.title}"
         limit = 0
-        karma_dicc = {}
-        for i in karma:
-            user_id = await alpha_to_int(i)
-            user_karma = karma[i]["karma"]
-            karma_dicc[str(user_id)] = user_karma
-            karma_arranged = dict(
-                sorted(
-                    karma_dicc.items(),
-                    key=lambda item: item[1],
-                    reverse=True,
-                )
-            )
-        if not karma_dicc:
-            return await m.edit("No karma in DB for this chat.")
+        karma_arranged = karma
         try:
             userdb = await get_user_id_and_usernames(app)
         except (AttributeError, TypeError):
@@ -181,9 +145,9 @@ async def command_karma(_, message):
         for user_idd, karma_count in karma_arranged.items():
             if limit > 15:
                 break
-            if int(user_idd) not in list(userdb.keys()):
+            if user_idd not in userdb:
                 continue
-            username = userdb[int(user_idd)]
+            username = userdb[user_idd]
             karma[f"@{username}"] = [f"**{str(karma_count)}**"]
             limit += 1
         await m.edit(section(msg, karma))
@@ -192,7 +156,7 @@ async def command_karma(_, message):
             return await message.reply("Anon user has no karma.")
 
         user_id = message.reply_to_message.from_user.id
-        karma = await get_karma(chat_id, await int_to_alpha(user_id))
+        karma = await get_karma(chat_id, user_id)
         karma = karma["karma"] if karma else 0
         await message.reply_text(f"**Total Points**: __{karma}__")
 
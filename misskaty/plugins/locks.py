@@ -24,7 +24,9 @@ SOFTWARE.
 
 import asyncio
 from logging import getLogger
+from typing import FrozenSet
 
+from cachetools import TTLCache
 from pyrogram import filters
 from pyrogram.errors import ChatAdminRequired, ChatNotModified, FloodWait
 from pyrogram.types import ChatPermissions
@@ -78,53 +80,50 @@ data = {
 }
 
 
-async def current_chat_permissions(chat_id):
-    perms = []
+# Order of the permission names returned by current_chat_permissions
+PERMISSION_FIELDS = (
+    "can_send_messages",
+    "can_send_media_messages",
+    "can_send_audios",
+    "can_send_docs",
+    "can_send_games",
+    "can_send_gifs",
+    "can_send_inline",
+    "can_send_photos",
+    "can_send_plain",
+    "can_send_roundvideos",
+    "can_send_stickers",
+    "can_send_videos",
+    "can_send_voices",
+    "can_add_web_page_previews",
+    "can_send_polls",
+    "can_change_info",
+    "can_invite_users",
+    "can_pin_messages",
+)
+# Granted permissions per chat. /lock and /unlock write through, the TTL
+# catches changes made outside the bot.
+chat_permissions_cache = TTLCache(maxsize=5000, ttl=600)
+
+
+async def chat_permission_set(chat_id) -> FrozenSet[str]:
+    if (perms := chat_permissions_cache.get(chat_id)) is not None:
+        return perms
     try:
         perm = (await app.get_chat(chat_id)).permissions
     except FloodWait as e:
         await asyncio.sleep(e.value)
         perm = (await app.get_chat(chat_id)).permissions
-    if perm.can_send_messages:
-        perms.append("can_send_messages")
-    if perm.can_send_media_messages:
-        perms.append("can_send_media_messages")
-    if perm.can_send_audios:
-        perms.append("can_send_audios")
-    if perm.can_send_docs:
-        perms.append("can_send_docs")
-    if perm.can_send_games:
-        perms.append("can_send_games")
-    if perm.can_send_gifs:
-        perms.append("can_send_gifs")
-    if perm.can_send_inline:
-        perms.append("can_send_inline")
-    if perm.can_send_photos:
-        perms.append("can_send_photos")
-    if perm.can_send_plain:
-        perms.append("can_send_plain")
-    if perm.can_send_roundvideos:
-        perms.append("can_send_roundvideos")
-    if perm.can_send_stickers:
-        perms.append("can_send_stickers")
-    if perm.can_send_videos:
-        perms.append("can_send_videos")
-    if perm.can_send_voices:
-        perms.append("can_send_voices")
-    if perm.can_add_web_page_previews:
-        perms.append("can_add_web_page_previews")
-    if perm.can_send_polls:
-        perms.append("can_send_polls")
-    if perm.can_change_info:
-        perms.append("can_change_info")
-    if perm.can_invite_users:
-        perms.append("can_invite_users")
-    if perm.can_pin_messages:
-        perms.append("can_pin_messages")
-
+    perms = frozenset(field for field in PERMISSION_FIELDS if getattr(perm, field, None))
+    chat_permissions_cache[chat_id] = perms
     return perms
 
 
+async def current_chat_permissions(chat_id):
+    perms = await chat_permission_set(chat_id)
+    return [field for field in PERMISSION_FIELDS if field in perms]
+
+
 async def tg_lock(message, permissions: list, perm: str, lock: bool):
     if lock:
         if perm not in permissions:
@@ -140,9 +139,12 @@ async def tg_lock(message, permissions: list, perm: str, lock: bool):
     try:
         await app.set_chat_permissions(message.chat.id, ChatPermissions(**permissions))
     except ChatNotModified:
+        chat_permissions_cache.pop(message.chat.id, None)
         return await message.reply_text(
             "To unlock this, you have to unlock 'messages' first."
         )
+    # Telegram adjusts dependent flags, read back what it applied on next use
+    chat_permissions_cache.pop(message.chat.id, None)
 
     await message.reply_text(("Locked." if lock else "Unlocked."))
 
@@ -167,6 +169,7 @@ async def locks_func(_, message):
     elif parameter == "all" and state == "lock":
         try:
             await app.set_chat_permissions(chat_id, ChatPermissions(all_perms=False))
+            chat_permissions_cache.pop(chat_id, None)
             await message.reply_text(f"Locked Everything in {message.chat.title}")
         except ChatAdminRequired:
             await message.reply_msg(
@@ -181,6 +184,7 @@ async def locks_func(_, message):
                     all_perms=True,
                 ),
             )
+            chat_permissions_cache.pop(chat_id, None)
             await message.reply(f"Unlocked Everything in {message.chat.title}")
         except ChatAdminRequired:
             await message.reply_msg(
@@ -213,8 +217,7 @@ async def url_detector(_, message):
         return
 
     if get_urls_from_text(text):
-        permissions = await current_chat_permissions(chat_id)
-        if "can_add_web_page_previews" not in permissions:
+        if "can_add_web_page_previews" not in await chat_permission_set(chat_id):
             try:
                 await message.delete_msg()
             except Exception:
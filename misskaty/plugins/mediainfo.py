@@ -5,27 +5,78 @@
 * Copyright @YasirPedia All rights reserved
 """
 
+import asyncio
 import io
-import subprocess
-import time
 from os import path
-from os import remove as osremove
+from uuid import uuid4
 
-from pyrogram import filters
-from pyrogram.file_id import FileId
+from pyrogram import Client, filters
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
 
 from misskaty import app
-from misskaty.helper import post_to_telegraph, progress_for_pyrogram, runcmd
+from misskaty.helper import AsyncCache, post_to_telegraph
 from misskaty.helper.localization import use_chat_lang
 from misskaty.helper.mediainfo_paste import mediainfo_paste
+from misskaty.helper.partial_download import SparseFile
 from misskaty.vars import COMMAND_HANDLER
 from utils import get_file_id
 
+# Head and tail chunks read before giving up and fetching the whole file
+MEDIAINFO_EDGE_STEPS = (2, 8, 32)
+MEDIAINFO_CACHE_TTL = 7 * 24 * 60 * 60
+AV_TYPES = ("video", "audio", "voice", "video_note", "animation")
+
+# file_unique_id -> mediainfo output
+mediainfo_cache = AsyncCache(
+    filename="mediainfo_cache.db", path="cache", in_memory=False, max_entries=5000
+)
+
+
+async def run_mediainfo(source: str) -> str:
+    process = await asyncio.create_subprocess_exec(
+        "mediainfo",
+        source,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    stdout, _ = await process.communicate()
+    return stdout.decode("utf-8", "replace").strip()
+
+
+def is_audio_video(media) -> bool:
+    if media.message_type in AV_TYPES:
+        return True
+    return (getattr(media, "mime_type", None) or "").startswith(("video/", "audio/"))
+
+
+async def analyze_media(client: Client, message: Message, media) -> str:
+    """Run mediainfo on the head and tail of a Telegram file, widening them until
+    audio and video streams report a duration. Results are cached by file_unique_id."""
+    if cached := await mediainfo_cache.get(media.file_unique_id):
+        return cached
+    file_name = getattr(media, "file_name", None) or media.file_unique_id
+    ext = path.splitext(file_name)[1]
+    file_path = path.join(
+        "downloads", f"mediainfo-{media.file_unique_id}-{uuid4().hex[:8]}{ext}"
+    )
+    async with SparseFile(client, message, media, file_path) as part:
+        for chunks in MEDIAINFO_EDGE_STEPS:
+            await part.fetch_edges(chunks)
+            out = await run_mediainfo(file_path)
+            if part.complete or not is_audio_video(media) or "Duration" in out:
+                break
+        else:
+            await part.fetch_all()
+            out = await run_mediainfo(file_path)
+    out = out.replace(file_path, file_name)
+    if out:
+        await mediainfo_cache.set(media.file_unique_id, out, timeout=MEDIAINFO_CACHE_TTL)
+    return out
+
 
 #@app.on_message(filters.command(["mediainfo"], COMMAND_HANDLER))
 #@use_chat_lang()
-async def mediainfo(_, ctx: Message, strings):
+async def mediainfo(self: Client, ctx: Message, strings):
     if ctx.reply_to_message and ctx.reply_to_message.media:
         process = await ctx.reply_msg(strings("processing_text"), quote=True)
         file_info = get_file_id(ctx.reply_to_message)
@@ -39,19 +90,10 @@ async def mediainfo(_, ctx: Message, strings):
             and ctx.reply_to_message.document.file_size > 2097152000
         ):
             return await process.edit_msg(strings("dl_limit_exceeded"), del_in=6)
-        c_time = time.time()
-        dc_id = FileId.decode(file_info.file_id).dc_id
         try:
-            dl = await ctx.reply_to_message.download(
-                file_name="downloads/",
-                progress=progress_for_pyrogram,
-                progress_args=(strings("dl_args_text"), process, c_time, dc_id),
-            )
+            out = await analyze_media(self, ctx.reply_to_message, file_info)
         except FileNotFoundError:
             return await process.edit_msg("ERROR: FileNotFound.")
-        file_path = path.join("downloads/", path.basename(dl))
-        output_ = await runcmd(f'mediainfo "{file_path}"')
-        out = output_[0] if len(output_) != 0 else None
         body_text = f"""
 MissKatyBot MediaInfo
 JSON
@@ -88,19 +130,12 @@ DETAILS
                 reply_markup=markup,
             )
             await process.delete()
-        try:
-            osremove(file_path)
-        except Exception:
-            pass
     else:
         try:
             link = ctx.input
             process = await ctx.reply_msg(strings("wait_msg"))
-            try:
-                output = subprocess.check_output(["mediainfo", f"{link}"]).decode(
-                    "utf-8"
-                )
-            except Exception:
+            output = await run_mediainfo(link)
+            if not output:
                 return await process.edit_msg(strings("err_link"))
             body_text = f"""
             MissKatyBot MediaInfo
@@ -108,7 +143,7 @@ DETAILS
             """
             # link = await post_to_telegraph(False, title, body_text)
             try:
-                link = await mediainfo_paste(out, "MissKaty Mediainfo")
+                link = await mediainfo_paste(output, "MissKaty Mediainfo")
                 markup = InlineKeyboardMarkup(
                     [[InlineKeyboardButton(text=strings("viweb"), url=link)]]
                 )
@@ -4,10 +4,11 @@
 # * Copyright ©YasirPedia All rights reserved
 import os
 
-from PIL import Image, ImageDraw, ImageFont
 from pyrogram import filters
 
 from misskaty import app
+from misskaty.helper.image_render import render_nulis
+from misskaty.helper.parse_pool import run_parser
 from misskaty.vars import COMMAND_HANDLER
 
 __MODULE__ = "nulis"
@@ -44,17 +45,9 @@ async def handwrite(client, message):
         )
     nan = await message.reply_msg("Processing...")
     try:
-        img = Image.open("assets/kertas.jpg")
-        draw = ImageDraw.Draw(img)
-        font = ImageFont.truetype("assets/assfont.ttf", 30)
-        x, y = 150, 140
-        lines = text_set(txt)
-        line_height = font.getbbox("hg")[3]
-        for line in lines:
-            draw.text((x, y), line, fill=(1, 22, 55), font=font)
-            y = y + line_height - 5
-        file = f"nulis_{message.from_user.id}.jpg"
-        img.save(file)
+        file = await run_parser(
+            render_nulis, text_set(txt), f"nulis_{message.from_user.id}.jpg"
+        )
         if os.path.exists(file):
             await message.reply_photo(
                 photo=file, caption=f"<b>Written By :</b> {client.me.mention}"
@@ -11,26 +11,33 @@ from pyrogram.errors import MessageTooLong, QueryIdInvalid
 from pyrogram.types import CallbackQuery, Message
 
 from misskaty import app
-from misskaty.helper import Cache, fetch, post_to_telegraph
+from misskaty.helper import AsyncCache, fetch, post_to_telegraph
 from misskaty.plugins.web_scraper import split_arr
 from misskaty.vars import COMMAND_HANDLER
 
-PYPI_DICT = Cache(filename="pypi_cache.db", path="cache", in_memory=False)
+PYPI_DICT = AsyncCache(
+    filename="pypi_cache.db",
+    path="cache",
+    in_memory=False,
+    max_entries=5000,
+    max_bytes=64 * 1024 * 1024,
+)
 
 
 async def getDataPypi(msg, kueri, CurrentPage, user):
-    if not PYPI_DICT.get(msg.id):
+    if not (saved := await PYPI_DICT.get(msg.id)):
         pypijson = (await fetch.get(f"https://yasirapi.eu.org/pypi?q={kueri}")).json()
         if not pypijson.get("result"):
             await msg.edit_msg("Sorry could not find any matching results!", del_in=6)
             return None, 0, None
-        PYPI_DICT.add(msg.id, [split_arr(pypijson["result"], 6), kueri], timeout=1600)
+        saved = [split_arr(pypijson["result"], 6), kueri]
+        await PYPI_DICT.add(msg.id, saved, timeout=1600)
     try:
         index = int(CurrentPage - 1)
-        PageLen = len(PYPI_DICT[msg.id][0])
+        PageLen = len(saved[0])
         extractbtn = []
         pypiResult = f"<b>#Pypi Results For:</b> <code>{kueri}</code>\n\n"
-        for c, i in enumerate(PYPI_DICT[msg.id][0][index], start=1):
+        for c, i in enumerate(saved[0][index], start=1):
             pypiResult += f"<b>{c}.</b> <a href='{i['url']}'>{i['name']} {i['version']}</a>\n<b>Created:</b> <code>{i['created']}</code>\n<b>Desc:</b> <code>{i['description']}</code>\n\n"
             extractbtn.append(
                 InlineButton(c, f"pypidata#{CurrentPage}#{c}#{user}#{msg.id}")
@@ -73,7 +80,7 @@ async def pypipage_callback(_, callback_query: CallbackQuery):
     message_id = int(callback_query.data.split("#")[2])
     CurrentPage = int(callback_query.data.split("#")[1])
     try:
-        kueri = PYPI_DICT[message_id][1]
+        kueri = (await PYPI_DICT[message_id])[1]
     except KeyError:
         return await callback_query.answer(
             "Invalid callback data, please send CMD again.."
@@ -108,7 +115,7 @@ async def pypi_getdata(_, callback_query: CallbackQuery):
     message_id = int(callback_query.data.split("#")[4])
     CurrentPage = int(callback_query.data.split("#")[1])
     try:
-        pkgname = PYPI_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("name")
+        pkgname = (await PYPI_DICT[message_id])[0][CurrentPage - 1][idlink - 1].get("name")
     except KeyError:
         return await callback_query.answer(
             "Invalid callback data, please send CMD again.."
@@ -5,10 +5,9 @@
 from pyrogram import filters
 from pyrogram.types import Message
 
+from database.context_db import get_update_context
 from database.sangmata_db import (
     add_userdata,
-    cek_userdata,
-    get_userdata,
     is_sangmata_on,
     sangmata_off,
     sangmata_on,
@@ -32,16 +31,20 @@ This feature inspired from SangMata Bot. I'm created simple detection to check u
 )
 @use_chat_lang()
 async def cek_mataa(_, ctx: Message, strings):
-    if ctx.sender_chat or not await is_sangmata_on(ctx.chat.id):
+    if ctx.sender_chat:
         return
-    if not await cek_userdata(ctx.from_user.id):
+    uctx = await get_update_context(ctx)
+    if not uctx.sangmata_on:
+        return
+    userdata = uctx.sangmata_user(ctx.from_user.id)
+    if not userdata:
         return await add_userdata(
             ctx.from_user.id,
             ctx.from_user.username,
             ctx.from_user.first_name,
             ctx.from_user.last_name,
         )
-    usernamebefore, first_name, lastname_before = await get_userdata(ctx.from_user.id)
+    usernamebefore, first_name, lastname_before = userdata
     msg = ""
     if (
         usernamebefore != ctx.from_user.username
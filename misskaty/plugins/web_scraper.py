@@ -11,7 +11,6 @@ import re
 import sys
 import traceback
 
-import cloudscraper
 import httpx
 from bs4 import BeautifulSoup
 from cachetools import TTLCache
@@ -21,7 +20,19 @@ from pyrogram.types import Message
 
 from database import dbname
 from misskaty import app
-from misskaty.helper import Cache, Kusonime, fetch, post_to_telegraph, use_chat_lang
+from misskaty.helper import AsyncCache, Kusonime, fetch, post_to_telegraph, use_chat_lang
+from misskaty.helper.parse_pool import run_parser
+from misskaty.helper.scraper_pool import scrapers
+from misskaty.helper.search_cache import SearchCache
+from parsers.scrapers import (
+    parse_entry_header,
+    parse_kusonime,
+    parse_lendrive,
+    parse_melongmovie,
+    parse_movieku,
+    parse_samehadaku,
+    split_arr,
+)
 
 __MODULE__ = "WebScraper"
 __HELP__ = """
@@ -42,9 +53,27 @@ __HELP__ = """
 """
 
 LOGGER = logging.getLogger("MissKaty")
-SCRAP_DICT = Cache(filename="scraper_cache.db", path="cache", in_memory=False)
-data_kuso = Cache(filename="kuso_cache.db", path="cache", in_memory=False)
-savedict = TTLCache(maxsize=1000, ttl=3600)
+SCRAP_DICT = AsyncCache(
+    filename="scraper_cache.db", path="cache", in_memory=False, max_entries=20000
+)
+data_kuso = AsyncCache(
+    filename="kuso_cache.db", path="cache", in_memory=False, max_entries=5000
+)
+SEARCH_CACHE = SearchCache(
+    ttl={
+        "terbit21": 900,
+        "lk21": 900,
+        "pahe": 900,
+        "lendrive": 600,
+        "samehadaku": 600,
+    },
+    default_ttl=1800,
+)
+# How long a result message can be paged
+SEARCH_REF_TTL = 1800
+# msg_id -> the result list its first page was rendered from. Sites cached for less
+# than SEARCH_REF_TTL would otherwise be refetched while paging, with other results.
+SEARCH_PAGES = TTLCache(maxsize=5000, ttl=SEARCH_REF_TTL)
 webdb = dbname["web"]
 
 web = {
@@ -68,45 +97,175 @@ web = {
 }
 
 
-def split_arr(arr, size: 5):
-    arrs = []
-    while len(arr) > size:
-        pice = arr[:size]
-        arrs.append(pice)
-        arr = arr[size:]
-    arrs.append(arr)
-    return arrs
+# Shared search fetchers, cached per (site, query) in SEARCH_CACHE
+async def _search_terbit21(kueri):
+    if kueri:
+        terbitjson = await fetch.get(f"{web['yasirapi']}/terbit21?q={kueri}")
+    else:
+        terbitjson = await fetch.get(f"{web['yasirapi']}/terbit21")
+    terbitjson.raise_for_status()
+    res = terbitjson.json()
+    return split_arr(res["result"], 6) if res.get("result") else []
+
+
+async def _search_lk21(kueri):
+    if kueri:
+        lk21json = await fetch.get(f"{web['yasirapi']}/lk21?q={kueri}")
+    else:
+        lk21json = await fetch.get(f"{web['yasirapi']}/lk21")
+    lk21json.raise_for_status()
+    res = lk21json.json()
+    return split_arr(res["result"], 6) if res.get("result") else []
+
+
+async def _search_pahe(kueri):
+    if kueri:
+        pahejson = await fetch.get(
+            f"{web['yasirapi']}/pahe?q={kueri}&domain={web['pahe']}"
+        )
+    else:
+        pahejson = await fetch.get(f"{web['yasirapi']}/pahe?domain={web['pahe']}")
+    pahejson.raise_for_status()
+    res = pahejson.json()
+    return split_arr(res["result"], 6) if res.get("result") else []
+
+
+async def _search_kusonime(kueri):
+    data = await fetch.get(f"{web['kusonime']}/?s={kueri}", follow_redirects=True)
+    data.raise_for_status()
+    return await run_parser(parse_kusonime, data.text)
+
+
+async def _search_movieku(kueri):
+    data = await fetch.get(f"{web['movieku']}/?s={kueri}", follow_redirects=True)
+    data.raise_for_status()
+    return await run_parser(parse_movieku, data.text)
+
+
+async def _search_entry_header(site, kueri, not_found="Nothing Found"):
+    data = await fetch.get(f"{web[site]}/?s={kueri}", follow_redirects=True)
+    data.raise_for_status()
+    return await run_parser(parse_entry_header, data.text, not_found)
+
+
+async def _search_nodrakor(kueri):
+    return await _search_entry_header("nodrakor", kueri)
+
+
+async def _search_savefilm21(kueri):
+    return await _search_entry_header("savefilm21", kueri, "Tidak Ditemukan")
+
+
+async def _search_nunadrama(kueri):
+    return await _search_entry_header("nunadrama", kueri)
+
+
+async def _search_pusatfilm(kueri):
+    return await _search_entry_header("pusatfilm", kueri)
+
+
+async def _search_dutamovie(kueri):
+    return await _search_entry_header("dutamovie", kueri)
+
+
+async def _search_gomov(kueri):
+    return await _search_entry_header("gomov", kueri)
+
+
+async def _search_lendrive(kueri):
+    if kueri:
+        data = await fetch.get(f"{web['lendrive']}/?s={kueri}", follow_redirects=True)
+    else:
+        data = await fetch.get(web["lendrive"], follow_redirects=True)
+    data.raise_for_status()
+    return await run_parser(parse_lendrive, data.text)
+
+
+async def _search_melongmovie(kueri):
+    data = await fetch.get(f"{web['melongmovie']}/?s={kueri}", follow_redirects=True)
+    data.raise_for_status()
+    return await run_parser(parse_melongmovie, data.text)
+
+
+async def _search_samehadaku(query):
+    if query:
+        data = await scrapers.get(f"{web['samehadaku']}/?s={query}")
+    else:
+        data = await scrapers.get(web["samehadaku"])
+    if data.status_code != 200:
+        raise ConnectionError(data.status_code)
+    return await run_parser(parse_samehadaku, data.text)
+
+
+SITE_SEARCH = {
+    "terbit21": _search_terbit21,
+    "lk21": _search_lk21,
+    "pahe": _search_pahe,
+    "kusonime": _search_kusonime,
+    "movieku": _search_movieku,
+    "nodrakor": _search_nodrakor,
+    "savefilm21": _search_savefilm21,
+    "nunadrama": _search_nunadrama,
+    "pusatfilm": _search_pusatfilm,
+    "dutamovie": _search_dutamovie,
+    "gomov": _search_gomov,
+    "lendrive": _search_lendrive,
+    "melongmovie": _search_melongmovie,
+    "samehadaku": _search_samehadaku,
+}
+
+
+async def search_site(site, kueri):
+    return await SEARCH_CACHE.get(site, kueri, SITE_SEARCH[site])
+
+
+async def search_pages(msg_id, site, kueri):
+    """Search for a result message, pages of a message already shown come from its pinned list."""
+    if msg_id in SEARCH_PAGES:
+        return SEARCH_PAGES[msg_id]
+    return await search_site(site, kueri)
+
+
+async def remember_search(msg_id, site, kueri, pages):
+    """Point a result message at the shared search result instead of copying it."""
+    SEARCH_PAGES.setdefault(msg_id, pages)
+    if await SCRAP_DICT.get(msg_id):
+        return
+    await SCRAP_DICT.add(
+        msg_id, [SEARCH_CACHE.key(site, kueri), kueri], timeout=SEARCH_REF_TTL
+    )
+
+
+async def get_scrap_pages(msg_id):
+    """Resolve the search result a message points to. Raises KeyError if the message expired."""
+    site, query = (await SCRAP_DICT[msg_id])[0]
+    if msg_id in SEARCH_PAGES:
+        return SEARCH_PAGES[msg_id]
+    # Only after a restart, the reference outlives the in memory result
+    return await search_site(site, query)
 
 
 # Terbit21 GetData
 async def getDataTerbit21(msg, kueri, CurrentPage, strings):
-    if not SCRAP_DICT.get(msg.id):
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                if kueri:
-                    terbitjson = await fetch.get(
-                        f"{web['yasirapi']}/terbit21?q={kueri}"
-                    )
-                else:
-                    terbitjson = await fetch.get(f"{web['yasirapi']}/terbit21")
-                terbitjson.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>"
-                )
-                return None, None
-        res = terbitjson.json()
-        if not res.get("result"):
-            await msg.edit_msg(strings("no_result"), del_in=5)
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            pages = await search_pages(msg.id, "terbit21", kueri)
+        except httpx.HTTPError as exc:
+            await msg.edit_msg(
+                f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>"
+            )
             return None, None
-        SCRAP_DICT.add(msg.id, [split_arr(res["result"], 6), kueri], timeout=1800)
+    if not pages:
+        await msg.edit_msg(strings("no_result"), del_in=5)
+        return None, None
+    await remember_search(msg.id, "terbit21", kueri, pages)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = len(pages)
     if kueri:
         TerbitRes = strings("header_with_query").format(web="Terbit21", kueri=kueri)
     else:
         TerbitRes = strings("header_no_query").format(web="Terbit21", cmd="terbit21")
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(pages[index], start=1):
         TerbitRes += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>{strings('cat_text')}:</b> <code>{i['kategori']}</code>\n"
         TerbitRes += (
             "\n"
@@ -118,31 +277,25 @@ async def getDataTerbit21(msg, kueri, CurrentPage, strings):
 
 # LK21 GetData
 async def getDatalk21(msg, kueri, CurrentPage, strings):
-    if not SCRAP_DICT.get(msg.id):
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                if kueri:
-                    lk21json = await fetch.get(f"{web['yasirapi']}/lk21?q={kueri}")
-                else:
-                    lk21json = await fetch.get(f"{web['yasirapi']}/lk21")
-                lk21json.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>"
-                )
-                return None, None
-        res = lk21json.json()
-        if not res.get("result"):
-            await msg.edit_msg(strings("no_result"), del_in=5)
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            pages = await search_pages(msg.id, "lk21", kueri)
+        except httpx.HTTPError as exc:
+            await msg.edit_msg(
+                f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>"
+            )
             return None, None
-        SCRAP_DICT.add(msg.id, [split_arr(res["result"], 6), kueri], timeout=1800)
+    if not pages:
+        await msg.edit_msg(strings("no_result"), del_in=5)
+        return None, None
+    await remember_search(msg.id, "lk21", kueri, pages)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = len(pages)
     if kueri:
         lkResult = strings("header_with_query").format(web="Layarkaca21", kueri=kueri)
     else:
         lkResult = strings("header_no_query").format(web="Layarkaca21", cmd="lk21")
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(pages[index], start=1):
         lkResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>{strings('cat_text')}:</b> <code>{i['kategori']}</code>\n"
         lkResult += (
             "\n"
@@ -154,68 +307,47 @@ async def getDatalk21(msg, kueri, CurrentPage, strings):
 
 # Pahe GetData
 async def getDataPahe(msg, kueri, CurrentPage, strings):
-    if not SCRAP_DICT.get(msg.id):
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                if kueri:
-                    pahejson = await fetch.get(
-                        f"{web['yasirapi']}/pahe?q={kueri}&domain={web['pahe']}"
-                    )
-                else:
-                    pahejson = await fetch.get(
-                        f"{web['yasirapi']}/pahe?domain={web['pahe']}"
-                    )
-                pahejson.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>"
-                )
-                return None, None
-        res = pahejson.json()
-        if not res.get("result"):
-            await msg.edit_msg(strings("no_result"), del_in=5)
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            pages = await search_pages(msg.id, "pahe", kueri)
+        except httpx.HTTPError as exc:
+            await msg.edit_msg(
+                f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>"
+            )
             return None, None
-        SCRAP_DICT.add(msg.id, [split_arr(res["result"], 6), kueri], timeout=1800)
+    if not pages:
+        await msg.edit_msg(strings("no_result"), del_in=5)
+        return None, None
+    await remember_search(msg.id, "pahe", kueri, pages)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = len(pages)
     paheResult = (
         strings("header_with_query").format(web="Pahe", kueri=kueri)
         if kueri
         else strings("header_no_query").format(web="Pahe", cmd="pahe")
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(pages[index], start=1):
         paheResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n\n"
     return paheResult, PageLen
 
 
 # Kusonime GetData
 async def getDataKuso(msg, kueri, CurrentPage, user, strings):
-    if not SCRAP_DICT.get(msg.id):
-        kusodata = []
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                data = await fetch.get(
-                    f"{web['kusonime']}/?s={kueri}", follow_redirects=True
-                )
-                data.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>",
-                    disable_web_page_preview=True,
-                )
-                return None, 0, None, None
-        res = BeautifulSoup(data, "lxml").find_all("h2", {"class": "episodeye"})
-        for i in res:
-            ress = i.find_all("a")[0]
-            title = ress.text
-            link = ress["href"]
-            kusodata.append({"title": title, "link": link})
-        if not kusodata:
-            await msg.edit_msg(strings("no_result"), del_in=5)
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            pages = await search_pages(msg.id, "kusonime", kueri)
+        except httpx.HTTPError as exc:
+            await msg.edit_msg(
+                f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>",
+                disable_web_page_preview=True,
+            )
             return None, 0, None, None
-        SCRAP_DICT.add(msg.id, [split_arr(kusodata, 10), kueri], timeout=1800)
+    if not pages:
+        await msg.edit_msg(strings("no_result"), del_in=5)
+        return None, 0, None, None
+    await remember_search(msg.id, "kusonime", kueri, pages)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = len(pages)
     extractbtn1 = []
     extractbtn2 = []
 
@@ -224,7 +356,7 @@ async def getDataKuso(msg, kueri, CurrentPage, user, strings):
         if kueri == ""
         else strings("header_with_query").format(web="Kusonime", kueri=kueri)
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(pages[index], start=1):
         kusoResult += f"<b>{index*6+c}</b>. {i['title']}\n{i['link']}\n\n"
         if c < 6:
             extractbtn1.append(
@@ -243,33 +375,20 @@ async def getDataKuso(msg, kueri, CurrentPage, user, strings):
 
 # Movieku GetData
 async def getDataMovieku(msg, kueri, CurrentPage, user, strings):
-    if not SCRAP_DICT.get(msg.id):
-        moviekudata = []
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                data = await fetch.get(
-                    f"{web['movieku']}/?s={kueri}", follow_redirects=True
-                )
-                data.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>"
-                )
-                return None, 0, None
-        r = BeautifulSoup(data, "lxml")
-        res = r.find_all(class_="bx")
-        for i in res:
-            judul = i.find_all("a")[0]["title"]
-            link = i.find_all("a")[0]["href"]
-            typ = i.find(class_="overlay").text
-            typee = typ.strip() if typ.strip() != "" else "~"
-            moviekudata.append({"judul": judul, "link": link, "type": typee})
-        if not moviekudata:
-            await msg.edit_msg(strings("no_result"), del_in=5)
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            pages = await search_pages(msg.id, "movieku", kueri)
+        except httpx.HTTPError as exc:
+            await msg.edit_msg(
+                f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>"
+            )
             return None, 0, None
-        SCRAP_DICT.add(msg.id, [split_arr(moviekudata, 6), kueri], timeout=1800)
+    if not pages:
+        await msg.edit_msg(strings("no_result"), del_in=5)
+        return None, 0, None
+    await remember_search(msg.id, "movieku", kueri, pages)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = len(pages)
     extractbtn = []
 
     moviekuResult = (
@@ -277,7 +396,7 @@ async def getDataMovieku(msg, kueri, CurrentPage, user, strings):
         if kueri == ""
         else strings("header_with_query").format(web="Movieku", kueri=kueri)
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(pages[index], start=1):
         moviekuResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>{strings('quality')}/Status:</b> {i['type']}\n\n"
         extractbtn.append(
             InlineButton(
@@ -289,47 +408,33 @@ async def getDataMovieku(msg, kueri, CurrentPage, user, strings):
 
 # NoDrakor GetData
 async def getDataNodrakor(msg, kueri, CurrentPage, user, strings):
-    if not SCRAP_DICT.get(msg.id):
-        nodrakordata = []
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                data = await fetch.get(
-                    f"{web['nodrakor']}/?s={kueri}",
-                    follow_redirects=True,
-                )
-                data.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"HTTP Exception for {exc.request.url} - <code>{exc}</code>",
-                    disable_web_page_preview=True,
-                )
-                return None, 0, None
-        text = BeautifulSoup(data, "lxml")
-        entry = text.find_all(class_="entry-header")
-        if entry[0].text.strip() == "Nothing Found":
-            if not kueri:
-                await msg.edit_msg(strings("no_result"), del_in=5)
-            else:
-                await msg.edit_msg(
-                    strings("no_result_w_query").format(kueri=kueri), del_in=5
-                )
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            pages = await search_pages(msg.id, "nodrakor", kueri)
+        except httpx.HTTPError as exc:
+            await msg.edit_msg(
+                f"HTTP Exception for {exc.request.url} - <code>{exc}</code>",
+                disable_web_page_preview=True,
+            )
             return None, 0, None
-        for i in entry:
-            genre = i.find(class_="gmr-movie-on")
-            genre = f"{genre.text}" if genre else "N/A"
-            judul = i.find(class_="entry-title").find("a").text
-            link = i.find(class_="entry-title").find("a").get("href")
-            nodrakordata.append({"judul": judul, "link": link, "genre": genre})
-        SCRAP_DICT.add(msg.id, [split_arr(nodrakordata, 6), kueri], timeout=1800)
+    if not pages:
+        if not kueri:
+            await msg.edit_msg(strings("no_result"), del_in=5)
+        else:
+            await msg.edit_msg(
+                strings("no_result_w_query").format(kueri=kueri), del_in=5
+            )
+        return None, 0, None
+    await remember_search(msg.id, "nodrakor", kueri, pages)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = len(pages)
     extractbtn = []
     nodrakorResult = (
         strings("header_no_query").format(web="NoDrakor", cmd="nodrakor")
         if kueri == ""
         else strings("header_with_query").format(web="NoDrakor", kueri=kueri)
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(pages[index], start=1):
         nodrakorResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>Genre:</b> {i['genre']}\n\n"
         extractbtn.append(
             InlineButton(
@@ -341,47 +446,33 @@ async def getDataNodrakor(msg, kueri, CurrentPage, user, strings):
 
 # Savefilm21 GetData
 async def getDataSavefilm21(msg, kueri, CurrentPage, user, strings):
-    if not SCRAP_DICT.get(msg.id):
-        sfdata = []
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                data = await fetch.get(
-                    f"{web['savefilm21']}/?s={kueri}",
-                    follow_redirects=True,
-                )
-                data.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"HTTP Exception for {exc.request.url} - <code>{exc}</code>",
-                    disable_web_page_preview=True,
-                )
-                return None, 0, None
-        text = BeautifulSoup(data, "lxml")
-        entry = text.find_all(class_="entry-header")
-        if "Tidak Ditemukan" in entry[0].text:
-            if not kueri:
-                await msg.edit_msg(strings("no_result"), del_in=5)
-            else:
-                await msg.edit_msg(
-                    strings("no_result_w_query").format(kueri=kueri), del_in=5
-                )
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            pages = await search_pages(msg.id, "savefilm21", kueri)
+        except httpx.HTTPError as exc:
+            await msg.edit_msg(
+                f"HTTP Exception for {exc.request.url} - <code>{exc}</code>",
+                disable_web_page_preview=True,
+            )
             return None, 0, None
-        for i in entry:
-            genre = i.find(class_="gmr-movie-on").text
-            genre = f"{genre}" if genre != "" else "N/A"
-            judul = i.find(class_="entry-title").find("a").text
-            link = i.find(class_="entry-title").find("a").get("href")
-            sfdata.append({"judul": judul, "link": link, "genre": genre})
-        SCRAP_DICT.add(msg.id, [split_arr(sfdata, 6), kueri], timeout=1800)
+    if not pages:
+        if not kueri:
+            await msg.edit_msg(strings("no_result"), del_in=5)
+        else:
+            await msg.edit_msg(
+                strings("no_result_w_query").format(kueri=kueri), del_in=5
+            )
+        return None, 0, None
+    await remember_search(msg.id, "savefilm21", kueri, pages)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = len(pages)
     extractbtn = []
     sfResult = (
         strings("header_no_query").format(web="Savefilm21", cmd="savefilm21")
         if kueri == ""
         else strings("header_with_query").format(web="Savefilm21", kueri=kueri)
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(pages[index], start=1):
         sfResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>Genre:</b> {i['genre']}\n\n"
         extractbtn.append(
             InlineButton(
@@ -393,40 +484,26 @@ async def getDataSavefilm21(msg, kueri, CurrentPage, user, strings):
 
 # NunaDrama GetData
 async def getDataNunaDrama(msg, kueri, CurrentPage, user, strings):
-    if not SCRAP_DICT.get(msg.id):
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                nunafetch = await fetch.get(
-                    f"{web['nunadrama']}/?s={kueri}", follow_redirects=True
-                )
-                nunafetch.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>",
-                    disable_web_page_preview=True,
-                )
-                return None, 0, None
-        text = BeautifulSoup(nunafetch, "lxml")
-        entry = text.find_all(class_="entry-header")
-        if entry[0].text.strip() == "Nothing Found":
-            if not kueri:
-                await msg.edit_msg(strings("no_result"), del_in=5)
-            else:
-                await msg.edit_msg(
-                    strings("no_result_w_query").format(kueri=kueri), del_in=5
-                )
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            pages = await search_pages(msg.id, "nunadrama", kueri)
+        except httpx.HTTPError as exc:
+            await msg.edit_msg(
+                f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>",
+                disable_web_page_preview=True,
+            )
             return None, 0, None
+    if not pages:
+        if not kueri:
+            await msg.edit_msg(strings("no_result"), del_in=5)
         else:
-            data = []
-            for i in entry:
-                genre = i.find(class_="gmr-movie-on")
-                genre = f"{genre.text}" if genre else "N/A"
-                judul = i.find(class_="entry-title").find("a").text
-                link = i.find(class_="entry-title").find("a").get("href")
-                data.append({"judul": judul, "link": link, "genre": genre})
-            SCRAP_DICT.add(msg.id, [split_arr(data, 6), kueri], timeout=1800)
+            await msg.edit_msg(
+                strings("no_result_w_query").format(kueri=kueri), del_in=5
+            )
+        return None, 0, None
+    await remember_search(msg.id, "nunadrama", kueri, pages)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = len(pages)
     extractbtn = []
 
     nunaResult = (
@@ -434,7 +511,7 @@ async def getDataNunaDrama(msg, kueri, CurrentPage, user, strings):
         if kueri
         else strings("header_no_query").format(web="NunaDrama", cmd="nunadrama")
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(pages[index], start=1):
         nunaResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>Genre:</b> <code>{i['genre']}</code>\n\n"
         if not re.search(r"Series", i["genre"]):
             extractbtn.append(
@@ -448,40 +525,26 @@ async def getDataNunaDrama(msg, kueri, CurrentPage, user, strings):
 
 # PusatFilm21 GetData
 async def getDataPusatFilm(msg, kueri, CurrentPage, user, strings):
-    if not SCRAP_DICT.get(msg.id):
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                nunafetch = await fetch.get(
-                    f"{web['pusatfilm']}/?s={kueri}", follow_redirects=True
-                )
-                nunafetch.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>",
-                    disable_web_page_preview=True,
-                )
-                return None, 0, None
-        text = BeautifulSoup(nunafetch, "lxml")
-        entry = text.find_all(class_="entry-header")
-        if entry[0].text.strip() == "Nothing Found":
-            if not kueri:
-                await msg.edit_msg(strings("no_result"), del_in=5)
-            else:
-                await msg.edit_msg(
-                    strings("no_result_w_query").format(kueri=kueri), del_in=5
-                )
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            pages = await search_pages(msg.id, "pusatfilm", kueri)
+        except httpx.HTTPError as exc:
+            await msg.edit_msg(
+                f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>",
+                disable_web_page_preview=True,
+            )
             return None, 0, None
+    if not pages:
+        if not kueri:
+            await msg.edit_msg(strings("no_result"), del_in=5)
         else:
-            data = []
-            for i in entry:
-                genre = i.find(class_="gmr-movie-on")
-                genre = f"{genre.text}" if genre else "N/A"
-                judul = i.find(class_="entry-title").find("a").text
-                link = i.find(class_="entry-title").find("a").get("href")
-                data.append({"judul": judul, "link": link, "genre": genre})
-            SCRAP_DICT.add(msg.id, [split_arr(data, 6), kueri], timeout=1800)
+            await msg.edit_msg(
+                strings("no_result_w_query").format(kueri=kueri), del_in=5
+            )
+        return None, 0, None
+    await remember_search(msg.id, "pusatfilm", kueri, pages)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = len(pages)
     extractbtn = []
 
     pfResult = (
@@ -489,7 +552,7 @@ async def getDataPusatFilm(msg, kueri, CurrentPage, user, strings):
         if kueri
         else strings("header_no_query").format(web="PusatFilm21", cmd="pusatfilm")
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(pages[index], start=1):
         pfResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>Genre:</b> <code>{i['genre']}</code>\n\n"
         if not re.search(r"Series", i["genre"]):
             extractbtn.append(
@@ -503,40 +566,26 @@ async def getDataPusatFilm(msg, kueri, CurrentPage, user, strings):
 
 # DutaMovie GetData
 async def getDataDutaMovie(msg, kueri, CurrentPage, user, strings):
-    if not SCRAP_DICT.get(msg.id):
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                nunafetch = await fetch.get(
-                    f"{web['dutamovie']}/?s={kueri}", follow_redirects=True
-                )
-                nunafetch.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>",
-                    disable_web_page_preview=True,
-                )
-                return None, 0, None
-        text = BeautifulSoup(nunafetch, "lxml")
-        entry = text.find_all(class_="entry-header")
-        if entry[0].text.strip() == "Nothing Found":
-            if not kueri:
-                await msg.edit_msg(strings("no_result"), del_in=5)
-            else:
-                await msg.edit_msg(
-                    strings("no_result_w_query").format(kueri=kueri), del_in=5
-                )
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            pages = await search_pages(msg.id, "dutamovie", kueri)
+        except httpx.HTTPError as exc:
+            await msg.edit_msg(
+                f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>",
+                disable_web_page_preview=True,
+            )
             return None, 0, None
+    if not pages:
+        if not kueri:
+            await msg.edit_msg(strings("no_result"), del_in=5)
         else:
-            data = []
-            for i in entry:
-                genre = i.find(class_="gmr-movie-on")
-                genre = f"{genre.text}" if genre else "N/A"
-                judul = i.find(class_="entry-title").find("a").text
-                link = i.find(class_="entry-title").find("a").get("href")
-                data.append({"judul": judul, "link": link, "genre": genre})
-            SCRAP_DICT.add(msg.id, [split_arr(data, 6), kueri], timeout=1800)
+            await msg.edit_msg(
+                strings("no_result_w_query").format(kueri=kueri), del_in=5
+            )
+        return None, 0, None
+    await remember_search(msg.id, "dutamovie", kueri, pages)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = len(pages)
     extractbtn = []
 
     dutaResult = (
@@ -544,7 +593,7 @@ async def getDataDutaMovie(msg, kueri, CurrentPage, user, strings):
         if kueri
         else strings("header_no_query").format(web="DutaMovie", cmd="dutamovie")
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(pages[index], start=1):
         dutaResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>Genre:</b> <code>{i['genre']}</code>\n\n"
         if not re.search(r"Series", i["genre"]):
             extractbtn.append(
@@ -558,52 +607,21 @@ async def getDataDutaMovie(msg, kueri, CurrentPage, user, strings):
 
 # Lendrive GetData
 async def getDataLendrive(msg, kueri, CurrentPage, user, strings):
-    if not SCRAP_DICT.get(msg.id):
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                if kueri:
-                    data = await fetch.get(
-                        f"{web['lendrive']}/?s={kueri}",
-                        follow_redirects=True,
-                    )
-                else:
-                    data = await fetch.get(web["lendrive"], follow_redirects=True)
-                data.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>",
-                    disable_web_page_preview=True,
-                )
-                return None, 0, None
-        res = BeautifulSoup(data, "lxml")
-        lenddata = []
-        for o in res.find_all(class_="bsx"):
-            title = o.find("a")["title"]
-            link = o.find("a")["href"]
-            status = (
-                o.find(class_="epx").text
-                if o.find(class_="epx")
-                else "Not Provided by BOT"
-            )
-            kualitas = (
-                o.find(class_="typez TV").text
-                if o.find(class_="typez TV")
-                else o.find(class_="typez BD")
-            )
-            lenddata.append(
-                {
-                    "judul": title,
-                    "link": link,
-                    "quality": kualitas or "N/A",
-                    "status": status,
-                }
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            pages = await search_pages(msg.id, "lendrive", kueri)
+        except httpx.HTTPError as exc:
+            await msg.edit_msg(
+                f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>",
+                disable_web_page_preview=True,
             )
-        if not lenddata:
-            await msg.edit_msg(strings("no_result"), del_in=5)
             return None, 0, None
-        savedict[msg.id] = [split_arr(lenddata, 6), kueri]
+    if not pages:
+        await msg.edit_msg(strings("no_result"), del_in=5)
+        return None, 0, None
+    await remember_search(msg.id, "lendrive", kueri, pages)
     index = int(CurrentPage - 1)
-    PageLen = len(savedict[msg.id][0])
+    PageLen = len(pages)
     extractbtn = []
 
     lenddataResult = (
@@ -611,7 +629,7 @@ async def getDataLendrive(msg, kueri, CurrentPage, user, strings):
         if kueri == ""
         else strings("header_with_query").format(web="Lendrive", kueri=kueri)
     )
-    for c, i in enumerate(savedict[msg.id][0][index], start=1):
+    for c, i in enumerate(pages[index], start=1):
         lenddataResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>{strings('quality')}:</b> {i['quality']}\n<b>Status:</b> {i['status']}\n\n"
         extractbtn.append(
             InlineButton(
@@ -623,37 +641,21 @@ async def getDataLendrive(msg, kueri, CurrentPage, user, strings):
 
 # MelongMovie GetData
 async def getDataMelong(msg, kueri, CurrentPage, user, strings):
-    if not SCRAP_DICT.get(msg.id):
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                data = await fetch.get(
-                    f"{web['melongmovie']}/?s={kueri}",
-                    follow_redirects=True,
-                )
-                data.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"HTTP Exception for {exc.request.url} - <code>{exc}</code>",
-                    disable_web_page_preview=True,
-                )
-                return None, 0, None
-        bs4 = BeautifulSoup(data, "lxml")
-        melongdata = []
-        for res in bs4.select(".box"):
-            dd = res.select("a")
-            url = dd[0]["href"]
-            title = dd[0]["title"]
-            try:
-                quality = dd[0].find(class_="quality").text
-            except:
-                quality = "N/A"
-            melongdata.append({"judul": title, "link": url, "quality": quality})
-        if not melongdata:
-            await msg.edit_msg(strings("no_result"), del_in=5)
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            pages = await search_pages(msg.id, "melongmovie", kueri)
+        except httpx.HTTPError as exc:
+            await msg.edit_msg(
+                f"HTTP Exception for {exc.request.url} - <code>{exc}</code>",
+                disable_web_page_preview=True,
+            )
             return None, 0, None
-        SCRAP_DICT.add(msg.id, [split_arr(melongdata, 6), kueri], timeout=1800)
+    if not pages:
+        await msg.edit_msg(strings("no_result"), del_in=5)
+        return None, 0, None
+    await remember_search(msg.id, "melongmovie", kueri, pages)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = len(pages)
     extractbtn = []
 
     melongResult = (
@@ -661,7 +663,7 @@ async def getDataMelong(msg, kueri, CurrentPage, user, strings):
         if kueri == ""
         else strings("header_with_query").format(web="Melongmovie", kueri=kueri)
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(pages[index], start=1):
         melongResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>{strings('quality')}:</b> {i['quality']}\n\n"
         extractbtn.append(
             InlineButton(
@@ -673,40 +675,26 @@ async def getDataMelong(msg, kueri, CurrentPage, user, strings):
 
 # GoMov GetData
 async def getDataGomov(msg, kueri, CurrentPage, user, strings):
-    if not SCRAP_DICT.get(msg.id):
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                gomovv = await fetch.get(
-                    f"{web['gomov']}/?s={kueri}", follow_redirects=True
-                )
-                gomovv.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>",
-                    disable_web_page_preview=True,
-                )
-                return None, 0, None
-        text = BeautifulSoup(gomovv, "lxml")
-        entry = text.find_all(class_="entry-header")
-        if entry[0].text.strip() == "Nothing Found":
-            if not kueri:
-                await msg.edit_msg(strings("no_result"), del_in=5)
-            else:
-                await msg.edit_msg(
-                    strings("no_result_w_query").format(kueri=kueri), del_in=5
-                )
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            pages = await search_pages(msg.id, "gomov", kueri)
+        except httpx.HTTPError as exc:
+            await msg.edit_msg(
+                f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>",
+                disable_web_page_preview=True,
+            )
             return None, 0, None
+    if not pages:
+        if not kueri:
+            await msg.edit_msg(strings("no_result"), del_in=5)
         else:
-            data = []
-            for i in entry:
-                genre = i.find(class_="gmr-movie-on")
-                genre = f"{genre.text}" if genre else "N/A"
-                judul = i.find(class_="entry-title").find("a").text
-                link = i.find(class_="entry-title").find("a").get("href")
-                data.append({"judul": judul, "link": link, "genre": genre})
-            SCRAP_DICT.add(msg.id, [split_arr(data, 6), kueri], timeout=1800)
+            await msg.edit_msg(
+                strings("no_result_w_query").format(kueri=kueri), del_in=5
+            )
+        return None, 0, None
+    await remember_search(msg.id, "gomov", kueri, pages)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = len(pages)
     extractbtn = []
 
     gomovResult = (
@@ -714,7 +702,7 @@ async def getDataGomov(msg, kueri, CurrentPage, user, strings):
         if kueri
         else strings("header_no_query").format(web="GoMov", cmd="gomov")
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(pages[index], start=1):
         gomovResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>Genre:</b> <code>{i['genre']}</code>\n\n"
         if not re.search(r"Series", i["genre"]):
             extractbtn.append(
@@ -728,34 +716,20 @@ async def getDataGomov(msg, kueri, CurrentPage, user, strings):
 
 # getData samehada
 async def getSame(msg, query, current_page, strings):
-    if not SCRAP_DICT.get(msg.id):
-        cfse = cloudscraper.create_scraper()
-        if query:
-            data = cfse.get(f"{web['samehadaku']}/?s={query}")
-        else:
-            data = cfse.get(web["samehadaku"])
-        if data.status_code != 200:
-            await msg.edit_msg(strings("err_getweb").format(err=data.status_code))
-            return None, None
-        res = BeautifulSoup(data.text, "lxml").find_all(class_="animposx")
-        sdata = []
-        for i in res:
-            url = i.find("a")["href"]
-            title = i.find("a")["title"]
-            sta = (
-                i.find(class_="type TV").text if i.find(class_="type TV") else "Ongoing"
-            )
-            rate = i.find(class_="score")
-            sdata.append({"url": url, "title": title, "sta": sta, "rate": rate})
-        if not sdata:
-            await msg.edit_msg(strings("no_result"), del_in=5)
-            return None, None
-        savedict[msg.id] = [split_arr(sdata, 10), query]
+    try:
+        pages = await search_pages(msg.id, "samehadaku", query)
+    except ConnectionError as err:
+        await msg.edit_msg(strings("err_getweb").format(err=err))
+        return None, None
+    if not pages:
+        await msg.edit_msg(strings("no_result"), del_in=5)
+        return None, None
+    await remember_search(msg.id, "samehadaku", query, pages)
     index = int(current_page - 1)
-    PageLen = len(savedict[msg.id][0])
+    PageLen = len(pages)
     sameresult = "".join(
         f"<b>{index * 6 + c}. <a href='{i['url']}'>{i['title']}</a>\n<b>Status:</b> {i['sta']}\n</b>Rating:</b> {i['rate']}\n\n"
-        for c, i in enumerate(savedict[msg.id][0][index], start=1)
+        for c, i in enumerate(pages[index], start=1)
     )
     return sameresult, PageLen
 
@@ -1133,7 +1107,7 @@ async def sf21page_callback(self, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except (IndexError, ValueError):  # Gatau napa err ini
         return
     except KeyError:
@@ -1177,7 +1151,7 @@ async def sf21page_callback(self, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except (IndexError, ValueError):  # Gatau napa err ini
         return
     except KeyError:
@@ -1221,7 +1195,7 @@ async def sf21page_callback(self, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except (IndexError, ValueError):
         return
     except KeyError:
@@ -1264,7 +1238,7 @@ async def sf21page_callback(self, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except (IndexError, ValueError):  # Gatau napa err ini
         return
     except KeyError:
@@ -1308,7 +1282,7 @@ async def pfpage_callback(self, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except (IndexError, ValueError):
         return
     except KeyError:
@@ -1352,7 +1326,7 @@ async def nodrakorpage_cb(self, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except (IndexError, ValueError):
         return
     except KeyError:
@@ -1396,7 +1370,7 @@ async def kusopage_callback(self, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1440,7 +1414,7 @@ async def lendrivepage_callback(self, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = savedict[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1482,7 +1456,7 @@ async def moviekupage_callback(self, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1519,7 +1493,7 @@ async def samepg(_, query, strings):
         _, current_page, _id, user_id = query.data.split("#")
         if int(user_id) != query.from_user.id:
             return await query.answer(strings("unauth"), True)
-        lquery = savedict[int(_id)][1]
+        lquery = (await SCRAP_DICT[int(_id)])[1]
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1551,7 +1525,7 @@ async def terbit21page_callback(_, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1587,7 +1561,7 @@ async def melongpage_callback(self, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1629,7 +1603,7 @@ async def lk21page_callback(_, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1665,7 +1639,7 @@ async def pahepage_callback(_, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1701,7 +1675,7 @@ async def gomovpage_callback(self, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1745,7 +1719,7 @@ async def kusonime_scrap(client, callback_query, strings):
         idlink = int(callback_query.data.split("#")[2])
         message_id = int(callback_query.data.split("#")[4])
         CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
+        link = (await get_scrap_pages(message_id))[CurrentPage - 1][idlink - 1].get("link")
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1761,12 +1735,12 @@ async def kusonime_scrap(client, callback_query, strings):
         InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}"),
     )
     try:
-        if init_url := data_kuso.get(link, False):
+        if init_url := await data_kuso.get(link, False):
             await callback_query.message.edit_msg(
                 init_url.get("ph_url"), reply_markup=keyboard
             )
         tgh = await kuso.telegraph(link, client.me.username)
-        data_kuso[link] = {"ph_url": tgh}
+        await data_kuso.set(link, {"ph_url": tgh})
         return await callback_query.message.edit_msg(tgh, reply_markup=keyboard)
     except Exception as e:
         LOGGER.error(f"clases: {e.__class__}, moduleName: {e.__class__.__name__}")
@@ -1784,7 +1758,7 @@ async def savefilm21_scrap(_, callback_query, strings):
         idlink = int(callback_query.data.split("#")[2])
         message_id = int(callback_query.data.split("#")[4])
         CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
+        link = (await get_scrap_pages(message_id))[CurrentPage - 1][idlink - 1].get("link")
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1829,7 +1803,7 @@ async def nunadrama_ddl(_, callback_query, strings):
         idlink = int(callback_query.data.split("#")[2])
         message_id = int(callback_query.data.split("#")[4])
         CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
+        link = (await get_scrap_pages(message_id))[CurrentPage - 1][idlink - 1].get("link")
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1879,7 +1853,7 @@ async def pusatfilm_ddl(_, callback_query, strings):
         idlink = int(callback_query.data.split("#")[2])
         message_id = int(callback_query.data.split("#")[4])
         CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
+        link = (await get_scrap_pages(message_id))[CurrentPage - 1][idlink - 1].get("link")
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1924,7 +1898,7 @@ async def dutamovie_ddl(_, callback_query, strings):
         idlink = int(callback_query.data.split("#")[2])
         message_id = int(callback_query.data.split("#")[4])
         CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
+        link = (await get_scrap_pages(message_id))[CurrentPage - 1][idlink - 1].get("link")
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1974,7 +1948,7 @@ async def nodrakorddl_scrap(_, callback_query, strings):
         idlink = int(callback_query.data.split("#")[2])
         message_id = int(callback_query.data.split("#")[4])
         CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
+        link = (await get_scrap_pages(message_id))[CurrentPage - 1][idlink - 1].get("link")
     except QueryIdInvalid:
         return
     except KeyError:
@@ -2035,7 +2009,7 @@ async def movieku_scrap(_, callback_query, strings):
         idlink = int(callback_query.data.split("#")[2])
         message_id = int(callback_query.data.split("#")[4])
         CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
+        link = (await get_scrap_pages(message_id))[CurrentPage - 1][idlink - 1].get("link")
     except QueryIdInvalid:
         return
     except KeyError:
@@ -2106,7 +2080,7 @@ async def melong_scrap(_, callback_query, strings):
         idlink = int(callback_query.data.split("#")[2])
         message_id = int(callback_query.data.split("#")[4])
         CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
+        link = (await get_scrap_pages(message_id))[CurrentPage - 1][idlink - 1].get("link")
     except QueryIdInvalid:
         return
     except KeyError:
@@ -2154,7 +2128,7 @@ async def gomov_dl(_, callback_query, strings):
         idlink = int(callback_query.data.split("#")[2])
         message_id = int(callback_query.data.split("#")[4])
         CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
+        link = (await get_scrap_pages(message_id))[CurrentPage - 1][idlink - 1].get("link")
     except QueryIdInvalid:
         return
     except KeyError:
@@ -2202,7 +2176,7 @@ async def lendrive_dl(_, callback_query, strings):
     message_id = int(callback_query.data.split("#")[4])
     CurrentPage = int(callback_query.data.split("#")[1])
     try:
-        link = savedict[message_id][0][CurrentPage - 1][idlink - 1].get("link")
+        link = (await get_scrap_pages(message_id))[CurrentPage - 1][idlink - 1].get("link")
     except KeyError:
         return await callback_query.message.edit_msg(strings("invalid_cb"))
 
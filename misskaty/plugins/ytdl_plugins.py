@@ -5,9 +5,6 @@
 from logging import getLogger
 from uuid import uuid4
 
-from iytdl import Process, iYTDL, main
-from iytdl.constants import YT_VID_URL
-from iytdl.exceptions import DownloadFailedError
 from pyrogram import Client, filters
 from pyrogram.enums import ParseMode
 from pyrogram.errors import (
@@ -42,6 +39,7 @@ def rand_key():
 #@app.on_cmd("ytsearch", no_channel=True)
 #@use_chat_lang()
 async def ytsearch(_, ctx: Message, strings):
+    from iytdl import main
     if len(ctx.command) == 1:
         return await ctx.reply_msg(strings("no_query"))
     query = ctx.text.split(maxsplit=1)[1]
@@ -92,6 +90,7 @@ async def ytsearch(_, ctx: Message, strings):
 #@capture_err
 #@use_chat_lang()
 async def ytdownv2(self, ctx: Message, strings):
+    from iytdl import iYTDL
     if not ctx.from_user:
         return await ctx.reply_msg(strings("no_channel"))
     url = (
@@ -137,6 +136,7 @@ async def ytdownv2(self, ctx: Message, strings):
 #@app.on_cb(filters.regex(r"^yt_listall"))
 #@use_chat_lang()
 async def ytdl_listall_callback(_, cq: CallbackQuery, strings):
+    from iytdl import iYTDL
     if cq.from_user.id != cq.message.reply_to_message.from_user.id:
         return await cq.answer(strings("unauth"), True)
     callback = cq.data.split("|")
@@ -152,6 +152,7 @@ async def ytdl_listall_callback(_, cq: CallbackQuery, strings):
 #@app.on_callback_query(filters.regex(r"^yt_extract_info"))
 #@use_chat_lang()
 async def ytdl_extractinfo_callback(_, cq: CallbackQuery, strings):
+    from iytdl import iYTDL
     if cq.from_user.id != cq.message.reply_to_message.from_user.id:
         try:
             return await cq.answer(strings("unauth"), True)
@@ -190,6 +191,9 @@ async def ytdl_extractinfo_callback(_, cq: CallbackQuery, strings):
 #@use_chat_lang()
 #@new_task
 async def ytdl_gendl_callback(self: Client, cq: CallbackQuery, strings):
+    from iytdl import iYTDL
+    from iytdl.constants import YT_VID_URL
+    from iytdl.exceptions import DownloadFailedError
     if not (cq.message.reply_to_message and cq.message.reply_to_message.from_user):
         return
     match = cq.data.split("|")
@@ -246,6 +250,7 @@ async def ytdl_gendl_callback(self: Client, cq: CallbackQuery, strings):
 #@app.on_callback_query(filters.regex(r"^yt_cancel"))
 #@use_chat_lang()
 async def ytdl_cancel_callback(_, cq: CallbackQuery, strings):
+    from iytdl import Process
     if cq.from_user.id != cq.message.reply_to_message.from_user.id:
         return await cq.answer(strings("unauth"), True)
     callback = cq.data.split("|")
@@ -264,6 +269,7 @@ async def ytdl_cancel_callback(_, cq: CallbackQuery, strings):
 #@app.on_callback_query(filters.regex(r"^ytdl_scroll"))
 #@use_chat_lang()
 async def ytdl_scroll_callback(_, cq: CallbackQuery, strings):
+    from iytdl import main
     if cq.from_user.id != cq.message.reply_to_message.from_user.id:
         return await cq.answer(strings("unauth"), True)
     callback = cq.data.split("|")
@@ -46,6 +46,10 @@ LOG_CHANNEL = -1002525178180
 LOG_GROUP_ID = environ.get("LOG_GROUP_ID")
 USER_SESSION = environ.get("USER_SESSION")
 DATABASE_NAME = environ.get("DATABASE_NAME", "MissKatyDB")
+MONGO_MAX_POOL = int(environ.get("MONGO_MAX_POOL", 50))
+MONGO_MIN_POOL = int(environ.get("MONGO_MIN_POOL", 5))
+# Comma separated, any of zstd, snappy, zlib. Off unless set
+MONGO_COMPRESSORS = environ.get("MONGO_COMPRESSORS", "")
 TZ = environ.get("TZ", "Asia/Jakarta")
 COMMAND_HANDLER = environ.get("COMMAND_HANDLER", "! /").split()
 SUDO = list(
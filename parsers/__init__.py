@@ -0,0 +1,7 @@
+"""
+Pure functions run in the parser process pool, see misskaty.helper.parse_pool.
+
+Nothing in this package may import misskaty or database: pool workers import
+these modules by name, and importing misskaty would start the bot clients.
+Arguments and results must be plain picklable data.
+"""
@@ -0,0 +1,150 @@
+import json
+import logging
+from typing import Optional
+
+from bs4 import BeautifulSoup
+
+LOGGER = logging.getLogger("MissKaty")
+
+
+def _parse_imdb_metadata(html: str) -> tuple[BeautifulSoup, Optional[dict]]:
+    soup = BeautifulSoup(html, "lxml")
+    script_tag = soup.find("script", attrs={"type": "application/ld+json"})
+    if not script_tag:
+        return soup, None
+    raw = script_tag.string
+    if raw is None and script_tag.contents:
+        raw = script_tag.contents[0]
+    if not raw:
+        return soup, None
+    try:
+        return soup, json.loads(raw)
+    except json.JSONDecodeError:
+        LOGGER.exception("Failed to decode IMDB metadata JSON.")
+    return soup, None
+
+
+def _extract_people_from_imdb(soup: BeautifulSoup, metadata: dict) -> dict:
+    people = {"directors": [], "writers": [], "cast": []}
+    seen = {key: set() for key in people}
+
+    def add_person(
+        section: str, name: Optional[str], url: Optional[str] = None
+    ) -> None:
+        if not name:
+            return
+        key = (url or name).lower()
+        if key in seen[section]:
+            return
+        seen[section].add(key)
+        people[section].append({"name": name, "url": url})
+
+    next_script = soup.find("script", id="__NEXT_DATA__")
+    if next_script and next_script.string:
+        try:
+            next_data = json.loads(next_script.string)
+        except json.JSONDecodeError:
+            next_data = {}
+        main_column = (
+            next_data.get("props", {})
+            .get("pageProps", {})
+            .get("mainColumnData", {})
+        )
+        for section in main_column.get("crewV2") or []:
+            grouping = (section.get("grouping") or {}).get("text", "").lower()
+            for credit in section.get("credits") or []:
+                name_info = credit.get("name") or {}
+                name_text = (name_info.get("nameText") or {}).get("text")
+                imdb_id = name_info.get("id")
+                url = f"https://www.imdb.com/name/{imdb_id}/" if imdb_id else None
+                if "director" in grouping:
+                    add_person("directors", name_text, url)
+                elif "writer" in grouping:
+                    add_person("writers", name_text, url)
+        for section in main_column.get("castV2") or []:
+            for credit in section.get("credits") or []:
+                name_info = credit.get("name") or {}
+                name_text = (name_info.get("nameText") or {}).get("text")
+                imdb_id = name_info.get("id")
+                url = f"https://www.imdb.com/name/{imdb_id}/" if imdb_id else None
+                add_person("cast", name_text, url)
+            if people["cast"]:
+                break
+
+    def iter_people(field):
+        if not field:
+            return []
+        if isinstance(field, list):
+            return field
+        return [field]
+
+    if not people["directors"]:
+        for item in iter_people(metadata.get("director")):
+            name = item.get("name")
+            url = item.get("url")
+            add_person("directors", name, url)
+
+    if not people["writers"]:
+        for item in iter_people(metadata.get("creator")):
+            if item.get("@type") != "Person":
+                continue
+            name = item.get("name")
+            url = item.get("url")
+            add_person("writers", name, url)
+
+    if not people["cast"]:
+        for item in iter_people(metadata.get("actor")):
+            name = item.get("name")
+            url = item.get("url")
+            add_person("cast", name, url)
+
+    return people
+
+
+def parse_imdb_title(html: str) -> Optional[dict]:
+    """Extract everything the result captions need from a title page as plain data."""
+    soup, metadata = _parse_imdb_metadata(html)
+    if not metadata:
+        return None
+
+    def section(testid):
+        node = soup.select(f'li[data-testid="{testid}"]')
+        return node[0] if node else None
+
+    def link_texts(node):
+        if not node:
+            return []
+        return [
+            item.text.strip()
+            for item in node.findAll(
+                class_="ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link"
+            )
+        ]
+
+    title = {
+        "metadata": metadata,
+        "title_text": soup.title.text if soup.title else "",
+        "runtime": None,
+        "release": None,
+        "release_href": "",
+        "countries": link_texts(section("title-details-origin")),
+        "languages": link_texts(section("title-details-languages")),
+        "people": _extract_people_from_imdb(soup, metadata),
+        "awards": None,
+    }
+    if runtime := section("title-techspec_runtime"):
+        container = runtime.find(class_="ipc-metadata-list-item__content-container")
+        if container:
+            title["runtime"] = container.text.strip()
+    if release := section("title-details-releasedate"):
+        node = release.find(
+            class_="ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link"
+        )
+        if node:
+            title["release"] = node.text.strip()
+            title["release_href"] = node.get("href", "")
+    if awards := section("award_information"):
+        title["awards"] = awards.find(
+            class_="ipc-metadata-list-item__list-content-item"
+        ).text
+    return title
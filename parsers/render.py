@@ -0,0 +1,228 @@
+import math
+import os
+import textwrap
+import time
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+
+# name -> (file, size it is resized to once, or None to keep it as is)
+BASE_IMAGES = {
+    "welcome": ("assets/bg.png", (1024, 500)),
+    "stats": ("assets/statsbg.jpg", None),
+    "nulis": ("assets/kertas.jpg", None),
+}
+
+
+@lru_cache(maxsize=None)
+def base_image(name: str) -> Image.Image:
+    """Background ready to composite on, loaded once per worker. Callers must draw on a ``.copy()``."""
+    file, size = BASE_IMAGES[name]
+    image = Image.open(file)
+    if size:
+        image = image.resize(size, Image.LANCZOS)
+    image.load()
+    return image
+
+
+@lru_cache(maxsize=64)
+def font(file: str, size: int) -> ImageFont.FreeTypeFont:
+    return ImageFont.truetype(file, size)
+
+
+def circle(pfp, size=(215, 215)):
+    pfp = pfp.resize(size, Image.LANCZOS).convert("RGBA")
+    bigsize = (pfp.size[0] * 3, pfp.size[1] * 3)
+    mask = Image.new("L", bigsize, 0)
+    draw = ImageDraw.Draw(mask)
+    draw.ellipse((0, 0) + bigsize, fill=255)
+    mask = mask.resize(pfp.size, Image.LANCZOS)
+    mask = ImageChops.darker(mask, pfp.split()[-1])
+    pfp.putalpha(mask)
+    return pfp
+
+
+def draw_multiple_line_text(image, text, font, text_start_height):
+    """
+    From unutbu on [python PIL draw multiline text on image](https://stackoverflow.com/a/7698300/395857)
+    """
+    draw = ImageDraw.Draw(image)
+    image_width, _ = image.size
+    y_text = text_start_height
+    lines = textwrap.wrap(text, width=50)
+    for line in lines:
+        text_bbox = font.getbbox(line)
+        (left, top, right, bottom) = text_bbox
+        line_width = abs(right - left)
+        line_height = abs(top - bottom)
+        draw.text(
+            ((image_width - line_width) / 2, y_text), line, font=font, fill="black"
+        )
+        y_text += line_height
+
+
+def crop_avatar(pic: str, out: str, size: Tuple[int, int]) -> str:
+    pfp = circle(Image.open(pic).convert("RGBA")).resize(size)
+    # Write then rename, so a concurrent join of the same user never reads half a file
+    pfp.save(f"{out}.tmp", "PNG")
+    os.replace(f"{out}.tmp", out)
+    return out
+
+
+def render_welcome(
+    avatar: str, member_text: str, chat: str, bot_username: str, out: str
+) -> str:
+    background = base_image("welcome").copy()
+    text_font = font("assets/Calistoga-Regular.ttf", 37)
+    draw_multiple_line_text(background, member_text, text_font, 395)
+    draw_multiple_line_text(background, chat, text_font, 47)
+    ImageDraw.Draw(background).text(
+        (530, 460),
+        f"Generated by @{bot_username}",
+        font=font("assets/Calistoga-Regular.ttf", 28),
+        align="right",
+    )
+    with Image.open(avatar) as pfp:
+        background.paste(pfp, (379, 123), pfp)
+    background.save(out)
+    return out
+
+
+def render_stats(
+    cpu: Tuple[float, int],
+    disk: Tuple[float, str, str],
+    ram: Tuple[float, str, str],
+    uptime: str,
+    ping: str,
+    out: str,
+) -> str:
+    """``cpu`` is (percent, cores), ``disk`` and ``ram`` are (percent, used, total)."""
+    image = base_image("stats").copy().convert("RGB")
+    iron_font = font("assets/IronFont.otf", 42)
+    draw = ImageDraw.Draw(image)
+
+    def draw_progressbar(coordinate, progress):
+        progress = 110 + (progress * 10.8)
+        draw.ellipse((105, coordinate - 25, 127, coordinate), fill="#FFFFFF")
+        draw.rectangle((120, coordinate - 25, progress, coordinate), fill="#FFFFFF")
+        draw.ellipse(
+            (progress - 7, coordinate - 25, progress + 15, coordinate), fill="#FFFFFF"
+        )
+
+    white = (255, 255, 255)
+    draw_progressbar(243, int(cpu[0]))
+    draw.text((225, 153), f"( {cpu[1]} core, {cpu[0]}% )", white, font=iron_font)
+    draw_progressbar(395, int(disk[0]))
+    draw.text(
+        (335, 302), f"( {disk[1]} / {disk[2]}, {disk[0]}% )", white, font=iron_font
+    )
+    draw_progressbar(533, int(ram[0]))
+    draw.text(
+        (225, 445), f"( {ram[1]} / {ram[2]} , {ram[0]}% )", white, font=iron_font
+    )
+    draw.text((335, 600), uptime, white, font=iron_font)
+    draw.text((857, 607), ping, white, font=iron_font)
+    image.save(out)
+    return out
+
+
+def _draw_outlined(draw, xy, text, m_font, outline_stroke: Optional[int] = None):
+    x, y = xy
+    for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+        draw.text(
+            xy=(x + dx, y + dy),
+            text=text,
+            font=m_font,
+            fill=(0, 0, 0),
+            stroke_width=3,
+            stroke_fill="black",
+        )
+    extra = {"stroke_width": outline_stroke, "stroke_fill": "black"} if outline_stroke else {}
+    draw.text(xy=xy, text=text, font=m_font, fill=(255, 255, 255), **extra)
+
+
+def render_meme(image_path: str, text: str, webp_file: str, png_file: str):
+    img = Image.open(image_path)
+    os.remove(image_path)
+    i_width, i_height = img.size
+    m_font = font("assets/MutantAcademyStyle.ttf", int((70 / 640) * i_width))
+    if ";" in text:
+        upper_text, lower_text = text.split(";")
+    else:
+        upper_text = text
+        lower_text = ""
+    draw = ImageDraw.Draw(img)
+    current_h, pad = 10, 5
+    if upper_text:
+        for u_text in textwrap.wrap(upper_text, width=15):
+            left, top, right, bottom = m_font.getbbox(u_text)
+            u_width = abs(right - left)
+            u_height = abs(top - bottom)
+            _draw_outlined(
+                draw,
+                ((i_width - u_width) / 2, int((current_h / 640) * i_width)),
+                u_text,
+                m_font,
+            )
+            current_h += u_height + pad
+    if lower_text:
+        for l_text in textwrap.wrap(lower_text, width=15):
+            left, top, right, bottom = m_font.getbbox(l_text)
+            u_width = abs(right - left)
+            u_height = abs(top - bottom)
+            _draw_outlined(
+                draw,
+                (
+                    (i_width - u_width) / 2,
+                    i_height - u_height - int((20 / 500) * i_width),
+                ),
+                l_text,
+                m_font,
+                outline_stroke=3,
+            )
+            current_h += u_height + pad
+    img.save(webp_file, "WebP")
+    img.save(png_file, "PNG")
+    img.close()
+    return webp_file, png_file
+
+
+def render_nulis(lines, out: str) -> str:
+    img = base_image("nulis").copy()
+    draw = ImageDraw.Draw(img)
+    nulis_font = font("assets/assfont.ttf", 30)
+    x, y = 150, 140
+    line_height = nulis_font.getbbox("hg")[3]
+    for line in lines:
+        draw.text((x, y), line, fill=(1, 22, 55), font=nulis_font)
+        y = y + line_height - 5
+    img.save(out)
+    return out
+
+
+def render_contact_sheet(
+    frames: List[Tuple[float, str]], out: str, columns: int, sheet_width: int
+) -> str:
+    """Grid of (seconds, frame path) with each frame's timestamp in its corner."""
+    first = Image.open(frames[0][1])
+    width = sheet_width // columns
+    height = round(width * first.height / first.width)
+    rows = math.ceil(len(frames) / columns)
+    sheet = Image.new("RGB", (width * columns, height * rows))
+    draw = ImageDraw.Draw(sheet)
+    label_font = font("assets/DejaVuSans.ttf", 20)
+    for index, (ttl, path) in enumerate(frames):
+        x, y = (index % columns) * width, (index // columns) * height
+        with Image.open(path) as frame:
+            sheet.paste(frame.convert("RGB").resize((width, height)), (x, y))
+        draw.text(
+            (x + 8, y + height - 30),
+            time.strftime("%H:%M:%S", time.gmtime(ttl)),
+            font=label_font,
+            fill="white",
+            stroke_width=2,
+            stroke_fill="black",
+        )
+    sheet.save(out)
+    return out
@@ -0,0 +1,259 @@
+import logging
+import traceback
+
+from bs4 import BeautifulSoup
+
+LOGGER = logging.getLogger("MissKaty")
+
+
+def split_arr(arr, size: 5):
+    arrs = []
+    while len(arr) > size:
+        pice = arr[:size]
+        arrs.append(pice)
+        arr = arr[size:]
+    arrs.append(arr)
+    return arrs
+
+
+def parse_kusonime(html):
+    kusodata = []
+    res = BeautifulSoup(html, "lxml").find_all("h2", {"class": "episodeye"})
+    for i in res:
+        ress = i.find_all("a")[0]
+        title = ress.text
+        link = ress["href"]
+        kusodata.append({"title": title, "link": link})
+    return split_arr(kusodata, 10) if kusodata else []
+
+
+def parse_movieku(html):
+    moviekudata = []
+    r = BeautifulSoup(html, "lxml")
+    res = r.find_all(class_="bx")
+    for i in res:
+        judul = i.find_all("a")[0]["title"]
+        link = i.find_all("a")[0]["href"]
+        typ = i.find(class_="overlay").text
+        typee = typ.strip() if typ.strip() != "" else "~"
+        moviekudata.append({"judul": judul, "link": link, "type": typee})
+    return split_arr(moviekudata, 6) if moviekudata else []
+
+
+def parse_entry_header(html, not_found):
+    text = BeautifulSoup(html, "lxml")
+    entry = text.find_all(class_="entry-header")
+    if not_found in entry[0].text:
+        return []
+    data = []
+    for i in entry:
+        genre = i.find(class_="gmr-movie-on")
+        genre = f"{genre.text}" if genre else "N/A"
+        judul = i.find(class_="entry-title").find("a").text
+        link = i.find(class_="entry-title").find("a").get("href")
+        data.append({"judul": judul, "link": link, "genre": genre})
+    return split_arr(data, 6)
+
+
+def parse_lendrive(html):
+    res = BeautifulSoup(html, "lxml")
+    lenddata = []
+    for o in res.find_all(class_="bsx"):
+        title = o.find("a")["title"]
+        link = o.find("a")["href"]
+        status = (
+            o.find(class_="epx").text if o.find(class_="epx") else "Not Provided by BOT"
+        )
+        kualitas = o.find(class_="typez TV") or o.find(class_="typez BD")
+        lenddata.append(
+            {
+                "judul": title,
+                "link": link,
+                "quality": kualitas.text if kualitas else "N/A",
+                "status": status,
+            }
+        )
+    return split_arr(lenddata, 6) if lenddata else []
+
+
+def parse_melongmovie(html):
+    bs4 = BeautifulSoup(html, "lxml")
+    melongdata = []
+    for res in bs4.select(".box"):
+        dd = res.select("a")
+        url = dd[0]["href"]
+        title = dd[0]["title"]
+        try:
+            quality = dd[0].find(class_="quality").text
+        except:
+            quality = "N/A"
+        melongdata.append({"judul": title, "link": url, "quality": quality})
+    return split_arr(melongdata, 6) if melongdata else []
+
+
+def parse_samehadaku(html):
+    res = BeautifulSoup(html, "lxml").find_all(class_="animposx")
+    sdata = []
+    for i in res:
+        url = i.find("a")["href"]
+        title = i.find("a")["title"]
+        sta = i.find(class_="type TV").text if i.find(class_="type TV") else "Ongoing"
+        rate = i.find(class_="score")
+        rate = rate.text.strip() if rate else "N/A"
+        sdata.append({"url": url, "title": title, "sta": sta, "rate": rate})
+    return split_arr(sdata, 10) if sdata else []
+
+
+def parse_kusonime_page(html: str) -> dict:
+    soup = BeautifulSoup(html, "lxml")
+    thumb = soup.find("div", {"class": "post-thumb"}).find("img").get("src")
+    data = []
+    # title = soup.select("#venkonten > div.vezone > div.venser > div.venutama > div.lexot > p:nth-child(3) > strong")[0].text.strip()
+    try:
+        title = soup.find("h1", {"class": "jdlz"}).text  # fix title njing haha
+        season = (
+            soup.select(
+                "#venkonten > div.vezone > div.venser > div.venutama > div.lexot > div.info > p:nth-child(3)"
+            )[0]
+            .text.split(":")
+            .pop()
+            .strip()
+        )
+        tipe = (
+            soup.select(
+                "#venkonten > div.vezone > div.venser > div.venutama > div.lexot > div.info > p:nth-child(5)"
+            )[0]
+            .text.split(":")
+            .pop()
+            .strip()
+        )
+        status_anime = (
+            soup.select(
+                "#venkonten > div.vezone > div.venser > div.venutama > div.lexot > div.info > p:nth-child(6)"
+            )[0]
+            .text.split(":")
+            .pop()
+            .strip()
+        )
+        ep = (
+            soup.select(
+                "#venkonten > div.vezone > div.venser > div.venutama > div.lexot > div.info > p:nth-child(7)"
+            )[0]
+            .text.split(":")
+            .pop()
+            .strip()
+        )
+        score = (
+            soup.select(
+                "#venkonten > div.vezone > div.venser > div.venutama > div.lexot > div.info > p:nth-child(8)"
+            )[0]
+            .text.split(":")
+            .pop()
+            .strip()
+        )
+        duration = (
+            soup.select(
+                "#venkonten > div.vezone > div.venser > div.venutama > div.lexot > div.info > p:nth-child(9)"
+            )[0]
+            .text.split(":")
+            .pop()
+            .strip()
+        )
+        rilis = (
+            soup.select(
+                "#venkonten > div.vezone > div.venser > div.venutama > div.lexot > div.info > p:nth-child(10)"
+            )[0]
+            .text.split(":")
+            .pop()
+            .strip()
+        )
+    except Exception:
+        e = traceback.format_exc()
+        LOGGER.error(e)
+        title, season, tipe, status_anime, ep, score, duration, rilis = (
+            "None",
+            "None",
+            "None",
+            "None",
+            0,
+            0,
+            0,
+            "None",
+        )
+    num = 1
+    genre = []
+    for _genre in soup.select(
+        "#venkonten > div.vezone > div.venser > div.venutama > div.lexot > div.info > p:nth-child(2)"
+    ):
+        gen = _genre.text.split(":").pop().strip().split(", ")
+        genre = gen
+    for smokedl in soup.find("div", {"class": "dlbodz"}).find_all(
+        "div", {"class": "smokeddlrh"}
+    ):
+        if not smokedl:
+            continue
+        mendata = {"name": title, "links": []}
+        for smokeurl in smokedl.find_all("div", {"class": "smokeurl"}):
+            if not smokeurl:
+                continue
+            quality = smokeurl.find("strong").text
+            links = []
+            for link in smokeurl.find_all("a"):
+                url = link.get("href")
+                client = link.text
+                links.append({"client": client, "url": url})
+            mendata["links"].append({"quality": quality, "link_download": links})
+        for smokeurl in smokedl.find_all("div", {"class": "smokeurlrh"}):
+            if not smokeurl:
+                continue
+            quality = smokeurl.find("strong").text
+            links = []
+            for link in smokeurl.find_all("a"):
+                url = link.get("href")
+                client = link.text
+                links.append({"client": client, "url": url})
+            mendata["links"].append({"quality": quality, "link_download": links})
+        data.append(mendata)
+        num += 1
+    for smokedl in soup.find("div", {"class": "dlbodz"}).find_all(
+        "div", {"class": "smokeddl"}
+    ):
+        if not smokedl:
+            continue
+        mendata = {"name": title, "links": []}
+        for smokeurl in smokedl.find_all("div", {"class": "smokeurl"}):
+            if not smokeurl:
+                continue
+            quality = smokeurl.find("strong").text
+            links = []
+            for link in smokeurl.find_all("a"):
+                url = link.get("href")
+                client = link.text
+                links.append({"client": client, "url": url})
+            mendata["links"].append({"quality": quality, "link_download": links})
+        for smokeurl in smokedl.find_all("div", {"class": "smokeurlrh"}):
+            if not smokeurl:
+                continue
+            quality = smokeurl.find("strong").text
+            links = []
+            for link in smokeurl.find_all("a"):
+                url = link.get("href")
+                client = link.text
+                links.append({"client": client, "url": url})
+            mendata["links"].append({"quality": quality, "link_download": links})
+        data.append(mendata)
+        num += 1
+    return {
+        "title": title,
+        "thumb": thumb,
+        "genre": genre,
+        "genre_string": ", ".join(genre),
+        "status_anime": status_anime,
+        "season": season,
+        "tipe": tipe,
+        "ep": ep,
+        "score": score,
+        "duration": duration,
+        "rilis": rilis,
+        "data": data,
+    }
@@ -1,21 +1,17 @@
 import asyncio
+import heapq
 import os
-from datetime import datetime, timedelta
+from contextlib import suppress
 from logging import getLogger
-from typing import Union
+from time import monotonic
+from typing import Dict, List, Tuple, Union
 
 import emoji
-from pyrogram.errors import (
-    FloodWait,
-    InputUserDeactivated,
-    PeerIdInvalid,
-    UserIsBlocked,
-)
+from pyrogram.errors import FloodWait
 from pyrogram.types import Message
 
 from database.afk_db import is_cleanmode_on
-from database.users_chats_db import db
-from misskaty import app, cleanmode
+from misskaty import app
 
 LOGGER = getLogger("MissKaty")
 BANNED = {}
@@ -23,34 +19,78 @@ BANNED = {}
 loop = asyncio.get_event_loop()
 
 
+# Cleanmode queue: (due time, chat_id, message_id) ordered by due time
+CLEANMODE_DELAY = 60
+CLEANMODE_MAX_PENDING = 50000
+DELETE_BATCH_SIZE = 100  # delete_messages limit per call
+_clean_heap: List[Tuple[float, int, int]] = []
+_clean_wakeup = asyncio.Event()
+cleanmode_stats = {"deleted": 0, "batches": 0, "dropped": 0, "lag": 0.0}
+
+
 async def put_cleanmode(chat_id, message_id):
-    if chat_id not in cleanmode:
-        cleanmode[chat_id] = []
-    time_now = datetime.now()
-    put = {
-        "msg_id": message_id,
-        "timer_after": time_now + timedelta(minutes=1),
-    }
-    cleanmode[chat_id].append(put)
+    due = monotonic() + CLEANMODE_DELAY
+    if len(_clean_heap) >= CLEANMODE_MAX_PENDING:
+        # Drop the newest, the queued ones are due sooner and get deleted first
+        cleanmode_stats["dropped"] += 1
+        if cleanmode_stats["dropped"] % 1000 == 1:
+            LOGGER.warning(
+                "Cleanmode queue full, %d messages not scheduled for deletion",
+                cleanmode_stats["dropped"],
+            )
+        return
+    heapq.heappush(_clean_heap, (due, chat_id, message_id))
+    if _clean_heap[0][0] == due:
+        _clean_wakeup.set()
+
+
+def cleanmode_metrics() -> dict:
+    """Queue depth, last observed lag in seconds and deletion counters."""
+    return {"pending": len(_clean_heap), **cleanmode_stats}
+
+
+async def _delete_batch(chat_id: int, message_ids: List[int]):
+    try:
+        await app.delete_messages(chat_id, message_ids)
+    except FloodWait as e:
+        await asyncio.sleep(e.value)
+        try:
+            await app.delete_messages(chat_id, message_ids)
+        except Exception:
+            return
+    except Exception:
+        return
+    cleanmode_stats["deleted"] += len(message_ids)
+    cleanmode_stats["batches"] += 1
 
 
 async def auto_clean():
-    while not await asyncio.sleep(30):
+    while True:
         try:
-            for chat_id in cleanmode:
+            if not _clean_heap:
+                _clean_wakeup.clear()
+                await _clean_wakeup.wait()
+                continue
+            delay = _clean_heap[0][0] - monotonic()
+            if delay > 0:
+                _clean_wakeup.clear()
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(_clean_wakeup.wait(), delay)
+                continue
+            now = monotonic()
+            due: Dict[int, List[int]] = {}
+            while _clean_heap and _clean_heap[0][0] <= now:
+                deadline, chat_id, message_id = heapq.heappop(_clean_heap)
+                cleanmode_stats["lag"] = now - deadline
+                due.setdefault(chat_id, []).append(message_id)
+            for chat_id, message_ids in due.items():
                 if not await is_cleanmode_on(chat_id):
                     continue
-                for x in cleanmode[chat_id]:
-                    if datetime.now() <= x["timer_after"]:
-                        continue
-                    try:
-                        await app.delete_messages(chat_id, x["msg_id"])
-                    except FloodWait as e:
-                        await asyncio.sleep(e.value)
-                    except:
-                        continue
-        except:
-            continue
+                for i in range(0, len(message_ids), DELETE_BATCH_SIZE):
+                    await _delete_batch(chat_id, message_ids[i : i + DELETE_BATCH_SIZE])
+        except Exception as e:
+            LOGGER.error(f"Cleanmode error: {e}")
+            await asyncio.sleep(5)
 
 
 # temp db for banned
@@ -72,28 +112,6 @@ def demoji(teks):
         return emoji.get_emoji_regexp().sub("", teks)
 
 
-async def broadcast_messages(user_id, message):
-    try:
-        await message.copy(chat_id=user_id)
-        return True, "Succes"
-    except FloodWait as e:
-        await asyncio.sleep(e.x)
-        return await broadcast_messages(user_id, message)
-    except InputUserDeactivated:
-        await db.delete_user(int(user_id))
-        LOGGER.info(f"{user_id}-Removed from Database, since deleted account.")
-        return False, "Deleted"
-    except UserIsBlocked:
-        LOGGER.info(f"{user_id} -Blocked the bot.")
-        return False, "Blocked"
-    except PeerIdInvalid:
-        await db.delete_user(int(user_id))
-        LOGGER.info(f"{user_id} - PeerIdInvalid")
-        return False, "Error"
-    except Exception:
-        return False, "Error"
-
-
 def get_size(size):
     """Get size in readable format"""
 